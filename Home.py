@@ -1,11 +1,13 @@
 import streamlit as st
-import requests
+
+from toolbox.outbox import get_outbox
+from ui.assets import url
 
 # ----------------- Page Setup -----------------
 st.set_page_config(
     page_title="About Engineering Tool-Box",
     layout="wide",
-    page_icon="https://i.postimg.cc/YCSYFC2M/S-Logo-removebg-preview.png",  # Change this URL to your preferred logo
+    page_icon=url("logo.png"),  # Change the "logo.png" source in toolbox/assets.py to your preferred logo
     initial_sidebar_state="expanded"  # Always expanded
 )
 
@@ -84,6 +86,7 @@ st.page_link("pages/Limpet_Toolbox.py", label="Limpet coil design", icon="🌀")
 st.page_link("pages/Arc_Length.py", label="Arc length calculation", icon="📏")
 st.page_link("pages/Heat_Exchanger_Area.py", label="Heat exchanger area", icon="🌡️")
 st.page_link("pages/Shell_Thk_Calculation.py", label="ASME UG-27 shell thickness check", icon="🛢️")
+st.page_link("pages/Vessel_Project.py", label="Vessel project shared across the pages", icon="🏗️")
 
 
 # The following block is not essential for the core functionality of your app.
@@ -107,16 +110,16 @@ You can always reach out for support, suggestions, or collaboration.
 
 # --- In-app navigation links ---
 st.markdown(
-    """
+    f"""
     <div style="display: flex; gap: 30px; font-size: 22px; justify-content: flex-start;">
         <a href="https://shubham1996.pythonanywhere.com/" target="_blank">
-            <img src="https://i.postimg.cc/YCSYFC2M/S-Logo-removebg-preview.png" width="100" style="vertical-align:middle;">
+            <img src="{url("logo.png")}" width="100" style="vertical-align:middle;">
         </a>
         <a href="https://github.com/Shubhamgopale99" target="_blank">
-            <img src="https://i.postimg.cc/wB8xpwGZ/176-1766942-our-github-repos-are-here-github-icon-hd-removebg-preview.png" width="100" style="vertical-align:middle;">
+            <img src="{url("github.png")}" width="100" style="vertical-align:middle;">
         </a>
         <a href="https://www.linkedin.com/in/shubham-gopale-580899151/" target="_blank">
-            <img src="https://i.postimg.cc/zXs0ShM8/linkedin.png" width="100" style="vertical-align:middle;">
+            <img src="{url("linkedin.png")}" width="100" style="vertical-align:middle;">
         </a>
     </div>
     """,
@@ -125,26 +128,28 @@ st.markdown(
 
 st.write("---")
 st.subheader("📩 Send me a message")
-with st.form("contact_form", clear_on_submit=True):
-    full_name = st.text_input("Full Name")
-    email = st.text_input("Email Address")
-    message = st.text_area("Your Message(Please suggest your thoughts)")
-    submit = st.form_submit_button("Send 📨")
-
-if submit:
-    if full_name and email and message:
-        formspree_url = "https://formspree.io/f/movlzpvz"
-        response = requests.post(
-            formspree_url,
-            data={
+
+
+# A fragment: sending a message reruns only the form, not the whole guide above
+@st.fragment
+def contact_form():
+    with st.form("contact_form", clear_on_submit=True):
+        full_name = st.text_input("Full Name")
+        email = st.text_input("Email Address")
+        message = st.text_area("Your Message(Please suggest your thoughts)")
+        submit = st.form_submit_button("Send 📨")
+
+    if submit:
+        if full_name and email and message:
+            # Queued to the local outbox; a background worker delivers it (with retries)
+            get_outbox().enqueue({
                 "name": full_name,
                 "email": email,
                 "message": message
-            }
-        )
-        if response.status_code == 200:
-            st.success("✅ Your message has been sent successfully!")
+            })
+            st.success("✅ Thanks! Your message has been received and will be delivered shortly.")
         else:
-            st.error(f"❌ Failed to send message. Error code: {response.status_code}")
-    else:
-        st.warning("⚠️ Please fill in all fields before sending.")
+            st.warning("⚠️ Please fill in all fields before sending.")
+
+
+contact_form()
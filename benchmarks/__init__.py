@@ -0,0 +1,20 @@
+"""Benchmark suite for the calculator kernels and the Streamlit pages.
+
+    python -m benchmarks run --save benchmarks/baselines/my-machine.json
+    python -m benchmarks compare benchmarks/baselines/my-machine.json --threshold 1.25
+
+Two layers:
+
+* ``kernels`` micro-benchmarks each kernel, scalar vs. batched.
+* ``pages`` measures full script reruns of every page (and ``Home.py``)
+  headlessly with Streamlit's ``AppTest``.
+
+``python -m benchmarks.load`` (concurrent sessions) and
+``python -m benchmarks.startup`` (cold start to first paint per page, with
+an ``-X importtime`` breakdown) are separate entry points.
+
+Timings only compare on the same machine, so baselines are saved per
+machine. ``compare`` re-runs the suite (or loads ``--current``), flags
+every benchmark slower than ``baseline × threshold``, and exits 1 if any
+is, so it can gate CI.
+"""
@@ -0,0 +1,85 @@
+"""python -m benchmarks {run,compare} — see the package docstring."""
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmarks import harness
+
+# Keep page benchmarks away from the real history / outbox databases
+_scratch = harness.use_scratch_databases()
+
+SUITES = ("kernels", "pages")
+
+
+def run_suites(suites, batch, repeats, only=None):
+    results = []
+    for suite in suites:
+        if suite == "kernels":
+            from benchmarks import kernels
+            cases, suite_repeats, min_time = kernels.cases(batch), repeats, 0.05
+        else:
+            from benchmarks import pages
+            # Page runs take tens of ms or more; one call per sample is enough
+            cases, suite_repeats, min_time = pages.cases(), max(3, repeats // 2), 0.0
+        for name, func, items in cases:
+            if only and only not in f"{suite}/{name}":
+                continue
+            median, fastest = harness.measure(func, suite_repeats, min_time)
+            results.append(harness.Result(suite, name, median, fastest, suite_repeats, items))
+            print(f"  {suite}/{name}: {median * 1e3:.3f} ms", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Engineering Toolbox benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p):
+        p.add_argument("--suite", choices=SUITES + ("all",), default="all")
+        p.add_argument("--batch", type=int, default=100_000, help="rows per batched kernel call")
+        p.add_argument("--repeats", type=int, default=7)
+        p.add_argument("-k", "--only", help="run only benchmarks whose name contains this text")
+
+    p_run = sub.add_parser("run", help="run the benchmarks and print (optionally save) the results")
+    common(p_run)
+    p_run.add_argument("--save", metavar="JSON", help="write the results to this file (e.g. a new baseline)")
+
+    p_cmp = sub.add_parser("compare", help="compare against a saved baseline")
+    p_cmp.add_argument("baseline", help="baseline JSON written by 'run --save'")
+    p_cmp.add_argument("--current", metavar="JSON", help="compare this saved run instead of running now")
+    p_cmp.add_argument("--threshold", type=float, default=1.25,
+                       help="flag benchmarks slower than baseline × threshold (default %(default)s)")
+    common(p_cmp)
+
+    args = parser.parse_args(argv)
+    suites = SUITES if args.suite == "all" else (args.suite,)
+
+    if args.command == "run":
+        results = run_suites(suites, args.batch, args.repeats, args.only)
+        harness.print_results(results)
+        if args.save:
+            harness.save(results, args.save)
+        return 0
+
+    baseline = harness.load(args.baseline)
+    if args.current:
+        current = harness.load(args.current)
+    else:
+        fd, path = tempfile.mkstemp(suffix=".json", dir=_scratch)
+        os.close(fd)
+        harness.save(run_suites(suites, args.batch, args.repeats, args.only), path)
+        current = harness.load(path)
+        # A partial run is only compared with the matching part of the baseline
+        baseline["results"] = {k: v for k, v in baseline["results"].items()
+                               if k.split("/")[0] in suites and (not args.only or args.only in k)}
+    rows = harness.compare(current, baseline, args.threshold)
+    harness.print_comparison(rows)
+    slower = [r[0] for r in rows if r[4] == "slower"]
+    if slower:
+        print(f"\n{len(slower)} benchmark(s) slower than {args.threshold:g}× baseline", file=sys.stderr)
+        return 1
+    return 0
+
+
+sys.exit(main())
@@ -0,0 +1,127 @@
+"""Timing, result files and baseline comparison."""
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+
+
+def use_scratch_databases():
+    """Point the history and outbox databases at a temp dir (call before importing pages)."""
+    scratch = tempfile.mkdtemp(prefix="toolbox-bench-")
+    os.environ.setdefault("TOOLBOX_DB", os.path.join(scratch, "history.sqlite3"))
+    os.environ.setdefault("TOOLBOX_OUTBOX_DB", os.path.join(scratch, "outbox.sqlite3"))
+    return scratch
+
+
+@dataclass
+class Result:
+    suite: str
+    name: str
+    median_s: float
+    min_s: float
+    repeats: int
+    items: int = 1  # cases handled by one call (batched kernels)
+
+    @property
+    def per_item_s(self):
+        return self.median_s / self.items
+
+
+def measure(func, repeats=7, min_time=0.05):
+    """Per-call (median, min) seconds; each sample loops ``func`` for at least ``min_time``."""
+    number, elapsed = 1, 0.0
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed else 10
+
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples), min(samples)
+
+
+def environment():
+    import numpy
+    import pandas
+    import streamlit
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "streamlit": streamlit.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results, path):
+    payload = {
+        "environment": environment(),
+        "results": {f"{r.suite}/{r.name}": {**asdict(r), "per_item_s": r.per_item_s} for r in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=1.25):
+    """Rows of (key, baseline s, current s, ratio, verdict) for benchmarks present in both.
+
+    ``verdict`` is ``"slower"`` when current / baseline exceeds ``threshold``,
+    ``"faster"`` when it is below ``1 / threshold``, otherwise ``"ok"``.
+    """
+    rows = []
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            rows.append((key, None, cur["median_s"], None, "new"))
+            continue
+        ratio = cur["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        verdict = "slower" if ratio > threshold else "faster" if ratio < 1 / threshold else "ok"
+        rows.append((key, base["median_s"], cur["median_s"], ratio, verdict))
+    for key in baseline["results"].keys() - current["results"].keys():
+        rows.append((key, baseline["results"][key]["median_s"], None, None, "missing"))
+    return rows
+
+
+def _fmt_time(seconds):
+    if seconds is None:
+        return "–"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def print_results(results, file=sys.stdout):
+    width = max(len(f"{r.suite}/{r.name}") for r in results)
+    print(f"{'benchmark':<{width}}  {'median':>10}  {'min':>10}  {'per item':>10}", file=file)
+    for r in results:
+        print(f"{r.suite + '/' + r.name:<{width}}  {_fmt_time(r.median_s):>10}  {_fmt_time(r.min_s):>10}  "
+              f"{_fmt_time(r.per_item_s) if r.items > 1 else '':>10}", file=file)
+
+
+def print_comparison(rows, file=sys.stdout):
+    width = max(len(r[0]) for r in rows)
+    print(f"{'benchmark':<{width}}  {'baseline':>10}  {'current':>10}  {'ratio':>6}  verdict", file=file)
+    for key, base, cur, ratio, verdict in sorted(rows):
+        ratio_text = f"{ratio:.2f}" if ratio is not None else "–"
+        print(f"{key:<{width}}  {_fmt_time(base):>10}  {_fmt_time(cur):>10}  {ratio_text:>6}  {verdict}", file=file)
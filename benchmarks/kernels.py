@@ -0,0 +1,93 @@
+"""Kernel micro-benchmarks: each kernel once per scalar case and once per batch.
+
+Memoized kernels are timed through ``__wrapped__`` so repeats measure the
+maths, not the cache; ``*_cached`` entries time a cache hit on purpose.
+"""
+import numpy as np
+
+from toolbox import dish, ellipse, geometry, hx, limpet, parametric, pipes, strapping, tank, tolerance, ug27
+
+BATCH = 100_000
+
+
+def _rng():
+    return np.random.default_rng(12345)
+
+
+def cases(batch=BATCH):
+    """(name, zero-argument callable, cases per call) for every kernel benchmark."""
+    r = _rng()
+    P = r.uniform(0.1, 3.0, batch)
+    S = r.uniform(100, 160, batch)
+    Do = r.uniform(300, 4000, batch)
+    t = r.choice([6.0, 8, 10, 12, 16, 20, 25], batch)
+    ids = r.uniform(300, 6000, batch)
+    a, b = r.uniform(1, 1000, batch), r.uniform(1, 1000, batch)
+    volumes = r.uniform(1, 200, batch)
+    ratios = r.uniform(1, 3, batch)
+
+    ug27_inputs = {"P": 1.5, "S": 138.0, "Do": 1016.0, "t": 12.0, "Ca": 3.0, "mill_tol": 0.3, "E": 0.85}
+    tolerance_inputs = {
+        "P": tolerance.Normal(1.5, 0.05, 0.0), "S": tolerance.Normal(138.0, 4.0), "Do": 1016.0,
+        "t": tolerance.Normal(10.2, 0.15, 9.7, 10.8), "Ca": tolerance.Uniform(1.5, 3.0),
+        "mill_tol": tolerance.Triangular(0.0, 0.15, 0.3), "E": 0.85,
+    }
+    limpet_args = (2000.0, 3000.0, 10.0, 80.0, 6.0, 100.0, 80.0, 7850.0)
+    limpet_batch = (ids, ids * 1.5, 10.0, 80.0, 6.0, 100.0, 80.0, 7850.0)
+    study_axes = {"P": np.linspace(0.1, 3.0, 10), "S": 138.0, "Do": np.linspace(300, 4000, batch // 100),
+                  "t": np.linspace(6.0, 25.0, 10), "Ca": 3.0, "mill_tol": 0.3, "E": 0.85}
+    pipe_catalogue = pipes.load_catalogue("pipe")
+    ug27.calculate(ug27_inputs)  # warm the cache entry for the *_cached case
+
+    return [
+        # UG-27
+        ("ug27.calculate", lambda: ug27.calculate.__wrapped__(ug27_inputs), 1),
+        ("ug27.calculate_cached", lambda: ug27.calculate(ug27_inputs), 1),
+        ("ug27.calculate_batch", lambda: ug27.calculate_batch(P, S, Do, t, 3.0, 0.3, 0.85), batch),
+        ("ug27.lightest_plate[100]", lambda: ug27.lightest_plate(
+            P[:100], Do[:100], 3000.0, 3.0, 0.3, ug27.STANDARD_PLATE_THK, [138.0, 118.0], [7850.0, 7850.0],
+            ug27.JOINT_EFFICIENCIES), 100),
+        ("parametric.run_study[ug27]", lambda: parametric.run_study("ug27", study_axes, workers=1), batch),
+        ("tolerance.simulate_ug27", lambda: tolerance.simulate_ug27(**tolerance_inputs, n=batch, seed=0), batch),
+        # Dish ends
+        ("dish.torispherical", lambda: dish.calculate_torispherical_dish(1000.0, 50.0, 6.0), 1),
+        ("dish.torispherical_batch", lambda: dish.calculate_torispherical_dish(ids, 50.0, 6.0), batch),
+        ("dish.ellipsoidal", lambda: dish.calculate_ellipsoidal_dish(1000.0, 50.0, 6.0), 1),
+        ("dish.ellipsoidal_batch", lambda: dish.calculate_ellipsoidal_dish(ids, 50.0, 6.0), batch),
+        ("dish.dish_table", lambda: dish.dish_table.__wrapped__(1000.0, 50.0, 6.0), 1),
+        ("dish.dish_catalogue", lambda: dish.dish_catalogue(50.0, 6.0), dish.STANDARD_IDS.size),
+        # Ellipse perimeter
+        ("ellipse.simpson", lambda: ellipse.perimeter_simpson.__wrapped__(500.0, 200.0), 1),
+        ("ellipse.agm", lambda: ellipse.perimeter_agm.__wrapped__(500.0, 200.0), 1),
+        ("ellipse.agm_batch", lambda: ellipse.perimeter_agm.__wrapped__(a, b), batch),
+        # Tank sizing
+        ("tank.calculate_dimensions", lambda: tank.calculate_dimensions(10.0, 1.25, 2.0), 2),
+        ("tank.ld_dimensions_batch", lambda: tank.ld_dimensions(volumes, ratios), batch),
+        ("tank.optimum_tanks[100]", lambda: tank.optimum_tanks(volumes[:100]), 100),
+        ("strapping.strapping_table", lambda: strapping.strapping_table.__wrapped__(
+            2000.0, 4000.0, "ellipsoidal", "horizontal", 1.0), 1),
+        # Limpet coil
+        ("limpet.limpet_coil", lambda: limpet.limpet_coil.__wrapped__(*limpet_args), 1),
+        ("limpet.limpet_coil_batch", lambda: limpet.limpet_coil_batch(*limpet_batch), batch),
+        ("limpet.helical_coil_batch", lambda: limpet.helical_coil(*limpet_batch), batch),
+        ("limpet.size_limpet", lambda: limpet.size_limpet(8.0, 2000.0, 3000.0, 10.0),
+         limpet.SIZING_PITCHES.size * len(pipes.half_pipe_sizes()) * limpet.SIZING_COVERAGES.size),
+        # Pipe / tube catalogue
+        ("pipes.nearest", lambda: pipe_catalogue.nearest(73.0, 5.0), 1),
+        ("pipes.nearest_batch", lambda: pipe_catalogue.nearest(a, ratios * 5), batch),
+        ("pipes.between", lambda: pipe_catalogue.between(60.0, 115.0, ("10S", "40")), 1),
+        # Tube area, arc length, slope
+        ("hx.tube_area", lambda: hx.tube_area(25.0, 6.0, 100), 1),
+        ("hx.tube_area_batch", lambda: hx.tube_area(a, ratios, 100), batch),
+        ("hx.tube_count", lambda: hx.tube_count.__wrapped__(1000.0, 19.05, 23.8125, "30", 2), 1),
+        ("hx.tube_count_batch[1000]", lambda: hx.tube_count(ids[:1000] / 3, 19.05, ratios[:1000] * 19.05, "30", 2), 1000),
+        ("hx.tube_layout", lambda: hx.tube_layout.__wrapped__(1000.0, 19.05, 23.8125, "30", 2), 1),
+        ("hx.lmtd_f_batch", lambda: hx.f_factor(150.0, 90.0, 30.0, 30.0 + ratios * 30, 1), batch),
+        ("hx.size_exchanger_batch[1000]", lambda: hx.size_exchanger(ids[:1000], 150.0, 90.0, 30.0, 70.0, 400.0), 1000),
+        ("hx.size_shell", lambda: hx.size_shell(150.0, 19.05, 6.0, pitch_ratios=(1.25, 1.33, 1.5), passes=2),
+         hx.SHELL_IDS.size * 3 * len(hx.LAYOUTS)),
+        ("geometry.arc_length", lambda: geometry.arc_length(1000.0, 90.0), 1),
+        ("geometry.arc_length_batch", lambda: geometry.arc_length(ids, a), batch),
+        ("geometry.slope", lambda: geometry.slope(1.0, 2.0), 1),
+        ("geometry.slope_batch", lambda: geometry.slope(a, b), batch),
+    ]
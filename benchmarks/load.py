@@ -0,0 +1,329 @@
+"""Concurrent-session load generator for the multipage app.
+
+    python -m benchmarks.load --users 1,4,16 --steps 40
+    python -m benchmarks.load --users 8 --duration 30 --json load.json
+
+Every virtual user holds one ``AppTest`` session per page it visits. It
+repeatedly picks a page from the mix and drives a typical flow: fill
+inputs, press Calculate, rerun. Each calculation grows that session's
+history.
+
+``AppTest`` patches process-wide Streamlit state on every run, so
+concurrent sessions cannot share a process. Each user therefore runs in its
+own spawned process, and all users are released together at a barrier. The
+users share the machine's cores and the history database, but not the
+kernel caches. This is closer to N server replicas than to N sessions on
+one server, so treat latencies at high concurrency as a lower bound.
+
+For every concurrency level the report gives:
+- per-page p50/p95/p99 rerun latency
+- overall reruns/s
+- per-user process RSS
+- how much each session's state grew per calculation
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from benchmarks import harness
+from benchmarks.pages import ROOT
+from toolbox.metrics import approx_size
+
+harness.use_scratch_databases()
+
+
+# ---------------- Page flows ----------------
+# Each flow sets a session's inputs for one calculation; the driver times the rerun.
+def _arc(at, r):
+    at.text_input(key="diameter_input").input(str(r.randint(300, 5000)))
+    at.text_input(key="angle_input").input(str(r.randint(1, 359)))
+    at.button[0].click()
+
+
+def _dish(at, r):
+    at.text_input(key="tank_id_input").input(str(r.randrange(300, 6000, 50)))
+    at.text_input(key="sf_input").input(str(r.choice([25, 40, 50])))
+    at.text_input(key="thk_input").input(str(r.choice([6, 8, 10, 12])))
+    at.button[1].click()  # [0] is Load from vessel project
+
+
+def _ellipse(at, r):
+    at.number_input[0].set_value(float(r.randint(100, 2000)))
+    at.number_input[1].set_value(float(r.randint(10, 100)))
+
+
+def _hx(at, r):
+    at.text_input(key="tube_dia_input").input(str(r.choice([19.05, 25.4, 31.75])))
+    at.text_input(key="tube_length_input").input(str(r.choice([3, 4.5, 6])))
+    at.text_input(key="tube_count_input").input(str(r.randint(20, 800)))
+    at.button[0].click()
+
+
+def _limpet(at, r):
+    values = {
+        "shell_id": r.randrange(800, 4000, 100), "shell_height": r.randrange(1000, 5000, 100),
+        "shell_thk": 10, "limpet_od": r.choice([60, 80, 100]), "limpet_thk": 6,
+        "limpet_pitch": r.choice([100, 120, 150]), "coil_coverage": 80, "density": 7850,
+    }
+    for key, value in values.items():
+        at.number_input(key=key).set_value(float(value))
+    at.button[1].click()  # [0] is Load from vessel project
+
+
+def _shell(at, r):
+    values = {
+        "P": r.choice(["0.5", "1.0", "1.5", "2.5"]), "T": str(r.randrange(20, 300, 10)),
+        "Material": r.choice(["SA-516 Gr 70", "SA-240 316L"]), "Density": "7850", "S": "",
+        "Do": str(r.randrange(500, 3000, 2)), "L": "3000", "t": str(r.choice([8, 10, 12, 16, 20])),
+        "Ca": "3", "mill_tol": "0.3", "E": "0.85",
+    }
+    for key, value in values.items():
+        at.text_input(key=key).input(value)
+    at.button[1].click()  # [0] is Load from vessel project
+
+
+def _slope(at, r):
+    at.number_input[0].set_value(r.randint(0, 100))
+    at.number_input[1].set_value(r.randint(1, 100))
+    at.button[0].click()
+
+
+def _tank(at, r):
+    at.text_input[0].input(str(r.randint(1, 200)))
+    at.button[1].click()  # [0] is Load from vessel project
+
+
+def _saved(at, r):
+    at.text_input(key="saved_key").input(r.choice(["", "Do=", "Type=Ellipsoidal", "Rise="]))
+
+
+def _home(at, r):
+    pass  # browsing only; the contact form is not submitted
+
+
+# page file → (flow, weight in the default mix)
+FLOWS = {
+    "Home.py": (_home, 1),
+    "pages/Arc_Length.py": (_arc, 2),
+    "pages/Dish_End_Volume.py": (_dish, 3),
+    "pages/Ellipse_perimeter.py": (_ellipse, 1),
+    "pages/Heat_Exchanger_Area.py": (_hx, 2),
+    "pages/Limpet_Toolbox.py": (_limpet, 2),
+    "pages/Saved_Designs.py": (_saved, 1),
+    "pages/Shell_Thk_Calculation.py": (_shell, 4),
+    "pages/Slope_To_Degree_Converter.py": (_slope, 1),
+    "pages/Volume_To_Tank_Dimension.py": (_tank, 3),
+}
+
+
+# ---------------- Memory accounting ----------------
+def session_bytes(at):
+    return sum(approx_size(value) for _, value in at.session_state.items())
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, not current
+
+
+# ---------------- Driver ----------------
+@dataclass
+class _Session:
+    at: object
+    initial_bytes: int
+    calculations: int = 0
+
+
+@dataclass
+class LevelResult:
+    users: int
+    seconds: float = 0.0
+    reruns: int = 0
+    errors: int = 0
+    latencies: dict = field(default_factory=dict)  # page → list of seconds
+    session_growth: list = field(default_factory=list)  # (page, initial bytes, final bytes, calculations)
+    rss: list = field(default_factory=list)  # (before, after) bytes per user process
+
+
+def _quiet():
+    # Bare-mode runs log a "missing ScriptRunContext" warning per run
+    from streamlit import logger
+
+    logger.set_log_level("error")
+
+
+def _user(user_id, pages, weights, steps, duration, seed, barrier, results):
+    """One virtual user (runs in its own process); puts a result dict on ``results``."""
+    from streamlit.testing.v1 import AppTest
+
+    _quiet()
+    r = random.Random(seed * 1000 + user_id)
+    sessions = {}
+    latencies = defaultdict(list)
+    reruns = errors = 0
+    rss_before = rss_bytes()
+
+    barrier.wait()
+    started = time.time()
+    deadline = None if duration is None else time.monotonic() + duration
+    step = 0
+    while (steps is None or step < steps) and (deadline is None or time.monotonic() < deadline):
+        step += 1
+        page = r.choices(pages, weights)[0]
+        try:
+            session = sessions.get(page)
+            if session is None:
+                at = AppTest.from_file(str(ROOT / page), default_timeout=300)
+                at.run()
+                session = sessions[page] = _Session(at, session_bytes(at))
+                reruns += 1
+            FLOWS[page][0](session.at, r)
+            start = time.perf_counter()
+            session.at.run()
+            latencies[page].append(time.perf_counter() - start)
+            reruns += 1
+            session.calculations += 1
+            if session.at.exception:
+                errors += 1
+        except Exception:
+            errors += 1
+    finished = time.time()
+
+    results.put({
+        "latencies": dict(latencies),
+        "growth": [(page, s.initial_bytes, session_bytes(s.at), s.calculations) for page, s in sessions.items()],
+        "reruns": reruns,
+        "errors": errors,
+        "started": started,
+        "finished": finished,
+        "rss": (rss_before, rss_bytes()),
+    })
+
+
+def run_level(users, steps=None, duration=None, pages=None, seed=0):
+    """Drive ``users`` concurrent virtual users; returns a :class:`LevelResult`."""
+    pages = list(pages or FLOWS)
+    weights = [FLOWS[p][1] for p in pages]
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(users)
+    queue = ctx.Queue()
+    procs = [
+        ctx.Process(target=_user, args=(i, pages, weights, steps, duration, seed, barrier, queue), daemon=True)
+        for i in range(users)
+    ]
+    for p in procs:
+        p.start()
+    # Drain the queue before joining so a full pipe can't block a finished worker
+    reports = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    result = LevelResult(users=users)
+    for rep in reports:
+        for page, values in rep["latencies"].items():
+            result.latencies.setdefault(page, []).extend(values)
+        result.session_growth.extend(rep["growth"])
+        result.reruns += rep["reruns"]
+        result.errors += rep["errors"]
+        result.rss.append(rep["rss"])
+    result.seconds = max(r["finished"] for r in reports) - min(r["started"] for r in reports)
+    return result
+
+
+def summarize(result):
+    """JSON-friendly summary of one concurrency level."""
+    pages = {}
+    for page, values in sorted(result.latencies.items()):
+        ms = np.asarray(values) * 1e3
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        pages[page] = {"n": int(ms.size), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": float(ms.max())}
+
+    growth, final_bytes = defaultdict(list), defaultdict(list)
+    for page, initial, final, calcs in result.session_growth:
+        final_bytes[page].append(final)
+        if calcs:
+            growth[page].append((final - initial) / calcs)
+    memory = {
+        page: {
+            "sessions": len(final_bytes[page]),
+            "bytes_per_session": float(np.mean(final_bytes[page])),
+            "bytes_per_calc": float(np.mean(growth[page])) if growth[page] else 0.0,
+        }
+        for page in sorted(final_bytes)
+    }
+    session_total = sum(final for _, _, final, _ in result.session_growth)
+
+    return {
+        "users": result.users,
+        "seconds": result.seconds,
+        "reruns": result.reruns,
+        "errors": result.errors,
+        "throughput_rps": result.reruns / result.seconds if result.seconds else 0.0,
+        "rss_before_mb": float(np.mean([b for b, _ in result.rss])) / 2**20,
+        "rss_after_mb": float(np.mean([a for _, a in result.rss])) / 2**20,
+        "session_state_mb": session_total / 2**20,
+        "pages": pages,
+        "memory": memory,
+    }
+
+
+def print_summary(s, file=sys.stdout):
+    print(f"\n=== {s['users']} concurrent user(s): {s['reruns']} reruns in {s['seconds']:.1f} s "
+          f"→ {s['throughput_rps']:.1f} reruns/s, {s['errors']} error(s) ===", file=file)
+    print(f"RSS per user process {s['rss_before_mb']:.0f} → {s['rss_after_mb']:.0f} MB; "
+          f"session state held {s['session_state_mb']:.2f} MB", file=file)
+    width = max((len(p) for p in s["pages"]), default=4)
+    print(f"{'page':<{width}}  {'n':>5}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  "
+          f"{'KB/session':>10}  {'KB/calc':>8}", file=file)
+    for page, st in s["pages"].items():
+        mem = s["memory"].get(page, {})
+        print(f"{page:<{width}}  {st['n']:>5}  {st['p50_ms']:>8.1f}  {st['p95_ms']:>8.1f}  {st['p99_ms']:>8.1f}  "
+              f"{mem.get('bytes_per_session', 0.0) / 1024:>10.1f}  {mem.get('bytes_per_calc', 0.0) / 1024:>8.2f}",
+              file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.splitlines()[0])
+    parser.add_argument("--users", default="1,4,16", help="comma-separated concurrency levels (default %(default)s)")
+    parser.add_argument("--steps", type=int, default=30, help="calculations per user per level (default %(default)s)")
+    parser.add_argument("--duration", type=float, help="seconds per level instead of a fixed number of steps")
+    parser.add_argument("--pages", help="comma-separated page files to include (default: the full mix)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the summaries to this file")
+    args = parser.parse_args(argv)
+
+    _quiet()
+    pages = [p.strip() for p in args.pages.split(",")] if args.pages else None
+    if pages and (unknown := [p for p in pages if p not in FLOWS]):
+        parser.error(f"unknown page(s): {', '.join(unknown)}")
+
+    summaries = []
+    for users in (int(u) for u in args.users.split(",")):
+        result = run_level(users, None if args.duration else args.steps, args.duration, pages, args.seed)
+        summary = summarize(result)
+        print_summary(summary)
+        summaries.append(summary)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": harness.environment(), "levels": summaries}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Page rerun benchmarks: every script in ``pages/`` plus ``Home.py`` run headlessly with AppTest.
+
+``<page>.first_run`` is the first script run of a fresh AppTest (a new
+session: session state set up, caches as they are). ``<page>.rerun`` is a
+plain rerun of the same session with no input changes, which is what every
+widget interaction costs at minimum.
+"""
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def page_files():
+    return [ROOT / "Home.py", *sorted((ROOT / "pages").glob("*.py"))]
+
+
+def _run(at, path):
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{path.name} raised: {at.exception[0].message}")
+
+
+def cases():
+    """(name, zero-argument callable, 1) for every page, like ``kernels.cases``."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)  # pages load images/ and data/ relative to the app root
+    # Bare-mode runs log a "missing ScriptRunContext" warning per run
+    from streamlit import logger
+
+    logger.set_log_level("error")
+    out = []
+    for path in page_files():
+        name = path.stem
+        holder = {}
+
+        def first(path=path, holder=holder):
+            holder["at"] = AppTest.from_file(str(path), default_timeout=60)
+            _run(holder["at"], path)
+
+        def rerun(path=path, holder=holder):
+            if "at" not in holder:
+                first(path, holder)
+            _run(holder["at"], path)
+
+        out.append((f"{name}.first_run", first, 1))
+        out.append((f"{name}.rerun", rerun, 1))
+    return out
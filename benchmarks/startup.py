@@ -0,0 +1,173 @@
+"""Cold-start profile: a fresh ``streamlit run`` server per page, timed to first paint.
+
+    python -m benchmarks.startup                      # every page, 3 cold starts each
+    python -m benchmarks.startup --imports 15         # plus each page's slowest imports
+    python -m benchmarks.startup --pages pages/Arc_Length.py --repeat 5 --json startup.json
+
+Each sample starts a new server process the way a scaled-to-zero container
+does. It waits for ``/_stcore/health`` ("server ready"), then connects over
+the app websocket like a browser tab and requests the first script run. The
+sample ends at ``script_finished`` ("first paint").
+
+With ``--imports N`` every page gets one extra cold start under
+``python -X importtime``. The report lists the N top-level imports with
+the largest cumulative time, and which heavy modules (numpy, pandas,
+pyarrow, requests) were loaded by the time the page had painted.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks import harness
+from benchmarks.pages import ROOT, page_files
+
+HEAVY_MODULES = ("numpy", "pandas", "pyarrow", "requests")
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(proc, port, deadline):
+    url = f"http://127.0.0.1:{port}/_stcore/health"
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {proc.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.01)
+    raise TimeoutError("server did not become ready")
+
+
+async def _first_paint(port, timeout):
+    """Open a session like a browser tab and wait for the first script run to finish."""
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from websockets.asyncio.client import connect  # a Streamlit dependency
+
+    async with connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None) as ws:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        await ws.send(msg.SerializeToString())
+        nbytes = 0
+        while True:
+            raw = await asyncio.wait_for(ws.recv(), timeout)
+            nbytes += len(raw)
+            fwd = ForwardMsg.FromString(raw)
+            if fwd.WhichOneof("type") == "script_finished":
+                return nbytes
+
+
+def cold_start(page, importtime=False, timeout=120.0):
+    """Time one cold start of ``page``; returns seconds to ready / first paint (and the import log)."""
+    port = _free_port()
+    cmd = [
+        sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "streamlit", "run", str(page),
+        "--server.headless=true", f"--server.port={port}", "--server.address=127.0.0.1",
+        "--browser.gatherUsageStats=false", "--logger.level=error",
+    ]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    with tempfile.TemporaryFile() as stderr:
+        start = time.monotonic()
+        proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=stderr)
+        try:
+            _wait_ready(proc, port, start + timeout)
+            ready = time.monotonic()
+            nbytes = asyncio.run(_first_paint(port, timeout))
+            painted = time.monotonic()
+        finally:
+            proc.terminate()
+            proc.wait()
+        stderr.seek(0)
+        log = stderr.read().decode("utf-8", "replace")
+
+    sample = {"ready_s": ready - start, "first_run_s": painted - ready, "first_paint_s": painted - start,
+              "first_paint_bytes": nbytes}
+    if importtime:
+        sample["imports"] = parse_importtime(log)
+    return sample
+
+
+def parse_importtime(log):
+    """``-X importtime`` lines → [(module, cumulative µs, depth)] in import order."""
+    out = []
+    for line in log.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            out.append((m.group(4), int(m.group(2)), len(m.group(3)) // 2))
+    return out
+
+
+def profile(pages, repeat=3, imports=0):
+    results = {}
+    for page in pages:
+        name = str(page.relative_to(ROOT))
+        print(f"  {name}", file=sys.stderr)
+        samples = [cold_start(page) for _ in range(repeat)]
+        entry = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+        entry["samples"] = repeat
+        if imports:
+            loaded = cold_start(page, importtime=True)["imports"]
+            top = sorted((item for item in loaded if item[2] == 0), key=lambda item: -item[1])
+            entry["top_imports"] = [(module, us / 1e6) for module, us, _ in top[:imports]]
+            names = {module for module, _, _ in loaded}
+            entry["heavy_modules"] = [m for m in HEAVY_MODULES if m in names]
+        results[name] = entry
+    return results
+
+
+def print_profile(results, file=sys.stdout):
+    width = max((len(name) for name in results), default=4)
+    print(f"\n{'page':<{width}}  {'ready ms':>9}  {'1st run ms':>10}  {'paint ms':>9}  {'KB':>6}  heavy modules",
+          file=file)
+    for name, r in results.items():
+        heavy = ", ".join(r.get("heavy_modules", [])) if "heavy_modules" in r else "-"
+        print(f"{name:<{width}}  {r['ready_s'] * 1e3:>9.0f}  {r['first_run_s'] * 1e3:>10.0f}  "
+              f"{r['first_paint_s'] * 1e3:>9.0f}  {r['first_paint_bytes'] / 1024:>6.1f}  {heavy or '(none)'}",
+              file=file)
+    for name, r in results.items():
+        if r.get("top_imports"):
+            print(f"\n{name}: slowest top-level imports (cumulative)", file=file)
+            for module, seconds in r["top_imports"]:
+                print(f"  {seconds * 1e3:>8.1f} ms  {module}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", help="comma-separated page files relative to the app root (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="cold starts per page (default %(default)s)")
+    parser.add_argument("--imports", type=int, default=0, metavar="N",
+                        help="also profile imports and list the N slowest top-level ones per page")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    pages = [ROOT / p.strip() for p in args.pages.split(",")] if args.pages else page_files()
+    if missing := [str(p) for p in pages if not p.is_file()]:
+        parser.error(f"no such page(s): {', '.join(missing)}")
+
+    harness.use_scratch_databases()
+    results = profile(pages, args.repeat, args.imports)
+    print_profile(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": harness.environment(), "pages": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
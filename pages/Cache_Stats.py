@@ -0,0 +1,35 @@
+import streamlit as st
+import pandas as pd
+
+# Import every kernel module so its cache is registered even before its page is visited
+import toolbox.dish, toolbox.ellipse, toolbox.hx, toolbox.limpet, toolbox.ug27  # noqa: F401
+from toolbox.cache import cache_stats, clear_caches
+
+st.set_page_config(page_title="Kernel Cache Stats", layout="wide")
+
+st.title("🗄️ Kernel Cache Stats")
+st.markdown(
+    "Results of the calculator kernels are shared by every session on this server. "
+    "Repeated standard cases are served from memory instead of being recalculated."
+)
+
+stats = pd.DataFrame(cache_stats())
+
+# ---------------- Totals ----------------
+hits, misses = int(stats["Hits"].sum()), int(stats["Misses"].sum())
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Hits", hits)
+col2.metric("Misses", misses)
+col3.metric("Evictions", int(stats["Evictions"].sum() + stats["Expired"].sum()))
+col4.metric("Hit Rate", f"{100 * hits / (hits + misses):.1f} %" if hits + misses else "–")
+
+# ---------------- Per kernel ----------------
+st.dataframe(stats, use_container_width=True, hide_index=True)
+
+col1, col2 = st.columns([1, 1])
+with col1:
+    st.button("🔄 Refresh")
+with col2:
+    if st.button("🗑️ Clear All Caches"):
+        clear_caches()
+        st.rerun()
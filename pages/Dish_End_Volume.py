@@ -1,9 +1,14 @@
 import streamlit as st
-import pandas as pd
-import math
 import random
 
+from toolbox.dish import STANDARD_IDS, dish_catalogue, dish_table
+from ui.assets import image
+from ui.history import get_history, render_history
+from ui.metrics import finish_rerun, fragment, start_rerun
+from ui.vessel import load_button, push
+
 st.set_page_config(page_title="Dish End Calculator", layout="centered")
+page_run = start_rerun("Dish End")
 
 # -------------------- Humor Bank --------------------
 success_jokes = [
@@ -27,31 +32,24 @@ with col_left:
     st.title("Dish End Volume")
 
 with col_right:
-    st.image("images/Dish.avif", use_container_width=True)
+    image("Dish.avif", use_container_width=True)
 
 # -------------------- Helper Functions --------------------
-def calculate_torispherical_dish(tank_id_mm, sf_mm, dish_thk_mm):
-    crown_radius = tank_id_mm * 1.00
-    knuckle_radius = tank_id_mm * 0.10
-    dish_blank_dia = tank_id_mm + 0.10 * tank_id_mm + 2 * sf_mm
-    dish_end_height = (tank_id_mm * 0.194) + sf_mm + dish_thk_mm
-    d3 = tank_id_mm ** 3
-    d2 = tank_id_mm ** 2
-    volume_m3 = ((0.0847 * d3) + (math.pi * d2 * sf_mm) / 4) * 1e-9
-    return crown_radius, knuckle_radius, dish_blank_dia, dish_end_height, volume_m3
-
-def calculate_ellipsoidal_dish(tank_id_mm, sf_mm, dish_thk_mm):
-    crown_radius = 0.9 * tank_id_mm
-    dish_blank_dia = 1.17 * tank_id_mm + 2 * sf_mm
-    dish_end_height = (0.25 * tank_id_mm) + sf_mm + dish_thk_mm
-    d3 = tank_id_mm ** 3
-    d2 = tank_id_mm ** 2
-    volume_m3 = ((math.pi * d3) / 24 + (math.pi * d2 * sf_mm) / 4) * 1e-9
-    return crown_radius, dish_blank_dia, dish_end_height, volume_m3
+RESULT_COLUMNS = [
+    "Type", "Crown Radius (mm)", "Knuckle Radius (mm)", "Blank Dia (mm)",
+    "Dish End Height (mm)", "Volume (m³)", "Volume (liters)",
+]
+ROUNDING = {
+    "Crown Radius (mm)": 2, "Knuckle Radius (mm)": 2, "Blank Dia (mm)": 2,
+    "Dish End Height (mm)": 2, "Volume (m³)": 6, "Volume (liters)": 3,
+}
+
+@st.cache_data
+def cached_catalogue(sf_mm, dish_thk_mm):
+    return dish_catalogue(sf_mm, dish_thk_mm).round(ROUNDING)
 
 # -------------------- Session State --------------------
-if "history" not in st.session_state:
-    st.session_state.history = []
+history = get_history("history", page="Dish End", key_fields=("Tank ID (mm)", "SF (mm)", "Type"))
 
 if "inputs" not in st.session_state:
     st.session_state.inputs = {"tank_id": "", "sf": "", "dish_thk": ""}
@@ -59,88 +57,108 @@ if "inputs" not in st.session_state:
 # -------------------- UI --------------------
 st.title("🛢️ Dish End Calculator")
 
-# Inputs (blank by default, stored in session_state)
-tank_id = st.text_input(
-    "Enter Tank ID (mm):",
-    value=st.session_state.inputs.get("tank_id", ""),
-    key="tank_id_input"
-)
-
-sf = st.text_input(
-    "Enter Straight Flange (SF) (mm):",
-    value=st.session_state.inputs.get("sf", ""),
-    key="sf_input"
-)
-
-dish_thk = st.text_input(
-    "Enter Dish Thickness (mm):",
-    value=st.session_state.inputs.get("dish_thk", ""),
-    key="thk_input"
-)
-# Buttons
-col1, col2 = st.columns([1,1])
-with col1:
-    calc_btn = st.button("🔢 Calculate")
-with col2:
-    reset_btn = st.button("♻️ Reset Inputs")
-
 # Reset (only clears inputs, keeps history)
-if reset_btn:
+def reset_inputs():
     st.session_state.inputs = {"tank_id": "", "sf": "", "dish_thk": ""}
 
-# Calculation
-if calc_btn:
-    try:
-        tank_id_val = float(tank_id)
-        sf_val = float(sf)
-        dish_thk_val = float(dish_thk)
-
-        # Save inputs
-        st.session_state.inputs = {"tank_id": tank_id, "sf": sf, "dish_thk": dish_thk}
-
-        # Torispherical
-        c_r_t, k_r, b_d_t, h_t, vol_t = calculate_torispherical_dish(tank_id_val, sf_val, dish_thk_val)
-        df_t = pd.DataFrame([{
-            "Type": "Torispherical",
-            "Crown Radius (mm)": round(c_r_t,2),
-            "Knuckle Radius (mm)": round(k_r,2),
-            "Blank Dia (mm)": round(b_d_t,2),
-            "Dish End Height (mm)": round(h_t,2),
-            "Volume (m³)": round(vol_t,6),
-            "Volume (liters)": round(vol_t*1000,3)
-        }])
-
-        # Ellipsoidal
-        c_r_e, b_d_e, h_e, vol_e = calculate_ellipsoidal_dish(tank_id_val, sf_val, dish_thk_val)
-        df_e = pd.DataFrame([{
-            "Type": "Ellipsoidal",
-            "Crown Radius (mm)": round(c_r_e,2),
-            "Knuckle Radius (mm)": "-",
-            "Blank Dia (mm)": round(b_d_e,2),
-            "Dish End Height (mm)": round(h_e,2),
-            "Volume (m³)": round(vol_e,6),
-            "Volume (liters)": round(vol_e*1000,3)
-        }])
-
-        result_df = pd.concat([df_t, df_e], ignore_index=True)
-
-        st.subheader("📊 Dish End Results")
-        st.dataframe(result_df, use_container_width=True)
-
-        # Save to history
-        st.session_state.history.append(result_df)
-
-        # Humor
-        st.success(random.choice(success_jokes))
-
-    except Exception:
-        st.error(random.choice(error_jokes))
-
-# -------------------- History --------------------
-if st.session_state.history:
-    st.subheader("📜 Calculation History")
-    hist_df = pd.concat(st.session_state.history, ignore_index=True)
-    st.dataframe(hist_df, use_container_width=True)
-
-   # csv = hist_df.to_csv(index=False).encode("utf-8")
-    #st.download_button("⬇️ Download History as CSV", data=csv, file_name="dish_end_history.csv", mime="text/csv")
+
+# Inputs, results and history rerun on their own; the header and catalogue are left alone
+@fragment(page_run, "calculator")
+def calculator(run):
+    load_button({"tank_id": "shell_id", "sf": "sf", "dish_thk": "head_thk"}, key="dish_load", text=True,
+                state="inputs", widgets={"tank_id": "tank_id_input", "sf": "sf_input", "dish_thk": "thk_input"})
+
+    # Inputs (blank by default, stored in session_state; a form, so typing sends nothing)
+    with st.form("dish_form", border=False):
+        tank_id = st.text_input(
+            "Enter Tank ID (mm):",
+            value=st.session_state.inputs.get("tank_id", ""),
+            key="tank_id_input"
+        )
+
+        sf = st.text_input(
+            "Enter Straight Flange (SF) (mm):",
+            value=st.session_state.inputs.get("sf", ""),
+            key="sf_input"
+        )
+
+        dish_thk = st.text_input(
+            "Enter Dish Thickness (mm):",
+            value=st.session_state.inputs.get("dish_thk", ""),
+            key="thk_input"
+        )
+        # Buttons
+        col1, col2 = st.columns([1,1])
+        with col1:
+            calc_btn = st.form_submit_button("🔢 Calculate")
+        with col2:
+            st.form_submit_button("♻️ Reset Inputs", on_click=reset_inputs)
+
+    # Calculation
+    if calc_btn:
+        try:
+            with run.phase("parse"):
+                tank_id_val = float(tank_id)
+                sf_val = float(sf)
+                dish_thk_val = float(dish_thk)
+
+            # Save inputs
+            st.session_state.inputs = {"tank_id": tank_id, "sf": sf, "dish_thk": dish_thk}
+
+            # Both head types in one vectorized call
+            with run.phase("kernel"):
+                table = dish_table(tank_id_val, sf_val, dish_thk_val)
+            with run.phase("frame"):
+                full_df = table.round(ROUNDING)
+                result_df = full_df[RESULT_COLUMNS]
+
+            with run.phase("render"):
+                st.subheader("📊 Dish End Results")
+                st.dataframe(result_df, use_container_width=True)
+
+            # Save to history
+            with run.phase("frame"):
+                history.extend(full_df.to_dict("records"))
+            run.count("calculations")
+            push(shell_id=tank_id_val, sf=sf_val, head_thk=dish_thk_val)
+
+            # Humor
+            st.success(random.choice(success_jokes))
+
+        except Exception:
+            run.count("errors")
+            st.error(random.choice(error_jokes))
+
+    # -------------------- History --------------------
+    with run.phase("history"):
+        render_history(history, "📜 Calculation History", key="dish_history")
+
+
+# -------------------- Catalogue --------------------
+# Opening the expander reruns the fragment; the table (and pandas) load only then
+@fragment(page_run, "catalogue")
+def catalogue(run):
+    with st.expander(f"📚 Standard Size Catalogue (ID {STANDARD_IDS[0]}–{STANDARD_IDS[-1]} mm)",
+                     key="catalogue_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        col1, col2 = st.columns(2)
+        with col1:
+            cat_sf = st.number_input("Straight Flange (SF) (mm)", min_value=0.0, value=50.0, key="cat_sf")
+        with col2:
+            cat_thk = st.number_input("Dish Thickness (mm)", min_value=0.0, value=6.0, key="cat_thk")
+
+        catalogue_df = cached_catalogue(cat_sf, cat_thk)
+        st.dataframe(catalogue_df, use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Download Catalogue as CSV",
+            data=catalogue_df.to_csv(index=False).encode("utf-8"),
+            file_name=f"dish_end_catalogue_sf{cat_sf:g}_thk{cat_thk:g}.csv",
+            mime="text/csv"
+        )
+
+
+calculator()
+catalogue()
+
+finish_rerun(page_run)
@@ -1,21 +1,24 @@
 import streamlit as st
-import numpy as np
 import math
 
+from toolbox.ellipse import perimeter_agm, perimeter_simpson
+from ui.assets import image
+from ui.metrics import finish_rerun, fragment, start_rerun
+
 # ----------------- Page Setup -----------------
 st.set_page_config(page_title="Ellipse Perimeter Calculator", layout="wide")
+page_run = start_rerun("Ellipse Perimeter")
 
 # ----------------- Layout -----------------
 col1, col2 = st.columns([3, 1])
 
 with col2:
-    st.image(
-        "https://www.mathsisfun.com/geometry/images/ellipse-axes.svg",
-    )
-
-with col1:
-    st.title("⬭ Ellipse Perimeter Calculator")
+    image("ellipse-axes.svg")
 
+# Inputs and results rerun on their own; the header image, the list and the
+# explanation images below are not re-sent when a or b changes
+@fragment(page_run, "calculator")
+def calculator(run):
     # ----------------- Inputs -----------------
     st.markdown("### ✏️ Enter Ellipse Dimensions")
     a = st.number_input("Semi-Major Axis (a)", min_value=1.0, value=500.0)
@@ -28,9 +31,6 @@ with col1:
     # ----------------- Calculations -----------------
     h = ((a - b) ** 2) / ((a + b) ** 2)
 
-    # Eccentricity
-    e = math.sqrt(1 - (b**2) / (a**2))
-
     # Approximation 1
     P1 = 2 * math.pi * math.sqrt((a**2 + b**2) / 2)
 
@@ -45,21 +45,18 @@ with col1:
                          (3*(a-b)**2) / (10*(a+b) + math.sqrt(a**2 + 14*a*b + b**2)) +
                          (3*a*math.exp(20))/(2**36))
 
-    # ----------------- Numerical Integration (no scipy) -----------------
-    def integrand(theta, e):
-        return np.sqrt(1 - (e**2) * (np.sin(theta))**2)
-
-    def simpson_integration(func, a, b, n=10000):
-        if n % 2 == 1:  # Simpson’s rule needs even number of intervals
-            n += 1
-        h = (b - a) / n
-        x = np.linspace(a, b, n + 1)
-        y = func(x)
-        S = y[0] + y[-1] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-2:2])
-        return S * h / 3
-
-    integral_val = simpson_integration(lambda t: integrand(t, e), 0, math.pi/2, n=10000)
-    P_exact = 4 * a * integral_val
+    # ----------------- Exact Perimeter (elliptic integral) -----------------
+    method = st.radio(
+        "Exact perimeter method",
+        ["AGM (machine precision)", "Simpson (reference, n=10,000)"],
+        horizontal=True
+    )
+    with run.phase("kernel"):
+        if method.startswith("AGM"):
+            P_exact = float(perimeter_agm(a, b))
+        else:
+            P_exact = perimeter_simpson(a, b, n=10000)
+    run.count("calculations")
 
     # ----------------- Results Display -----------------
     st.subheader("📊 Results")
@@ -69,49 +66,90 @@ with col1:
     st.write(f"**Final Approximation (Ramanujan mysterious):** {P_final:.6f}")
     st.write(f"**Highly Accurate (Elliptic Integral):** {P_exact:.6f}")
 
-# ----------------- Explanation (Collapsible) -----------------
-with st.expander("📖 Show Explanation"):
-    # ---------------- Approximation 1 ----------------
-    st.markdown(r"""
-    ### Approximation 1  
-    This approximation is within about 5% of the true value, so long as a is not more than 3 times longer than b (in other words, the ellipse is not too "squashed")  
-    """)
-    st.image("images/Approx1.png", use_container_width=True)
 
-    # ---------------- Approximation 2 ----------------
-    st.markdown(r"""
-    ### Approximation 2  
-    The famous Indian mathematician **Ramanujan** came up with this better approximation:  
-    """)
-    st.image("images/Approx2.png", use_container_width=True)
+# ----------------- Many Ellipses -----------------
+# Opening the expander reruns the fragment; pandas and the table load only then
+@fragment(page_run, "list")
+def ellipse_list(run):
+    with st.expander("📋 Perimeters for a List of Ellipses", key="ellipse_list_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        import pandas as pd
+
+        st.markdown("Add rows or paste columns of **a** and **b**; every perimeter is computed in one AGM call.")
+        ellipses = st.data_editor(
+            pd.DataFrame({"a": [500.0, 1000.0, 750.0], "b": [300.0, 250.0, 750.0]}),
+            num_rows="dynamic", use_container_width=True, key="ellipse_list"
+        ).dropna()
+        ellipses["Perimeter (AGM)"] = perimeter_agm(ellipses["a"].to_numpy(), ellipses["b"].to_numpy())
+        st.dataframe(ellipses, use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Download Perimeters as CSV",
+            data=ellipses.to_csv(index=False).encode("utf-8"),
+            file_name="ellipse_perimeters.csv",
+            mime="text/csv"
+        )
 
-    # ---------------- Approximation 3 ----------------
-    st.markdown(r"""
-    ### Approximation 3  
-    Ramanujan also gave this one. First calculate:  
-    """)
-    st.image("images/Approx3h.png", use_container_width=True)
-    st.markdown("Then use:")
-    st.image("images/Approx3.png", use_container_width=True)
-
-    # ---------------- Final Approximation ----------------
-    st.markdown(r"""
-    ### Final Approximation  
-    Ramanujan’s “mysterious” formula:  
-    """)
-    st.image("images/Approxfinal.png", use_container_width=True)
-    st.markdown(r"""
-    where  
-    """)
-    st.image("images/Approxfinal1.png", use_container_width=True)
 
-    # ---------------- Highly-accurate (Integral) ----------------
-    st.markdown(r"""
-    ### Highly-accurate perimeter  
-    There is a perfect formula using an integral:
-    """)
-    st.image("images/Highaccurate.png", use_container_width=True)
-    st.markdown(r"""
-    Note : e is the "eccentricity" not Euler's number "e" 
-    """)
-    st.image("images/Eccentricity.png", use_container_width=True)
+with col1:
+    st.title("⬭ Ellipse Perimeter Calculator")
+    calculator()
+
+ellipse_list()
+
+# ----------------- Explanation (Collapsible) -----------------
+# The nine formula images are only loaded while the explanation is open
+@fragment(page_run, "explanation")
+def explanation(run):
+    with st.expander("📖 Show Explanation", key="ellipse_explanation", on_change="rerun") as section:
+        if not section.open:
+            return
+        # ---------------- Approximation 1 ----------------
+        st.markdown(r"""
+        ### Approximation 1  
+        This approximation is within about 5% of the true value, so long as a is not more than 3 times longer than b (in other words, the ellipse is not too "squashed")  
+        """)
+        image("Approx1.png", use_container_width=True)
+
+        # ---------------- Approximation 2 ----------------
+        st.markdown(r"""
+        ### Approximation 2  
+        The famous Indian mathematician **Ramanujan** came up with this better approximation:  
+        """)
+        image("Approx2.png", use_container_width=True)
+
+        # ---------------- Approximation 3 ----------------
+        st.markdown(r"""
+        ### Approximation 3  
+        Ramanujan also gave this one. First calculate:  
+        """)
+        image("Approx3h.png", use_container_width=True)
+        st.markdown("Then use:")
+        image("Approx3.png", use_container_width=True)
+
+        # ---------------- Final Approximation ----------------
+        st.markdown(r"""
+        ### Final Approximation  
+        Ramanujan’s “mysterious” formula:  
+        """)
+        image("Approxfinal.png", use_container_width=True)
+        st.markdown(r"""
+        where  
+        """)
+        image("Approxfinal1.png", use_container_width=True)
+
+        # ---------------- Highly-accurate (Integral) ----------------
+        st.markdown(r"""
+        ### Highly-accurate perimeter  
+        There is a perfect formula using an integral:
+        """)
+        image("Highaccurate.png", use_container_width=True)
+        st.markdown(r"""
+        Note : e is the "eccentricity" not Euler's number "e" 
+        """)
+        image("Eccentricity.png", use_container_width=True)
+
+
+explanation()
+
+finish_rerun(page_run)
@@ -1,8 +1,12 @@
 import streamlit as st
-import math
-import pandas as pd
 import random
 
+from toolbox.hx import (LANE_WIDTH, LAYOUTS, OTL_CLEARANCE, PASSES, PITCH_RATIO, SIZING_STATUS, TUBE_LENGTHS, TUBE_ODS,
+                       size_exchanger, size_shell, tube_area, tube_count, tube_layout)
+from toolbox.pipes import load_catalogue
+from ui.history import get_history, render_history, render_quick_history
+from ui.metrics import finish_rerun, fragment, start_rerun
+
 # -------------------- Humor messages --------------------
 humor_success = [
     "🎉 Congrats! You just made the tubes proud.",
@@ -20,77 +24,251 @@ humor_error = [
 
 # -------------------- Streamlit UI --------------------
 st.set_page_config(page_title="Tube Heat Transfer Area Calculator", layout="wide")
+page_run = start_rerun("Heat Exchanger Area")
 
 st.title("🔄 Tube Heat Transfer Area Calculator")
 
 # -------------------- Session State --------------------
-if "heat_exchanger_area_history" not in st.session_state:
-    st.session_state.heat_exchanger_area_history = []   # quick list history
-
-if "heat_exchanger_area_detailed_history" not in st.session_state:
-    st.session_state.heat_exchanger_area_detailed_history = []   # detailed history with inputs
-
-# -------------------- Inputs --------------------
-col1, col2, col3 = st.columns(3)
-with col1:
-    tube_dia_mm = st.text_input("Tube Diameter (mm)", value="", key="tube_dia_input")
-with col2:
-    tube_length_m = st.text_input("Tube Length (m)", value="", key="tube_length_input")
-with col3:
-    no_of_tubes = st.text_input("Number of Tubes", value="", key="tube_count_input")
-
-# Action buttons
-colA, colB = st.columns([1,1])
-with colA:
-    calculate_btn = st.button("🔢 Calculate Heat Exchanger Area")
-with colB:
-    reset_btn = st.button("♻️ Reset Inputs")
+# detailed history with inputs
+hx_history = get_history(
+    "heat_exchanger_area_detailed_history", page="Heat Exchanger Area",
+    key_fields=("Tube Diameter (mm)", "Tube Length (m)", "No. of Tubes")
+)
 
 # -------------------- Reset functionality --------------------
-if reset_btn:
+def reset_inputs():
     st.session_state.tube_dia_input = ""
     st.session_state.tube_length_input = ""
     st.session_state.tube_count_input = ""
 
-# -------------------- Calculation --------------------
-if calculate_btn:
-    if not tube_dia_mm or not tube_length_m or not no_of_tubes:
-        st.warning(random.choice(humor_error))
-    else:
-        try:
-            tube_dia_mm = float(tube_dia_mm)
-            tube_length_m = float(tube_length_m)
-            no_of_tubes = int(no_of_tubes)
-
-            # Formula: π * d * L * N / 1000 (to convert mm·m → m²)
-            result = (math.pi * tube_dia_mm * tube_length_m * no_of_tubes) / 1000
-
-            st.success(
-                f"🔄 Heat Transfer Area = **{result:.3f} m²**\n\n"
-                + random.choice(humor_success)
-            )
-
-            # Save in detailed history
-            st.session_state.heat_exchanger_area_detailed_history.append({
-                "Tube Diameter (mm)": tube_dia_mm,
-                "Tube Length (m)": tube_length_m,
-                "No. of Tubes": no_of_tubes,
-                "Heat Transfer Area (m²)": round(result, 3)
+
+# Standard heat exchanger tube ODs (parsed once per process)
+tubes = load_catalogue("tube")
+
+
+def use_standard_tube():
+    od = st.session_state.tube_std_od
+    if od is not None:
+        st.session_state.tube_dia_input = f"{od:g}"
+
+# Inputs, result and histories rerun on their own; the title is sent once
+@fragment(page_run, "calculator")
+def calculator(run):
+    # -------------------- Inputs --------------------
+    st.selectbox(
+        "📐 Standard tube OD (fills Tube Diameter)", tubes.ods.tolist(), index=None,
+        format_func=lambda od: f"{od:g} mm ({tubes.size[tubes.nearest(od)]})", placeholder="Pick a tube size...",
+        key="tube_std_od", on_change=use_standard_tube
+    )
+    # A form: typing sends nothing until a button is pressed
+    with st.form("hx_form", border=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            tube_dia_mm = st.text_input("Tube Diameter (mm)", value="", key="tube_dia_input")
+        with col2:
+            tube_length_m = st.text_input("Tube Length (m)", value="", key="tube_length_input")
+        with col3:
+            no_of_tubes = st.text_input("Number of Tubes", value="", key="tube_count_input")
+
+        # Action buttons
+        colA, colB = st.columns([1,1])
+        with colA:
+            calculate_btn = st.form_submit_button("🔢 Calculate Heat Exchanger Area")
+        with colB:
+            st.form_submit_button("♻️ Reset Inputs", on_click=reset_inputs)
+
+    # -------------------- Calculation --------------------
+    if calculate_btn:
+        if not tube_dia_mm or not tube_length_m or not no_of_tubes:
+            run.count("errors")
+            st.warning(random.choice(humor_error))
+        else:
+            try:
+                tube_dia_mm = float(tube_dia_mm)
+                tube_length_m = float(tube_length_m)
+                no_of_tubes = int(no_of_tubes)
+
+                with run.phase("kernel"):
+                    result = float(tube_area(tube_dia_mm, tube_length_m, no_of_tubes))
+                run.count("calculations")
+
+                st.success(
+                    f"🔄 Heat Transfer Area = **{result:.3f} m²**\n\n"
+                    + random.choice(humor_success)
+                )
+
+                standard_od = float(tubes.nearest_od(tube_dia_mm))
+                if standard_od != tube_dia_mm:
+                    st.caption(f"📐 Not a standard tube OD; the nearest is {standard_od:g} mm "
+                               f"({tubes.size[tubes.nearest(standard_od)]}).")
+
+                # Save in detailed history
+                with run.phase("frame"):
+                    hx_history.append({
+                        "Tube Diameter (mm)": tube_dia_mm,
+                        "Tube Length (m)": tube_length_m,
+                        "No. of Tubes": no_of_tubes,
+                        "Heat Transfer Area (m²)": round(result, 3)
+                    })
+
+            except ValueError:
+                run.count("errors")
+                st.error("⚠️ Please enter valid numbers only!")
+
+    # -------------------- Histories --------------------
+    with run.phase("history"):
+        render_history(hx_history, "📜 Detailed Heat Exchanger Area History", key="hx_history")
+        render_quick_history(hx_history, "Heat Transfer Area (m²)", "📜 Quick Heat Exchanger Area History")
+
+
+# -------------------- Tube count & layout --------------------
+def use_tube_count(tube_od, n):
+    st.session_state.tube_dia_input = f"{tube_od:g}"
+    st.session_state.tube_count_input = str(n)
+
+
+def layout_inputs(prefix):
+    """Tube OD, pitch, layout and pass inputs shared by the two sections below."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        tube_od = st.selectbox("Tube OD (mm)", tubes.ods.tolist(), index=int(tubes.ods.searchsorted(19.05)),
+                               format_func=lambda od: f"{od:g} ({tubes.size[tubes.nearest(od)]})", key=f"{prefix}_od")
+        layout = st.selectbox("Layout", LAYOUTS, format_func=lambda a: f"{a}°", key=f"{prefix}_layout")
+    with col2:
+        passes = st.selectbox("Tube passes", PASSES, key=f"{prefix}_passes")
+        otl_clearance = st.number_input("Shell ID − OTL (mm)", min_value=0.0, value=OTL_CLEARANCE, key=f"{prefix}_otl")
+    with col3:
+        lane_width = st.number_input("Pass lane width (mm)", min_value=0.0, value=LANE_WIDTH, key=f"{prefix}_lane")
+    return tube_od, layout, passes, otl_clearance, lane_width, col3
+
+
+@fragment(page_run, "layout")
+def layout_section(run):
+    with st.expander("🧮 Tube count & tube-sheet layout", key="layout_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        shell_id = st.number_input("Shell ID (mm)", min_value=50.0, value=600.0, step=5.0, key="layout_shell_id")
+        tube_od, layout, passes, otl_clearance, lane_width, col3 = layout_inputs("layout")
+        with col3:
+            pitch = st.number_input("Tube pitch (mm)", min_value=tube_od, value=round(PITCH_RATIO * tube_od, 2),
+                                    key=f"layout_pitch_{tube_od:g}")
+
+        with run.phase("kernel"):
+            n = int(tube_count(shell_id, tube_od, pitch, layout, passes, otl_clearance, lane_width))
+            x, y = tube_layout(shell_id, tube_od, pitch, layout, passes, otl_clearance, lane_width)
+        run.count("calculations")
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Tubes", f"{n:,}")
+        c2.metric("OTL diameter", f"{shell_id - otl_clearance:g} mm")
+        c3.metric("Area per metre of tube", f"{float(tube_area(tube_od, 1.0, n)):.2f} m²/m")
+        if n:
+            import pandas as pd
+
+            radius = shell_id / 2
+            st.vega_lite_chart(pd.DataFrame({"x (mm)": x, "y (mm)": y}), {
+                "width": 420, "height": 420,
+                "mark": {"type": "circle", "size": max(4.0, 120000 * (tube_od / shell_id) ** 2)},
+                "encoding": {
+                    "x": {"field": "x (mm)", "type": "quantitative", "scale": {"domain": [-radius, radius]}},
+                    "y": {"field": "y (mm)", "type": "quantitative", "scale": {"domain": [-radius, radius]}},
+                },
             })
+            if st.button(f"➡️ Use {n:,} × {tube_od:g} mm tubes in the area calculator",
+                         on_click=use_tube_count, args=(tube_od, n), key="layout_use"):
+                st.rerun()
+
+
+# -------------------- Shell sizing --------------------
+@fragment(page_run, "shell_sizer")
+def shell_sizer(run):
+    with st.expander("🎯 Size the shell for a target area", key="shell_sizer_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        col1, col2 = st.columns(2)
+        with col1:
+            target_area = st.number_input("Target area (m²)", min_value=0.1, value=150.0, key="size_hx_area")
+        with col2:
+            tube_length = st.number_input("Tube length (m)", min_value=0.1, value=6.0, key="size_hx_length")
+        tube_od, _, passes, otl_clearance, lane_width, col3 = layout_inputs("size_hx")
+        with col3:
+            ratios = st.multiselect("Pitch / OD", [1.25, 1.3, 1.33, 1.4, 1.5], default=[1.25, 1.33, 1.5],
+                                    key="size_hx_ratios")
+        if not ratios:
+            st.warning("Pick at least one pitch ratio.")
+            return
+
+        with run.phase("kernel"):
+            designs = size_shell(target_area, tube_od, tube_length, pitch_ratios=ratios, passes=passes,
+                                 otl_clearance=otl_clearance, lane_width=lane_width)
+        run.count("calculations")
+        st.caption(f"Every layout × {len(ratios)} pitch(es) × shell IDs from 150 to 2500 mm in 5 mm steps was counted.")
+        if designs.empty:
+            st.error("❌ Even a 2500 mm shell cannot hold enough tubes. Use longer tubes or more shells.")
+            return
+        best = designs.iloc[0]
+        st.success(f"✅ Smallest shell: {best['Shell ID (mm)']:g} mm ID with {int(best['Tubes']):,} tubes on a "
+                   f"{best['Layout (°)']}° layout at {best['Pitch (mm)']:.2f} mm pitch ({best['Area (m²)']:.1f} m²).")
+        st.dataframe(designs.round(3), hide_index=True, use_container_width=True)
 
-            # Save in quick history
-            st.session_state.heat_exchanger_area_history.append(round(result, 3))
 
-        except ValueError:
-            st.error("⚠️ Please enter valid numbers only!")
+# -------------------- Duty-based sizing --------------------
+DUTY_COLUMNS = ("Duty (kW)", "Hot in (°C)", "Hot out (°C)", "Cold in (°C)", "Cold out (°C)", "U (W/m²·K)",
+                "Shell passes", "Tube passes")
+DUTY_EXAMPLE = [
+    (500.0, 150.0, 90.0, 30.0, 70.0, 400.0, 1, 2),
+    (1200.0, 120.0, 60.0, 25.0, 55.0, 800.0, 1, 4),
+    (250.0, 100.0, 50.0, 30.0, 70.0, 350.0, 2, 2),
+]
+
+
+@fragment(page_run, "duty_sizer")
+def duty_sizer(run):
+    with st.expander("🌡️ Size bundles from duty (LMTD)", key="duty_sizer_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        import pandas as pd
+
+        st.caption("One row per exchanger (add rows or paste a list). Area = Q / (U·F·LMTD), counterflow "
+                   "LMTD, F for 2, 4, ... tube passes per shell pass (F = 1 with one tube pass).")
+        cases = st.data_editor(pd.DataFrame(DUTY_EXAMPLE, columns=DUTY_COLUMNS), num_rows="dynamic",
+                               hide_index=True, use_container_width=True, key="duty_cases")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            ods = st.multiselect("Tube ODs (mm)", tubes.ods.tolist(), default=list(TUBE_ODS),
+                                 format_func=lambda od: f"{od:g} ({tubes.size[tubes.nearest(od)]})", key="duty_ods")
+        with col2:
+            lengths = st.multiselect("Tube lengths (m)", TUBE_LENGTHS, default=list(TUBE_LENGTHS), key="duty_lengths")
+        with col3:
+            margin = st.number_input("Area margin (%)", min_value=0.0, value=10.0, key="duty_margin")
+        cases = cases.dropna()
+        if not ods or not lengths or cases.empty:
+            st.warning("Enter at least one complete exchanger and pick tube ODs and lengths.")
+            return
+
+        with run.phase("kernel"):
+            result = size_exchanger(*(cases[c].to_numpy(float) for c in DUTY_COLUMNS),
+                                    tube_ods=sorted(ods), tube_lengths=sorted(lengths), margin=margin)
+        run.count("calculations", len(cases))
+        run.count("errors", int((result["status"] != 0).sum()))
+
+        with run.phase("frame"):
+            table = pd.DataFrame({
+                "LMTD (K)": result["lmtd"], "F": result["F"], "Required Area (m²)": result["required_area"],
+                "Tube OD (mm)": result["tube_od"], "Tube Length (m)": result["tube_length"],
+                "Tubes": result["no_of_tubes"], "Area (m²)": result["area"],
+                "Status": [SIZING_STATUS[s] for s in result["status"]],
+            })
+        st.write("### 📊 Smallest passing bundles")
+        st.dataframe(table.round(3), hide_index=True, use_container_width=True)
+        st.caption(f"Each exchanger was matched against {len(ods)} OD(s) × {len(lengths)} length(s) × "
+                   "1–5,000 tubes; the **🎯 Size the shell** section finds a shell for the chosen bundle.")
+
 
-# -------------------- Histories --------------------
-if st.session_state.heat_exchanger_area_detailed_history:
-    st.subheader("📜 Detailed Heat Exchanger Area History")
-    df = pd.DataFrame(st.session_state.heat_exchanger_area_detailed_history)
-    st.dataframe(df, use_container_width=True)
+calculator()
+layout_section()
+shell_sizer()
+duty_sizer()
 
-if st.session_state.heat_exchanger_area_history:
-    st.subheader("📜 Quick Heat Exchanger Area History")
-    st.write(st.session_state.heat_exchanger_area_history)
+finish_rerun(page_run)
 
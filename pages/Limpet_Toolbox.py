@@ -1,19 +1,23 @@
 import streamlit as st
-import math
-import pandas as pd
+
+from toolbox.limpet import MIN_GAP, helical_coil, limpet_coil, size_limpet
+from toolbox.pipes import load_catalogue
+from ui.history import get_history, render_history, render_quick_history
+from ui.metrics import finish_rerun, fragment, start_rerun
+from ui.vessel import load_button, push
 
 # Streamlit app configuration
 st.set_page_config(page_title="Limpet Coil Calculator", layout="centered")
+page_run = start_rerun("Limpet Coil")
 
 st.title("🐍 Limpet Coil Length, Weight & Heat Transfer Area Calculator")
 st.markdown("Get your coil numbers right... and your smile brighter 😄")
 
 # ---------------- Session State ----------------
-if "limpet_coil_history" not in st.session_state:
-    st.session_state.limpet_coil_history = []   # quick list (Heat Transfer Area only)
-
-if "limpet_coil_detailed_history" not in st.session_state:
-    st.session_state.limpet_coil_detailed_history = []   # detailed history with inputs
+# detailed history with inputs
+limpet_history = get_history(
+    "limpet_coil_detailed_history", page="Limpet Coil", key_fields=("Shell ID (mm)", "Shell Height (mm)")
+)
 
 # ---------------- Reset Function ----------------
 def reset_inputs():
@@ -26,81 +30,181 @@ def reset_inputs():
     st.session_state.coil_coverage = None
     st.session_state.density = None
 
-# ---------------- Inputs ----------------
-shell_id = st.number_input("1️⃣ Shell ID (mm)", value=st.session_state.get("shell_id", None), step=1.0, key="shell_id")
-shell_height = st.number_input("2️⃣ Shell Height (mm)", value=st.session_state.get("shell_height", None), step=1.0, key="shell_height")
-shell_thk = st.number_input("3️⃣ Shell Thickness (mm)", value=st.session_state.get("shell_thk", None), step=0.1, key="shell_thk")
-limpet_od = st.number_input("4️⃣ Limpet OD (mm)", value=st.session_state.get("limpet_od", None), step=0.1, key="limpet_od")
-limpet_thk = st.number_input("5️⃣ Limpet Thickness (mm)", value=st.session_state.get("limpet_thk", None), step=0.1, key="limpet_thk")
-limpet_pitch = st.number_input("6️⃣ Limpet Pitch (mm)", value=st.session_state.get("limpet_pitch", None), step=0.1, key="limpet_pitch")
-coil_coverage = st.number_input("7️⃣ Limpet Coil Coverage (%)", value=st.session_state.get("coil_coverage", None), step=0.1, key="coil_coverage")
-density = st.number_input("8️⃣ Density of Material (kg/m³)", value=st.session_state.get("density", None), step=0.1, key="density")
-
-col1, col2 = st.columns(2)
-with col1:
-    calculate = st.button("💡 Calculate")
-with col2:
-    reset = st.button("🔄 Reset", on_click=reset_inputs)
-
-# ---------------- Calculation ----------------
-if calculate:
-    try:
-        # --- Limpet Coil Length & Weight ---
-        single_turn_length = (((shell_id + shell_thk*2) + (2*limpet_thk)) * math.pi) * 10**-3  # m
-
-        no_of_turns = (shell_height * (coil_coverage / 100)) / limpet_pitch
-
-        total_length = single_turn_length * no_of_turns
-
-        limpet_weight = (
-            ((shell_id + shell_thk*2) + (2*limpet_thk)) * math.pi *
-            (math.pi * limpet_od * 1.04 / 2)
-        ) * (limpet_thk * density) * 10**-9  # kg
-
-        Total_limpet_weight = limpet_weight * no_of_turns
-
-        total_length_m = math.pi * shell_id * no_of_turns / 1000  # m
-        heat_transfer_area = math.pi * (limpet_od / 1000) * total_length_m  # m²
-
-        # Save results
-        result = {
-            "Shell ID (mm)": shell_id,
-            "Shell Height (mm)": shell_height,
-            "Single Turn Length (m)": round(single_turn_length, 3),
-            "Number of Turns": round(no_of_turns, 2),
-            "Total Coil Length (m)": round(total_length, 3),
-            "Single Turn Limpet Weight (kg)": round(limpet_weight, 3),
-            "Total Limpet Weight (kg)": round(Total_limpet_weight, 3),
-            "Heat Transfer Area (m²)": round(heat_transfer_area, 3)
-        }
-        st.session_state.limpet_coil_detailed_history.append(result)
-        st.session_state.limpet_coil_history.append(round(heat_transfer_area, 3))
-
-        # Display results
-        st.success("✅ Calculations Completed!")
-        st.write(f"📏 **Single Turn Length:** {single_turn_length:.3f} m")
-        st.write(f"🔄 **Number of Turns:** {no_of_turns:.2f}")
-        st.write(f"🌀 **Total Coil Length:** {total_length:.3f} m")
-        st.write(f"⚖️ **Limpet Weight:** {limpet_weight:.3f} kg")
-        st.write(f"⚖️ **Total Limpet Weight:** {Total_limpet_weight:.3f} kg")
-        st.write(f"🔥 **Heat Transfer Area:** {heat_transfer_area:.3f} m²")
-
-        # Humor section
+# Standard pipes a half-pipe can be cut from (parsed once per process)
+pipes = load_catalogue("pipe")
+
+
+def use_standard_pipe():
+    row = st.session_state.limpet_std_pipe
+    if row is not None:
+        st.session_state.limpet_od = float(pipes.od[row])
+        st.session_state.limpet_thk = float(pipes.wall[row])
+
+# Inputs, results and histories rerun on their own; the title is sent once
+@fragment(page_run, "calculator")
+def calculator(run):
+    # ---------------- Inputs ----------------
+    load_button({
+        "shell_id": "shell_id", "shell_height": "shell_length", "shell_thk": "shell_thk", "limpet_od": "limpet_od",
+        "limpet_thk": "limpet_thk", "limpet_pitch": "limpet_pitch", "coil_coverage": "coil_coverage",
+        "density": "limpet_density",
+    }, key="limpet_load")
+    st.selectbox(
+        "📐 Standard half-pipe (fills Limpet OD and Thickness)", range(len(pipes)), index=None,
+        format_func=pipes.label, placeholder="Pick a pipe size...", key="limpet_std_pipe", on_change=use_standard_pipe
+    )
+
+    # A form: editing the inputs sends nothing until a button is pressed
+    with st.form("limpet_form", border=False):
+        shell_id = st.number_input("1️⃣ Shell ID (mm)", value=None, step=1.0, key="shell_id")
+        shell_height = st.number_input("2️⃣ Shell Height (mm)", value=None, step=1.0, key="shell_height")
+        shell_thk = st.number_input("3️⃣ Shell Thickness (mm)", value=None, step=0.1, key="shell_thk")
+        limpet_od = st.number_input("4️⃣ Limpet OD (mm)", value=None, step=0.1, key="limpet_od")
+        limpet_thk = st.number_input("5️⃣ Limpet Thickness (mm)", value=None, step=0.1, key="limpet_thk")
+        limpet_pitch = st.number_input("6️⃣ Limpet Pitch (mm)", value=None, step=0.1, key="limpet_pitch")
+        coil_coverage = st.number_input("7️⃣ Limpet Coil Coverage (%)", value=None, step=0.1, key="coil_coverage")
+        density = st.number_input("8️⃣ Density of Material (kg/m³)", value=None, step=0.1, key="density")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            calculate = st.form_submit_button("💡 Calculate")
+        with col2:
+            st.form_submit_button("🔄 Reset", on_click=reset_inputs)
+
+    # ---------------- Calculation ----------------
+    if calculate:
+        try:
+            with run.phase("kernel"):
+                coil = limpet_coil(shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density)
+            run.count("calculations")
+            single_turn_length = coil["single_turn_length"]
+            no_of_turns = coil["no_of_turns"]
+            total_length = coil["total_length"]
+            limpet_weight = coil["limpet_weight"]
+            Total_limpet_weight = coil["total_limpet_weight"]
+            heat_transfer_area = coil["heat_transfer_area"]
+
+            # Save results
+            result = {
+                "Shell ID (mm)": shell_id,
+                "Shell Height (mm)": shell_height,
+                "Single Turn Length (m)": round(single_turn_length, 3),
+                "Number of Turns": round(no_of_turns, 2),
+                "Total Coil Length (m)": round(total_length, 3),
+                "Single Turn Limpet Weight (kg)": round(limpet_weight, 3),
+                "Total Limpet Weight (kg)": round(Total_limpet_weight, 3),
+                "Heat Transfer Area (m²)": round(heat_transfer_area, 3)
+            }
+            with run.phase("frame"):
+                limpet_history.append(result)
+            push(shell_id=shell_id, shell_length=shell_height, shell_thk=shell_thk, limpet_od=limpet_od,
+                 limpet_thk=limpet_thk, limpet_pitch=limpet_pitch, coil_coverage=coil_coverage, limpet_density=density)
+
+            # Display results
+            st.success("✅ Calculations Completed!")
+            st.write(f"📏 **Single Turn Length:** {single_turn_length:.3f} m")
+            st.write(f"🔄 **Number of Turns:** {no_of_turns:.2f}")
+            st.write(f"🌀 **Total Coil Length:** {total_length:.3f} m")
+            st.write(f"⚖️ **Limpet Weight:** {limpet_weight:.3f} kg")
+            st.write(f"⚖️ **Total Limpet Weight:** {Total_limpet_weight:.3f} kg")
+            st.write(f"🔥 **Heat Transfer Area:** {heat_transfer_area:.3f} m²")
+
+            row = int(pipes.nearest(limpet_od, limpet_thk))
+            if (pipes.od[row], pipes.wall[row]) != (limpet_od, limpet_thk):
+                st.caption(f"📐 Not a standard half-pipe; the nearest is {pipes.label(row)}.")
+
+            # Same design as a true helix: pitch included, coil on the shell OD
+            with run.phase("kernel"):
+                helix = helical_coil(shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density)
+            st.write("**🧵 As a true helix**")
+            st.write(f"🌀 **Helical Coil Length:** {float(helix['total_length']):.3f} m "
+                     f"(helix angle {float(helix['helix_angle']):.2f}°)")
+            st.write(f"⚖️ **Total Limpet Weight:** {float(helix['total_limpet_weight']):.3f} kg")
+            st.write(f"🔥 **Heat Transfer Area:** {float(helix['heat_transfer_area']):.3f} m² (π × limpet OD × helical length)")
+            st.write(f"🟫 **Covered Shell Area:** {float(helix['covered_area']):.3f} m² (shell under the half-pipe bore)")
+
+            # Humor section
+            st.markdown("---")
+            st.markdown("💬 *Fun Fact:* If coils were noodles, you’d now be the chef of the year 🍜.")
+            st.markdown("🚀 *Engineering wisdom:* Measure twice, cut once… unless it’s Monday morning ☕.")
+
+        except ZeroDivisionError:
+            run.count("errors")
+            st.error("Oops! Your limpet pitch is zero. Even in engineering, dividing by zero is bad math 😅")
+
+    # ---------------- Histories ----------------
+    if len(limpet_history):
         st.markdown("---")
-        st.markdown("💬 *Fun Fact:* If coils were noodles, you’d now be the chef of the year 🍜.")
-        st.markdown("🚀 *Engineering wisdom:* Measure twice, cut once… unless it’s Monday morning ☕.")
-
-    except ZeroDivisionError:
-        st.error("Oops! Your limpet pitch is zero. Even in engineering, dividing by zero is bad math 😅")
-
-# ---------------- Histories ----------------
-if st.session_state.limpet_coil_detailed_history:
-    st.markdown("---")
-    st.subheader("📜 Detailed Limpet Coil Calculation History")
-    df = pd.DataFrame(st.session_state.limpet_coil_detailed_history)
-    st.dataframe(df, use_container_width=True)
-
-if st.session_state.limpet_coil_history:
-    st.subheader("📜 Quick Heat Transfer Area History")
-    st.write(st.session_state.limpet_coil_history)
+    with run.phase("history"):
+        render_history(limpet_history, "📜 Detailed Limpet Coil Calculation History", key="limpet_history")
+        render_quick_history(limpet_history, "Heat Transfer Area (m²)", "📜 Quick Heat Transfer Area History")
+
+
+# ---------------- Sizing solver ----------------
+# Closed by default; opening the expander reruns only this fragment
+@fragment(page_run, "sizer")
+def sizer(run):
+    with st.expander("🎯 Size a coil for a required heat transfer area", key="sizer_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        st.caption("Every pitch × half-pipe × coverage combination is checked in one vectorized pass; designs "
+                   "that reach the heat transfer area (π × limpet OD × helical length, as above) and leave room to "
+                   "weld are ranked by weight.")
+        col1, col2 = st.columns(2)
+        with col1:
+            required_area = st.number_input("Required area (m²)", min_value=0.1, value=8.0, key="size_area")
+            size_id = st.number_input("Shell ID (mm)", min_value=1.0, value=2000.0, key="size_shell_id")
+            size_height = st.number_input("Shell height (mm)", min_value=1.0, value=3000.0, key="size_shell_height")
+            size_thk = st.number_input("Shell thickness (mm)", min_value=0.0, value=10.0, key="size_shell_thk")
+        with col2:
+            size_density = st.number_input("Limpet density (kg/m³)", min_value=1.0, value=7850.0, key="size_density")
+            pitch_range = st.slider("Pitch range (mm)", 30, 600, (50, 400), step=5, key="size_pitch")
+            coverage_range = st.slider("Coverage range (%)", 10, 100, (40, 100), step=5, key="size_coverage")
+            min_gap = st.number_input("Min. gap between turns (mm)", min_value=0.0, value=MIN_GAP, key="size_gap")
+        sizes_by_od = dict(zip(pipes.od, pipes.size))
+        col1, col2 = st.columns(2)
+        with col1:
+            od_range = st.select_slider(
+                "Half-pipe sizes (NPS)", pipes.ods.tolist(), value=(60.3, 114.3),
+                format_func=lambda od: sizes_by_od[od], key="size_nps"
+            )
+        with col2:
+            schedules = st.multiselect("Schedules", pipes.schedules(), default=["10S", "40"], key="size_schedules")
+        rows = pipes.between(*od_range, schedules)
+        st.caption(f"{len(rows)} standard half-pipe sizes in the sweep.")
+
+        if not len(rows):
+            st.warning("No standard pipe in that range has those schedules.")
+            return
+        import numpy as np
+
+        with run.phase("kernel"):
+            designs = size_limpet(
+                required_area, size_id, size_height, size_thk, size_density,
+                pitches=np.arange(pitch_range[0], pitch_range[1] + 1e-9, 5.0), sizes=pipes.sizes(rows),
+                coverages=np.arange(coverage_range[0], coverage_range[1] + 1e-9, 5.0), min_gap=min_gap,
+            )
+        run.count("calculations")
+        if designs.empty:
+            st.error("❌ No design on this grid reaches the area. Widen the ranges, add larger half-pipes or "
+                     "lower the gap.")
+            return
+        with run.phase("render"):
+            best = designs.iloc[0]
+            st.success(f"✅ {len(designs)} feasible designs. Lightest: {best['Half-pipe OD (mm)']:g} × "
+                       f"{best['Half-pipe Thk (mm)']:g} half-pipe at {best['Pitch (mm)']:g} mm pitch over "
+                       f"{best['Coverage (%)']:g}% of the shell, {best['Total Limpet Weight (kg)']:.1f} kg.")
+            st.dataframe(designs.head(100).round(3), hide_index=True, use_container_width=True)
+            st.download_button(
+                "⬇️ Download all feasible designs as CSV",
+                data=designs.to_csv(index=False).encode("utf-8"),
+                file_name=f"limpet_sizing_{required_area:g}m2.csv",
+                mime="text/csv"
+            )
+
+
+calculator()
+sizer()
+
+finish_rerun(page_run)
 
@@ -0,0 +1,133 @@
+import streamlit as st
+
+import numpy as np
+
+from toolbox.parametric import KERNELS, StudyCancelled, default_workers, run_study
+from ui.metrics import finish_rerun, fragment, start_rerun
+
+st.set_page_config(page_title="Parametric Study", layout="wide")
+page_run = start_rerun("Parametric Study")
+
+st.title("🧮 Parametric Study")
+st.markdown(
+    "Sweep every combination of the inputs below through a calculator. The grid is split across "
+    "worker processes that write their results straight into shared memory, so millions of "
+    "combinations take seconds."
+)
+
+# ---------------- Default grids ----------------
+# input → (start, stop, steps); steps = 1 holds the input at start
+DEFAULT_AXES = {
+    "ug27": {
+        "P": (0.5, 3.0, 26), "S": (118.0, 138.0, 2), "Do": (500.0, 3000.0, 51), "t": (6.0, 30.0, 13),
+        "Ca": (0.0, 3.0, 3), "mill_tol": (0.3, 0.3, 1), "E": (0.7, 1.0, 3),
+    },
+    "dish": {"tank_id_mm": (300.0, 6000.0, 115), "sf_mm": (25.0, 50.0, 2), "dish_thk_mm": (6.0, 20.0, 8)},
+    "limpet": {
+        "shell_id": (800.0, 4000.0, 33), "shell_height": (1000.0, 6000.0, 26), "shell_thk": (8.0, 16.0, 5),
+        "limpet_od": (60.0, 100.0, 3), "limpet_thk": (5.0, 8.0, 4), "limpet_pitch": (80.0, 200.0, 13),
+        "coil_coverage": (60.0, 90.0, 4), "density": (7850.0, 7850.0, 1),
+    },
+    "hx_area": {"tube_dia_mm": (19.05, 31.75, 3), "tube_length_m": (1.0, 12.0, 45), "no_of_tubes": (10.0, 2000.0, 200)},
+}
+
+
+def cancel_study():
+    st.session_state["ps_cancelled"] = True
+
+
+@fragment(page_run, "study")
+def study(run):
+    import pandas as pd
+
+    name = st.selectbox(
+        "Calculator", list(KERNELS), format_func=lambda k: f"{k} — {KERNELS[k].description}", key="ps_kernel"
+    )
+    kernel = KERNELS[name]
+
+    st.write("#### Grid")
+    st.caption("Each input takes `Steps` evenly spaced values from `Start` to `Stop`; 1 step holds it at `Start`.")
+    spec = st.data_editor(
+        pd.DataFrame(
+            [{"Input": k, "Start": a, "Stop": b, "Steps": n} for k, (a, b, n) in DEFAULT_AXES[name].items()]
+        ),
+        column_config={
+            "Input": st.column_config.TextColumn(disabled=True),
+            "Steps": st.column_config.NumberColumn(min_value=1, step=1, required=True),
+        },
+        hide_index=True, key=f"ps_grid_{name}"
+    )
+    complete = not spec[["Start", "Stop", "Steps"]].isna().any().any()
+    if complete:
+        axes = {
+            row["Input"]: np.linspace(row["Start"], row["Stop"], int(row["Steps"])) if row["Steps"] > 1 else row["Start"]
+            for row in spec.to_dict("records")
+        }
+        cells = int(np.prod([int(n) for n in spec["Steps"]]))
+        st.caption(f"{cells:,} combinations × {len(kernel.outputs)} outputs "
+                   f"({cells * len(kernel.outputs) * 8 / 2**20:,.1f} MB of results)")
+
+    cores = default_workers()
+    workers = st.slider("Worker processes", 1, max(cores, 2), cores, key="ps_workers",
+                        help="1 runs in the server process; more spread the grid across a process pool")
+
+    if st.session_state.pop("ps_cancelled", False):
+        st.warning("⏹️ Study cancelled.")
+
+    if st.button("▶️ Run Study"):
+        if not complete:
+            run.count("errors")
+            st.error("❌ Every input needs Start, Stop and Steps.")
+        else:
+            bar = st.progress(0.0, text="Starting workers...")
+            # Pressing Cancel reruns the script, which interrupts run_study and stops the workers
+            cancel_slot = st.empty()
+            cancel_slot.button("⏹️ Cancel", on_click=cancel_study)
+            try:
+                with run.phase("kernel"):
+                    result = run_study(
+                        name, axes, workers=workers,
+                        progress=lambda done, total: bar.progress(done / total, text=f"{done:,} / {total:,} combinations")
+                    )
+            except StudyCancelled:
+                st.warning("⏹️ Study cancelled.")
+            else:
+                run.count("calculations", result.cells)
+                st.session_state["ps_result"] = result
+            bar.empty()
+            cancel_slot.empty()
+
+    result = st.session_state.get("ps_result")
+    if result is None:
+        return
+
+    with run.phase("render"):
+        st.write(f"### 📊 Results: {result.kernel.name}")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Combinations", f"{result.cells:,}")
+        c2.metric("Time", f"{result.seconds:.2f} s")
+        c3.metric("Throughput", f"{result.cells / result.seconds / 1e6:.2f} M/s", help=f"{result.workers} worker(s)")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            objective = st.selectbox("Rank by", result.kernel.outputs, key="ps_objective")
+        with col2:
+            largest = st.radio("Order", ["Smallest", "Largest"], horizontal=True, key="ps_order") == "Largest"
+        with col3:
+            n = st.number_input("Rows", min_value=1, max_value=10_000, value=100, key="ps_rows")
+        where = None
+        if result.kernel.name == "ug27" and st.checkbox("Only passing designs (status 0)", value=True, key="ps_passing"):
+            where = result.values[result.kernel.outputs.index("status")] == 0
+        top = result.best(objective, int(n), largest=largest, where=where)
+        st.dataframe(top.round(4), hide_index=True)
+        st.download_button(
+            "⬇️ Download these rows as CSV",
+            data=top.to_csv(index=False).encode("utf-8"),
+            file_name=f"study_{result.kernel.name}_{objective}.csv",
+            mime="text/csv"
+        )
+
+
+study()
+
+finish_rerun(page_run)
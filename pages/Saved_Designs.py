@@ -0,0 +1,64 @@
+import streamlit as st
+import pandas as pd
+import datetime as dt
+
+from toolbox.store import get_store
+
+st.set_page_config(page_title="Saved Designs", layout="wide")
+
+PAGE_SIZE = 50
+
+st.title("🗃️ Saved Designs")
+st.markdown(
+    "Every calculation from every page and session is saved here. "
+    "Search past designs and open one to see its inputs and results without recalculating."
+)
+
+store = get_store()
+lost = store.stats()
+if lost["dropped"] or lost["failed"]:
+    st.warning(f"⚠️ {lost['dropped'] + lost['failed']} calculation(s) could not be saved since the server started "
+               f"({lost['dropped']} with the save queue full, {lost['failed']} in failed database writes).")
+
+# ---------------- Filters ----------------
+col1, col2, col3 = st.columns([1, 2, 1])
+with col1:
+    page_filter = st.selectbox("Calculator", ["All"] + store.pages(), key="saved_page")
+with col2:
+    key_filter = st.text_input("Key inputs contain (e.g. Do=1016 or Material=SA-516)", key="saved_key")
+with col3:
+    days = st.number_input("Last N days (0 = all)", min_value=0, value=0, step=1, key="saved_days")
+
+filters = {
+    "page": None if page_filter == "All" else page_filter,
+    "key_contains": key_filter.strip() or None,
+    "since": (dt.datetime.now() - dt.timedelta(days=days)).timestamp() if days else None,
+}
+
+# ---------------- Results (paginated) ----------------
+total = store.count(**filters)
+if not total:
+    st.info("No saved calculations match yet. Run a calculation on any page and it will show up here.")
+else:
+    pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    page_no = st.number_input(f"Page (1–{pages})", 1, pages, 1, key="saved_page_no") if pages > 1 else 1
+    records = store.search(limit=PAGE_SIZE, offset=(page_no - 1) * PAGE_SIZE, **filters)
+
+    table = pd.DataFrame({
+        "ID": [r["id"] for r in records],
+        "Saved": [dt.datetime.fromtimestamp(r["ts"]).strftime("%Y-%m-%d %H:%M:%S") for r in records],
+        "Calculator": [r["page"] for r in records],
+        "Key Inputs": [r["key"] for r in records],
+    })
+    if filters["page"]:
+        # One calculator selected: spread its stored columns out
+        table = pd.concat([table, pd.DataFrame([r["row"] for r in records])], axis=1)
+    st.caption(f"{total} saved calculation(s)")
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    # ---------------- Re-open ----------------
+    record_id = st.selectbox("Open a saved design", table["ID"], key="saved_open")
+    record = store.get(int(record_id))
+    if record:
+        st.subheader(f"📂 {record['page']} · {dt.datetime.fromtimestamp(record['ts']):%Y-%m-%d %H:%M}")
+        st.json(record["row"])
@@ -1,8 +1,20 @@
 import streamlit as st
-import pandas as pd
+import io
+import math
 import random
 
+from toolbox.ug27 import (
+    INPUT_COLUMNS, OK, NOT_ENOUGH, ERR_INPUT, STANDARD_PLATE_THK, JOINT_EFFICIENCIES,
+    calculate, calculate_frame, lightest_plate, shell_weight,
+)
+from toolbox.materials import allowable_stress, load_allowable_stress
+from toolbox.tolerance import DISTRIBUTIONS, make_distribution, simulate_ug27
+from ui.history import get_history, render_history
+from ui.metrics import finish_rerun, fragment, start_rerun
+from ui.vessel import load_button, push
+
 st.set_page_config(page_title="ASME UG-27 Shell Calc", layout="wide")
+page_run = start_rerun("UG-27 Shell")
 
 # ---------------- Humor Bank ----------------
 funny_success = [
@@ -20,117 +32,347 @@ funny_fail = [
 ]
 
 # ---------------- Helpers ----------------
-def calculate(inputs):
-    try:
-        t = inputs["t"]
-        Ca = inputs["Ca"]
-        mill_tol = inputs["mill_tol"]
-        Do = inputs["Do"]
-        P = inputs["P"]
-        E = inputs["E"]
-        S = inputs["S"]
-
-        tc = t - Ca - mill_tol
-        if tc <= 0:
-            return "❌ ERROR: Corroded thickness tc ≤ 0. Check inputs.", None
-
-        R = Do / 2 - tc
-        if R <= 0:
-            return "❌ ERROR: Inside radius R ≤ 0. Check Do and t/Ca/mill_tol.", None
-
-        denom = S * E - 0.6 * P
-        if denom <= 0:
-            return "❌ ERROR: S·E − 0.6·P ≤ 0. Increase S/E or reduce P.", None
-
-        t_req = (P * R) / denom
-        t_total_req = t_req + Ca + mill_tol
-        MAWP = (S * E * tc) / (R + 0.6 * tc)
-
-        result = {
-            "Corroded Thickness tc (mm)": round(tc, 3),
-            "Inside Radius R (mm)": round(R, 3),
-            "Required Thk (uncorroded) (mm)": round(t_req, 3),
-            "Total Required Thk (mm)": round(t_total_req, 3),
-            "MAWP corroded (MPa)": round(MAWP, 3),
-            "status": f"{t:.3f} → {'✅ OK' if t >= t_total_req else '❌ IS NOT ENOUGH!'}"
-        }
-        return None, result
-    except Exception as e:
-        return f"❌ Error: {e}", None
+# Batch mode: parse + check once per uploaded file; reruns reuse the cached frame
+BATCH_PREVIEW_ROWS = 1000
+
+@st.cache_data(show_spinner="Checking shell courses...")
+def run_batch(csv_bytes):
+    import pandas as pd
+
+    cases = pd.read_csv(io.BytesIO(csv_bytes))
+    return calculate_frame(cases)
 
 
 # ---------------- Streamlit UI ----------------
 st.title("🛢️ ASME UG-27 Shell Thickness Calculator")
 
 # Independent history for this page
-if "ug27_history" not in st.session_state:
-    st.session_state.ug27_history = []
+ug27_history = get_history("ug27_history", page="UG-27 Shell", key_fields=("Material", "Do", "t", "P"))
 
 # Reset inputs function
 def reset_inputs():
     for key in ["P", "T", "Material", "Density", "S", "Do", "L", "t", "Ca", "mill_tol", "E"]:
         st.session_state[key] = ""
-    st.success("🔄 All inputs cleared!")
-
-# Input form
-with st.form("ug27_form"):
-    P = st.text_input("Design Pressure P (MPa)", key="P")
-    T = st.text_input("Design Temperature (°C)", key="T")
-    mat = st.text_input("Material", key="Material")
-    rho = st.text_input("Density (kg/m³)", key="Density")
-    S = st.text_input("Allowable Stress S (MPa) (From ASME BPVC 2021 Sec II-Part D)", key="S")
-    Do = st.text_input("Outside Diameter Do (mm)", key="Do")
-    L = st.text_input("Tangent-to-Tangent Length L (mm)", key="L")
-    t = st.text_input("Nominal Wall Thickness t (mm)", key="t")
-    Ca = st.text_input("Corrosion Allowance Ca (mm)", key="Ca")
-    mill_tol = st.text_input("Mill Tolerance (mm)", key="mill_tol")
-    E = st.text_input("Joint Efficiency E (0-1)", key="E")
-
-    col1, col2 = st.columns([3,1])
+    st.session_state.ug27_reset = True  # the fragment shows the notice; callbacks run before it draws
+
+mode = st.radio("Mode", ["Single vessel", "Batch (CSV)", "Plate optimizer", "Monte Carlo"], horizontal=True)
+
+
+# Each mode is a fragment: its widgets rerun only that mode's section
+@fragment(page_run, "single")
+def single_vessel(run):
+    load_button({
+        "P": "P", "Density": "density", "S": "S", "Do": "shell_od", "L": "shell_length", "t": "shell_thk",
+        "Ca": "Ca", "mill_tol": "mill_tol", "E": "E",
+    }, key="ug27_load", text=True)
+
+    # Input form
+    with st.form("ug27_form"):
+        P = st.text_input("Design Pressure P (MPa)", key="P")
+        T = st.text_input("Design Temperature (°C)", key="T")
+        mat = st.text_input("Material", key="Material")
+        rho = st.text_input("Density (kg/m³)", key="Density")
+        S = st.text_input(
+            "Allowable Stress S (MPa) (From ASME BPVC 2021 Sec II-Part D, leave blank to look up Material at T)",
+            key="S"
+        )
+        Do = st.text_input("Outside Diameter Do (mm)", key="Do")
+        L = st.text_input("Tangent-to-Tangent Length L (mm)", key="L")
+        t = st.text_input("Nominal Wall Thickness t (mm)", key="t")
+        Ca = st.text_input("Corrosion Allowance Ca (mm)", key="Ca")
+        mill_tol = st.text_input("Mill Tolerance (mm)", key="mill_tol")
+        E = st.text_input("Joint Efficiency E (0-1)", key="E")
+
+        col1, col2 = st.columns([3,1])
+        with col1:
+            submitted = st.form_submit_button("✅ Calculate")
+        with col2:
+            st.form_submit_button("🔄 Reset Inputs", on_click=reset_inputs)
+
+    st.caption("Materials in the allowable stress table: " + ", ".join(load_allowable_stress().specs))
+
+    # Handle Reset
+    if st.session_state.pop("ug27_reset", False):
+        st.success("🔄 All inputs cleared!")
+
+    # Handle Calculation
+    if submitted:
+        if any(x == "" for x in [P, T, mat, rho, Do, L, t, Ca, mill_tol, E]):
+            run.count("errors")
+            st.error(random.choice(funny_fail))
+        else:
+            with run.phase("parse"):
+                S_val = float(S) if S else float(allowable_stress(mat, float(T)))
+            if math.isnan(S_val):
+                run.count("errors")
+                st.error(f"❌ ERROR: No allowable stress for '{mat}' at {T} °C in the table. Enter S manually.")
+            else:
+                if not S:
+                    st.info(f"ℹ️ S = {S_val:.1f} MPa from the allowable stress table ({mat} at {T} °C)")
+                calc_inputs = {
+                    "P": float(P),
+                    "S": S_val,
+                    "Do": float(Do),
+                    "t": float(t),
+                    "Ca": float(Ca),
+                    "mill_tol": float(mill_tol),
+                    "E": float(E)
+                }
+                with run.phase("kernel"):
+                    error, result = calculate(calc_inputs)
+
+                if error:
+                    run.count("errors")
+                    st.error(error)
+                else:
+                    with run.phase("kernel"):
+                        result["Shell Weight (kg)"] = round(float(shell_weight(float(Do), float(t), float(L), float(rho))), 1)
+                    run.count("calculations")
+                    with run.phase("render"):
+                        st.success(random.choice(funny_success))
+                        st.write("### 📊 Results")
+                        st.json(result)
+
+                    # Save to independent history
+                    with run.phase("frame"):
+                        row = {
+                            "P": float(P), "T": float(T), "Material": mat, "rho": float(rho),
+                            "S": S_val, "Do": float(Do), "L": float(L), "t": float(t),
+                            "Ca": float(Ca), "mill_tol": float(mill_tol), "E": float(E),
+                            **result
+                        }
+                        ug27_history.append(row)
+                    push(shell_id=float(Do) - 2 * float(t), shell_thk=float(t), shell_length=float(L),
+                         density=float(rho), P=float(P), S=S_val, Ca=float(Ca), mill_tol=float(mill_tol), E=float(E))
+
+    # Rendered here so a new row shows up on the form's own rerun
+    with run.phase("history"):
+        render_history(ug27_history, "📜 History (until tab close)", key="ug27_history")
+
+
+@fragment(page_run, "batch")
+def batch_check(run):
+    st.write("### 📦 Batch check")
+    st.markdown(
+        f"Upload a CSV with one shell course per row and the columns "
+        f"`{'`, `'.join(INPUT_COLUMNS)}` (same units as the single-vessel form). "
+        "Extra columns are kept in the results. With `Material` and `T` (°C) columns, "
+        "`S` may be left out or blank and is looked up in the allowable stress table."
+    )
+    st.download_button(
+        "⬇️ Download CSV template",
+        data=",".join(INPUT_COLUMNS).encode("utf-8") + b"\n1.5,138,1016,12,3,0.3,0.85\n",
+        file_name="ug27_batch_template.csv",
+        mime="text/csv"
+    )
+
+    uploaded = st.file_uploader("Cases CSV", type="csv")
+    if uploaded is not None:
+        try:
+            with run.phase("kernel"):
+                batch_df = run_batch(uploaded.getvalue())
+        except ValueError as e:
+            run.count("errors")
+            st.error(f"❌ {e}")
+        except Exception:
+            run.count("errors")
+            st.error(random.choice(funny_fail))
+        else:
+            run.count("calculations", len(batch_df))
+            with run.phase("render"):
+                codes = batch_df["Status code"].to_numpy()
+                c1, c2, c3 = st.columns(3)
+                c1.metric("✅ OK", int((codes == OK).sum()))
+                c2.metric("❌ Not enough", int((codes == NOT_ENOUGH).sum()))
+                c3.metric("⚠️ Errors", int((codes >= ERR_INPUT).sum()))
+
+                st.write(f"### 📊 Results ({len(batch_df)} cases, first {min(len(batch_df), BATCH_PREVIEW_ROWS)} shown)")
+                st.dataframe(batch_df.head(BATCH_PREVIEW_ROWS).round(3))
+                st.download_button(
+                    "⬇️ Download Results as CSV",
+                    data=batch_df.to_csv(index=False).encode("utf-8"),
+                    file_name="ug27_batch_results.csv",
+                    mime="text/csv"
+                )
+
+
+@fragment(page_run, "optimizer")
+def plate_optimizer(run):
+    import pandas as pd
+
+    st.write("### ⚖️ Minimum-weight plate selection")
+    st.markdown(
+        "Every plate thickness × material × joint efficiency combination is checked against UG-27 "
+        "for each vessel, and the lightest passing shell (Do, t, L and material density) is returned."
+    )
+
+    st.write("#### Vessels")
+    vessels = st.data_editor(
+        pd.DataFrame([{"P": 1.5, "Do": 1016.0, "L": 3000.0, "Ca": 3.0, "mill_tol": 0.3}]),
+        num_rows="dynamic", key="opt_vessels"
+    )
+
+    st.write("#### Candidate materials")
+    materials = st.data_editor(
+        pd.DataFrame([
+            {"Material": "SA-516 Gr 70", "S": None, "Density": 7850.0},
+            {"Material": "SA-240 304", "S": None, "Density": 8000.0},
+            {"Material": "SA-240 316L", "S": None, "Density": 8000.0},
+        ]).astype({"S": float}),
+        num_rows="dynamic", key="opt_materials"
+    )
+    design_T = st.number_input("Design Temperature (°C) for table lookup of blank S", value=100.0, key="opt_T")
+
+    col1, col2 = st.columns(2)
     with col1:
-        submitted = st.form_submit_button("✅ Calculate")
+        plate_catalog = st.text_input(
+            "Plate thickness catalog (mm, comma separated)",
+            value=", ".join(str(x) for x in STANDARD_PLATE_THK), key="opt_plates"
+        )
     with col2:
-        reset = st.form_submit_button("🔄 Reset Inputs")
+        efficiencies = st.multiselect(
+            "Joint efficiencies E", list(JOINT_EFFICIENCIES), default=list(JOINT_EFFICIENCIES), key="opt_E"
+        )
 
-# Handle Reset
-if reset:
-    reset_inputs()
+    if st.button("⚖️ Find Lightest Plate"):
+        try:
+            with run.phase("parse"):
+                plates = [float(x) for x in plate_catalog.split(",") if x.strip()]
+                vessels = vessels.dropna()
+                materials = materials.dropna(subset=["Material", "Density"])
+                materials = materials.assign(S=materials["S"].fillna(
+                    pd.Series(allowable_stress(materials["Material"].to_numpy(dtype=object), design_T), index=materials.index)
+                )).dropna()
+            if vessels.empty or materials.empty or not plates or not efficiencies:
+                raise ValueError("empty catalog")
 
-# Handle Calculation
-if submitted:
-    if any(x == "" for x in [P, T, mat, rho, S, Do, L, t, Ca, mill_tol, E]):
-        st.error(random.choice(funny_fail))
-    else:
-        calc_inputs = {
-            "P": float(P),
-            "S": float(S),
-            "Do": float(Do),
-            "t": float(t),
-            "Ca": float(Ca),
-            "mill_tol": float(mill_tol),
-            "E": float(E)
-        }
-        error, result = calculate(calc_inputs)
-
-        if error:
-            st.error(error)
+            with run.phase("kernel"):
+                best = lightest_plate(
+                    vessels["P"], vessels["Do"], vessels["L"], vessels["Ca"], vessels["mill_tol"],
+                    plates, materials["S"], materials["Density"], efficiencies
+                )
+        except Exception:
+            run.count("errors")
+            st.error(random.choice(funny_fail))
         else:
-            st.success(random.choice(funny_success))
-            st.write("### 📊 Results")
-            st.json(result)
-
-            # Save to independent history
-            row = {
-                "P": float(P), "T": float(T), "Material": mat, "rho": float(rho),
-                "S": float(S), "Do": float(Do), "L": float(L), "t": float(t),
-                "Ca": float(Ca), "mill_tol": float(mill_tol), "E": float(E),
-                **result
-            }
-            st.session_state.ug27_history.append(row)
-
-# Show History
-if st.session_state.ug27_history:
-    st.write("### 📜 History (until tab close)")
-    df = pd.DataFrame(st.session_state.ug27_history)
-    st.dataframe(df)
+            run.count("calculations", len(vessels))
+            with run.phase("frame"):
+                names = materials["Material"].to_numpy(dtype=object)
+                found = best["material"] >= 0
+                solution = vessels.reset_index(drop=True).assign(**{
+                    "Plate t (mm)": best["t"],
+                    "Material": pd.Series(names[best["material"]]).where(found, "❌ No passing plate"),
+                    "E": best["E"],
+                    "Total Required Thk (mm)": best["t_total_req"].round(3),
+                    "MAWP corroded (MPa)": best["MAWP"].round(3),
+                    "Shell Weight (kg)": best["weight"].round(1),
+                })
+            st.caption(
+                f"{len(plates) * len(materials) * len(efficiencies)} combinations per vessel, "
+                f"{len(vessels)} vessel(s)"
+            )
+            if found.all():
+                st.success(random.choice(funny_success))
+            st.dataframe(solution)
+
+
+@fragment(page_run, "montecarlo")
+def monte_carlo(run):
+    import pandas as pd
+
+    st.write("### 🎲 Tolerance analysis (Monte Carlo)")
+    st.markdown(
+        "Delivered thickness, mill tolerance, actual corrosion, strength and pressure scatter around "
+        "their nominal values. Each input below is drawn from its distribution and every sample is "
+        "checked against UG-27; a sample fails when its MAWP (corroded) is below its pressure P."
+    )
+    st.caption(
+        "Fixed: Mean · Normal: Mean, Std dev, optionally truncated to Low/High · "
+        "Uniform: Low, High · Triangular: Low, Mean (mode), High"
+    )
+    spec = st.data_editor(
+        pd.DataFrame([
+            {"Input": "P", "Distribution": "Normal", "Mean": 1.5, "Std dev": 0.05, "Low": 0.0, "High": None},
+            {"Input": "S", "Distribution": "Normal", "Mean": 138.0, "Std dev": 4.0, "Low": None, "High": None},
+            {"Input": "Do", "Distribution": "Fixed", "Mean": 1016.0, "Std dev": None, "Low": None, "High": None},
+            {"Input": "t", "Distribution": "Normal", "Mean": 10.2, "Std dev": 0.15, "Low": 9.7, "High": 10.8},
+            {"Input": "Ca", "Distribution": "Uniform", "Mean": None, "Std dev": None, "Low": 1.5, "High": 3.0},
+            {"Input": "mill_tol", "Distribution": "Triangular", "Mean": 0.15, "Std dev": None, "Low": 0.0, "High": 0.3},
+            {"Input": "E", "Distribution": "Fixed", "Mean": 0.85, "Std dev": None, "Low": None, "High": None},
+        ]).astype({"Mean": float, "Std dev": float, "Low": float, "High": float}),
+        column_config={
+            "Input": st.column_config.TextColumn(disabled=True),
+            "Distribution": st.column_config.SelectboxColumn(options=list(DISTRIBUTIONS), required=True),
+        },
+        hide_index=True, key="mc_spec"
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        n = st.select_slider(
+            "Samples", options=[10_000, 100_000, 1_000_000, 10_000_000], value=1_000_000,
+            format_func=lambda x: f"{x:,}", key="mc_n"
+        )
+    with col2:
+        seed = st.number_input("Random seed", min_value=0, value=0, step=1, key="mc_seed")
+
+    if st.button("🎲 Run Simulation"):
+        try:
+            with run.phase("parse"):
+                inputs = {
+                    row["Input"]: make_distribution(row["Distribution"], row["Mean"], row["Std dev"], row["Low"], row["High"])
+                    for row in spec.to_dict("records")
+                }
+        except ValueError as e:
+            run.count("errors")
+            st.error(f"❌ {e}")
+        else:
+            bar = st.progress(0.0, text="Sampling...")
+            with run.phase("kernel"):
+                result = simulate_ug27(
+                    **inputs, n=n, seed=int(seed),
+                    progress=lambda done, total: bar.progress(done / total, text=f"{done:,} / {total:,} samples")
+                )
+            bar.empty()
+            run.count("calculations", result.n)
+            st.session_state["mc_result"] = result
+
+    result = st.session_state.get("mc_result")
+    if result is None:
+        return
+    with run.phase("render"):
+        low, high = result.pf_interval()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Probability of failure", f"{result.pf:.2e}", help=f"95% interval {low:.2e} – {high:.2e}")
+        c2.metric("MAWP mean (MPa)", f"{result.mawp.mean:.3f}", help=f"std dev {result.mawp.std:.3f}")
+        c3.metric("MAWP / P mean", f"{result.margin.mean:.3f}", help=f"min {result.margin.min:.3f}")
+        st.caption(
+            f"{result.n:,} samples · {result.failures:,} failed ({result.errors:,} with invalid geometry) · "
+            f"95% interval on Pf {low:.2e} – {high:.2e} · percentiles within "
+            f"±{result.histogram.bin_width:.4f} MPa"
+        )
+        percentiles = result.mawp_percentiles()
+        st.dataframe(
+            pd.DataFrame({"Percentile": [f"P{q:g}" for q in percentiles],
+                          "MAWP corroded (MPa)": [round(v, 3) for v in percentiles.values()]}),
+            hide_index=True
+        )
+        edges, counts = result.histogram.coarse(60)
+        st.bar_chart(pd.DataFrame({"MAWP (MPa)": ((edges[:-1] + edges[1:]) / 2).round(3), "Samples": counts}),
+                     x="MAWP (MPa)", y="Samples")
+
+
+if mode == "Single vessel":
+    single_vessel()
+else:
+    if mode == "Batch (CSV)":
+        batch_check()
+    elif mode == "Plate optimizer":
+        plate_optimizer()
+    else:
+        monte_carlo()
+
+    # Show History
+    with page_run.phase("history"):
+        render_history(ug27_history, "📜 History (until tab close)", key="ug27_history")
 
+finish_rerun(page_run)
@@ -1,10 +1,14 @@
 import streamlit as st
-import math
 import random
-import pandas as pd
+
+from toolbox.geometry import slope
+from ui.assets import image
+from ui.history import get_history, render_history
+from ui.metrics import finish_rerun, fragment, start_rerun
 
 # ----------------- Page Setup -----------------
 st.set_page_config(page_title="Slope to Degree Converter", layout="centered")
+page_run = start_rerun("Slope")
 
 # ----------------- Humor Bank -----------------
 jokes = [
@@ -16,8 +20,7 @@ jokes = [
 ]
 
 # ----------------- Unique History Key -----------------
-if "slope_history" not in st.session_state:
-    st.session_state.slope_history = []
+slope_history = get_history("slope_history", page="Slope", key_fields=("Rise", "Run"))
 
 # ----------------- Header Layout with Image -----------------
 col1, col2 = st.columns([4, 1])
@@ -25,48 +28,48 @@ with col1:
     st.title("📐 Slope to Degree Converter")
     st.write("Enter rise and run to convert slope into percentage & degree.")
 with col2:
-    st.image(
-        "https://i.postimg.cc/C1RCZxnv/Picture1.png",
-        width=80
-    )
+    image("slope.png", width=80)
 
-# ----------------- User Input -----------------
-col1, col2 = st.columns(2)
-with col1:
-    rise = st.number_input("Slope Rise", min_value=0, step=1, value=0)
-with col2:
-    run = st.number_input("Slope Run", min_value=1, step=1, value=1)
+# Inputs, result and history rerun on their own; the header above is sent once
+@fragment(page_run, "calculator")
+def calculator(run):
+    # ----------------- User Input -----------------
+    # A form: stepping the inputs sends nothing until Calculate is pressed
+    with st.form("slope_form", border=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            rise = st.number_input("Slope Rise", min_value=0, step=1, value=0)
+        with col2:
+            slope_run = st.number_input("Slope Run", min_value=1, step=1, value=1)
+        calc_btn = st.form_submit_button("Calculate 🎯")
+
+    # ----------------- Calculation -----------------
+    if calc_btn:
+        with run.phase("kernel"):
+            slope_percent, angle_deg = (float(x) for x in slope(rise, slope_run))
+        run.count("calculations")
+
+        # Save result in session history
+        new_entry = {
+            "Rise": rise,
+            "Run": slope_run,
+            "Slope %": round(slope_percent, 2),
+            "Angle (°)": round(angle_deg, 2)
+        }
+        with run.phase("frame"):
+            slope_history.append(new_entry)
 
-# ----------------- Calculation -----------------
-if st.button("Calculate 🎯"):
-    slope_percent = (rise / run) * 100
-    angle_deg = math.degrees(math.atan(slope_percent / 100))
+        # Display result
+        st.success(f"✅ Slope: {slope_percent:.2f}% | Angle: {angle_deg:.2f}°")
 
-    # Save result in session history
-    new_entry = {
-        "Rise": rise,
-        "Run": run,
-        "Slope %": round(slope_percent, 2),
-        "Angle (°)": round(angle_deg, 2)
-    }
-    st.session_state.slope_history.append(new_entry)
+        # Add humor
+        st.info(random.choice(jokes))
 
-    # Display result
-    st.success(f"✅ Slope: {slope_percent:.2f}% | Angle: {angle_deg:.2f}°")
+    # ----------------- History Section -----------------
+    with run.phase("history"):
+        render_history(slope_history, "📜 Calculation History", key="slope_history", download_name="slope_history.csv")
 
-    # Add humor
-    st.info(random.choice(jokes))
 
-# ----------------- History Section -----------------
-if st.session_state.slope_history:
-    st.subheader("📜 Calculation History")
-    hist_df = pd.DataFrame(st.session_state.slope_history)
-    st.dataframe(hist_df, use_container_width=True)
+calculator()
 
-    # Download option
-    st.download_button(
-        label="📥 Download History",
-        data=hist_df.to_csv(index=False).encode("utf-8"),
-        file_name="slope_history.csv",
-        mime="text/csv"
-    )
+finish_rerun(page_run)
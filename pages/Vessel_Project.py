@@ -0,0 +1,89 @@
+import streamlit as st
+
+from toolbox.vessel import DERIVED, HEAD_TYPES, INPUTS
+from ui.metrics import finish_rerun, fragment, start_rerun
+from ui.vessel import get_project
+
+st.set_page_config(page_title="Vessel Project", layout="wide")
+page_run = start_rerun("Vessel Project")
+
+st.title("🏗️ Vessel Project")
+st.markdown(
+    "One vessel shared by the Shell Thickness, Dish End, Tank L/D and Limpet Coil pages. Each page sends its "
+    "inputs here when it calculates and can load them back with **⬇️ Load from vessel project**. "
+    "Changing an input recomputes only the values that depend on it."
+)
+
+GROUPS = {
+    "Shell": ("shell_id", "shell_thk", "shell_length", "density"),
+    "UG-27": ("P", "S", "Ca", "mill_tol", "E"),
+    "Heads & capacity": ("head_type", "sf", "head_thk", "design_volume"),
+    "Limpet coil": ("limpet_od", "limpet_thk", "limpet_pitch", "coil_coverage", "limpet_density"),
+}
+
+
+def _rows(name, label, value):
+    # One row per scalar; dict results (UG-27, head, limpet) spread into one row each
+    if isinstance(value, dict):
+        return [(name, f"{label} · {k}", v) for k, v in value.items()]
+    return [(name, label, value)]
+
+
+@fragment(page_run, "project")
+def project_view(run):
+    import pandas as pd
+
+    project = get_project()
+    inputs = project.graph.inputs()
+
+    # Unkeyed widgets: their value follows the project when another page changes it
+    with st.form("vessel_form", border=False):
+        values = {}
+        for col, (group, names) in zip(st.columns(len(GROUPS)), GROUPS.items()):
+            with col:
+                st.write(f"#### {group}")
+                for name in names:
+                    if name == "head_type":
+                        values[name] = st.selectbox(INPUTS[name], HEAD_TYPES, index=HEAD_TYPES.index(inputs[name]))
+                    else:
+                        values[name] = st.number_input(INPUTS[name], value=inputs[name], format="%g")
+        submitted = st.form_submit_button("🔁 Update project")
+
+    if submitted:
+        with run.phase("kernel"):
+            changed = project.update(**values)
+            recomputed = project.refresh()
+        run.count("calculations", len(recomputed))
+        if changed:
+            st.success(f"Changed {', '.join(changed)}; recomputed {', '.join(recomputed) or 'nothing'} "
+                       f"({len(DERIVED) - len(recomputed)} of {len(DERIVED)} derived values reused).")
+        else:
+            st.info("Nothing changed.")
+    else:
+        with run.phase("kernel"):
+            recomputed = project.refresh()
+
+    with run.phase("frame"):
+        rows = []
+        for name in DERIVED:
+            node = project.graph.node(name)
+            value = project.get(name)
+            for node_name, label, v in _rows(name, node.label, value):
+                rows.append({
+                    "Value": label,
+                    "Result": f"{v:.6g}" if isinstance(v, float) else ("—" if v is None else str(v)),
+                    "Note": node.error or "",
+                    "Depends on": ", ".join(node.deps),
+                    "Runs": node.computations,
+                    "Just recomputed": name in recomputed,
+                })
+    with run.phase("render"):
+        st.write("### 📊 Derived values")
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        st.caption("`Runs` counts how often each value has been computed this session; values whose inputs "
+                   "did not change are kept from earlier runs, on this page or any other.")
+
+
+project_view()
+
+finish_rerun(page_run)
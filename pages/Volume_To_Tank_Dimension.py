@@ -1,9 +1,14 @@
 import streamlit as st
-import pandas as pd
-import math
 import random
 
+from toolbox.tank import HEAD_TYPES as TANK_HEAD_TYPES, RANK_BY, calculate_dimensions, optimum_tanks, rank_tanks
+from toolbox.strapping import HEAD_TYPES, ORIENTATIONS, fill_volume, level_from_volume, strapping_table
+from ui.history import get_history, render_history
+from ui.metrics import finish_rerun, fragment, start_rerun
+from ui.vessel import load_button, push
+
 st.set_page_config(page_title="Tank L/D Ratio Calculator", layout="centered")
+page_run = start_rerun("Tank L/D")
 
 # -------------------- Humor bank --------------------
 success_jokes = [
@@ -20,22 +25,8 @@ error_jokes = [
     "🚨 Missing values! The tank union is not happy."
 ]
 
-# -------------------- Helper functions --------------------
-def calculate_dimensions(volume, min_ratio, max_ratio):
-    results = []
-    for ratio in (min_ratio, max_ratio):
-        diameter = ((4 * volume) / (math.pi * ratio)) ** (1 / 3)
-        height = ratio * diameter
-        results.append({
-            "L/D Ratio": ratio,
-            "Diameter (m)": round(diameter, 3),
-            "Height (m)": round(height, 3)
-        })
-    return results
-
 # -------------------- Session state (Page-specific) --------------------
-if "tank_history" not in st.session_state:
-    st.session_state.tank_history = []
+tank_history = get_history("tank_history", page="Tank L/D", key_fields=("Type", "Volume (m³)", "L/D Ratio"))
 
 if "inputs_tank" not in st.session_state:
     st.session_state.inputs_tank = {
@@ -48,23 +39,9 @@ if "inputs_tank" not in st.session_state:
 # -------------------- UI --------------------
 st.title("🛢️ Tank L/D Ratio Calculator")
 
-# Input fields (managed via session state)
-volume = st.text_input("Enter operating tank volume (m³):", value=st.session_state.inputs_tank["volume"])
-min_ratio = st.text_input("Enter minimum L/D ratio [default 1.25]:", value=st.session_state.inputs_tank["min_ratio"])
-max_ratio = st.text_input("Enter maximum L/D ratio [default 2.0]:", value=st.session_state.inputs_tank["max_ratio"])
-margin_input = st.text_input("Enter volume margin to add (%) [blank for none]:", value=st.session_state.inputs_tank["margin_input"])
-
-# Action buttons
-col1, col2, col3 = st.columns([1,1,1])
-with col1:
-    calc_btn = st.button("🔢 Calculate")
-with col2:
-    reset_btn = st.button("♻️ Reset Inputs")
-#with col3:
- #   clear_history_btn = st.button("🗑️ Clear History")
 
 # Reset logic (only inputs)
-if reset_btn:
+def reset_inputs():
     st.session_state.inputs_tank = {
         "volume": "",
         "min_ratio": "",
@@ -72,58 +49,182 @@ if reset_btn:
         "margin_input": ""
     }
 
-# Clear history logic
-#if clear_history_btn:
- #   st.session_state.tank_history = []
-
-# -------------------- Calculation logic --------------------
-if calc_btn:
-    try:
-        # Convert inputs
-        volume_val = float(volume)
-        min_val = float(min_ratio) if min_ratio else 1.25
-        max_val = float(max_ratio) if max_ratio else 2.0
-        margin_percent = float(margin_input) if margin_input else None
-
-        # Save inputs back into session_state
-        st.session_state.inputs_tank = {
-            "volume": volume,
-            "min_ratio": min_ratio,
-            "max_ratio": max_ratio,
-            "margin_input": margin_input
-        }
-
-        # Operating volume results
-        op_results = calculate_dimensions(volume_val, min_val, max_val)
-        df_op = pd.DataFrame(op_results)
-        df_op["Volume (m³)"] = round(volume_val, 3)
-        df_op["Type"] = "Operating"
-        st.subheader("Operating Volume Results")
-        st.write(df_op)
-        st.session_state.tank_history.append(df_op)
-
-        # Gross volume results
-        if margin_percent is not None:
-            gross_volume = volume_val * (1 + margin_percent / 100)
-            df_gross = pd.DataFrame(calculate_dimensions(gross_volume, min_val, max_val))
-            df_gross["Volume (m³)"] = round(gross_volume, 3)
-            df_gross["Type"] = "Gross"
-            st.subheader(f"Gross Volume Results (+{margin_percent}%)")
-            st.write(df_gross)
-            st.session_state.tank_history.append(df_gross)
-
-        # Random success humor
-        st.success(random.choice(success_jokes))
-
-    except Exception:
-        st.error(random.choice(error_jokes))
-
-# -------------------- History --------------------
-if st.session_state.tank_history:
-    st.subheader("📜 Calculation History")
-    hist_df = pd.concat(st.session_state.tank_history, ignore_index=True)
-    st.dataframe(hist_df, use_container_width=True)
-
-    # Optional download
-    # csv = hist_df.to_csv(index=False).encode('utf-8')
-    # st.download_button("⬇️ Download History as CSV", data=csv, file_name="tank_history.csv", mime="text/csv")
+
+# Inputs, results and history rerun on their own; the expanders below are left alone
+@fragment(page_run, "calculator")
+def calculator(run):
+    load_button({"volume": "design_volume"}, key="tank_load", text=True, state="inputs_tank")
+
+    # Input fields (managed via session state; a form, so typing sends nothing)
+    with st.form("tank_form", border=False):
+        volume = st.text_input("Enter operating tank volume (m³):", value=st.session_state.inputs_tank["volume"])
+        min_ratio = st.text_input("Enter minimum L/D ratio [default 1.25]:", value=st.session_state.inputs_tank["min_ratio"])
+        max_ratio = st.text_input("Enter maximum L/D ratio [default 2.0]:", value=st.session_state.inputs_tank["max_ratio"])
+        margin_input = st.text_input("Enter volume margin to add (%) [blank for none]:", value=st.session_state.inputs_tank["margin_input"])
+
+        # Action buttons
+        col1, col2, col3 = st.columns([1,1,1])
+        with col1:
+            calc_btn = st.form_submit_button("🔢 Calculate")
+        with col2:
+            st.form_submit_button("♻️ Reset Inputs", on_click=reset_inputs)
+
+    # -------------------- Calculation logic --------------------
+    if calc_btn:
+        import pandas as pd
+
+        try:
+            # Convert inputs
+            volume_val = float(volume)
+            min_val = float(min_ratio) if min_ratio else 1.25
+            max_val = float(max_ratio) if max_ratio else 2.0
+            margin_percent = float(margin_input) if margin_input else None
+
+            # Save inputs back into session_state
+            st.session_state.inputs_tank = {
+                "volume": volume,
+                "min_ratio": min_ratio,
+                "max_ratio": max_ratio,
+                "margin_input": margin_input
+            }
+
+            # Operating volume results
+            with run.phase("kernel"):
+                op_results = calculate_dimensions(volume_val, min_val, max_val)
+            with run.phase("frame"):
+                df_op = pd.DataFrame(op_results)
+                df_op["Volume (m³)"] = round(volume_val, 3)
+                df_op["Type"] = "Operating"
+            with run.phase("render"):
+                st.subheader("Operating Volume Results")
+                st.write(df_op)
+            with run.phase("frame"):
+                tank_history.extend(df_op.to_dict("records"))
+            run.count("calculations")
+            push(design_volume=volume_val)
+
+            # Gross volume results
+            if margin_percent is not None:
+                gross_volume = volume_val * (1 + margin_percent / 100)
+                with run.phase("kernel"):
+                    gross_results = calculate_dimensions(gross_volume, min_val, max_val)
+                with run.phase("frame"):
+                    df_gross = pd.DataFrame(gross_results)
+                    df_gross["Volume (m³)"] = round(gross_volume, 3)
+                    df_gross["Type"] = "Gross"
+                with run.phase("render"):
+                    st.subheader(f"Gross Volume Results (+{margin_percent}%)")
+                    st.write(df_gross)
+                with run.phase("frame"):
+                    tank_history.extend(df_gross.to_dict("records"))
+                run.count("calculations")
+
+            # Random success humor
+            st.success(random.choice(success_jokes))
+
+        except Exception:
+            run.count("errors")
+            st.error(random.choice(error_jokes))
+
+    # -------------------- History --------------------
+    with run.phase("history"):
+        render_history(tank_history, "📜 Calculation History", key="tank_history")
+
+
+# -------------------- Head-aware L/D optimizer --------------------
+# Expanders rerun their fragment when opened and draw nothing while closed
+@fragment(page_run, "optimizer")
+def optimizer(run):
+    with st.expander("🎯 Head-Aware L/D Optimizer", key="optimizer_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        import numpy as np
+
+        st.markdown(
+            "Sweeps L/D on a dense grid, solves the diameter including both dish ends "
+            "(straight flange included) and ranks the candidates by surface area or steel weight. "
+            "Enter several volumes separated by commas to size many tanks at once."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            opt_volumes = st.text_input("Volume(s) (m³)", value="10", key="opt_volumes")
+            opt_head = st.selectbox("Head Type", TANK_HEAD_TYPES, format_func=str.title, key="opt_head")
+            opt_sf = st.number_input("Straight Flange (mm)", min_value=0.0, value=50.0, key="opt_sf")
+            opt_rank = st.selectbox("Rank By", RANK_BY, format_func={"area": "Surface area", "weight": "Steel weight"}.get, key="opt_rank")
+        with col2:
+            opt_min, opt_max = st.slider("L/D Range", 0.5, 6.0, (1.0, 3.0), step=0.05, key="opt_range")
+            opt_step = st.number_input("L/D Step", min_value=0.001, value=0.01, step=0.005, format="%.3f", key="opt_step")
+            opt_shell_thk = st.number_input("Shell Thickness (mm)", min_value=0.0, value=6.0, key="opt_shell_thk")
+            opt_head_thk = st.number_input("Head Thickness (mm)", min_value=0.0, value=6.0, key="opt_head_thk")
+            opt_density = st.number_input("Density (kg/m³)", min_value=0.0, value=7850.0, key="opt_density")
+
+        try:
+            volumes_list = [float(v) for v in opt_volumes.split(",") if v.strip()]
+            sizing = dict(
+                ratios=np.arange(opt_min, opt_max + opt_step / 2, opt_step), head=opt_head, sf_mm=opt_sf,
+                shell_thk_mm=opt_shell_thk, head_thk_mm=opt_head_thk, density=opt_density,
+            )
+            if len(volumes_list) == 1:
+                ranked = rank_tanks(volumes_list[0], rank_by=opt_rank, **sizing)
+                st.write(f"**Best L/D = {ranked.at[0, 'L/D Ratio']:.3f}** → D = {ranked.at[0, 'Diameter (m)']:.3f} m, "
+                         f"shell length = {ranked.at[0, 'Shell Length (m)']:.3f} m")
+                st.dataframe(ranked.head(20).round(3), use_container_width=True, hide_index=True)
+            elif volumes_list:
+                st.dataframe(optimum_tanks(volumes_list, rank_by=opt_rank, **sizing).round(3),
+                             use_container_width=True, hide_index=True)
+        except ValueError:
+            run.count("errors")
+            st.error(random.choice(error_jokes))
+
+
+# -------------------- Strapping table --------------------
+# Level/volume lookups rerun without re-sending the table
+@fragment(page_run, "strapping_lookup")
+def strapping_lookup(run, levels, volumes, strap_id, strap_len, strap_head, strap_orient):
+    col1, col2 = st.columns(2)
+    with col1:
+        q_level = st.number_input("Level (mm) → Volume", min_value=0.0, max_value=float(levels[-1]), key="strap_q_level")
+        q_vol = float(fill_volume(q_level, strap_id, strap_len, strap_head, strap_orient))
+        st.write(f"**{q_vol:.4f} m³** ({q_vol * 1000:.1f} liters)")
+    with col2:
+        q_volume = st.number_input("Volume (m³) → Level", min_value=0.0, max_value=float(volumes[-1]), key="strap_q_vol")
+        st.write(f"**{float(level_from_volume(levels, volumes, q_volume)):.1f} mm**")
+
+
+@fragment(page_run, "strapping")
+def strapping(run):
+    with st.expander("📏 Level ↔ Volume Strapping Table", key="strapping_section", on_change="rerun") as section:
+        if not section.open:
+            return
+        import pandas as pd
+
+        col1, col2 = st.columns(2)
+        with col1:
+            strap_id = st.number_input("Tank ID (mm)", min_value=1.0, value=2000.0, key="strap_id")
+            strap_head = st.selectbox("Head Type", HEAD_TYPES, format_func=str.title, key="strap_head")
+            strap_step = st.number_input("Level Step (mm)", min_value=0.1, value=1.0, key="strap_step")
+        with col2:
+            strap_len = st.number_input("Tangent-to-Tangent Length (mm)", min_value=0.0, value=4000.0, key="strap_len")
+            strap_orient = st.selectbox("Orientation", ORIENTATIONS, format_func=str.title, key="strap_orient")
+
+        levels, volumes = strapping_table(strap_id, strap_len, strap_head, strap_orient, strap_step)
+        st.caption(f"{len(levels)} rows · full volume {volumes[-1]:.3f} m³ at {levels[-1]:.1f} mm")
+
+        strapping_lookup(levels, volumes, strap_id, strap_len, strap_head, strap_orient)
+
+        strap_df = pd.DataFrame({"Level (mm)": levels, "Volume (m³)": volumes, "Volume (liters)": volumes * 1000})
+        # Large tables are thinned for display; the download always has every row
+        st.dataframe(strap_df.iloc[::max(1, len(strap_df) // 1000)].round(4), use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Download Strapping Table as CSV",
+            data=strap_df.to_csv(index=False).encode("utf-8"),
+            file_name=f"strapping_{strap_orient}_{strap_head}_{strap_id:g}x{strap_len:g}.csv",
+            mime="text/csv"
+        )
+
+
+calculator()
+optimizer()
+strapping()
+
+finish_rerun(page_run)
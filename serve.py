@@ -0,0 +1,48 @@
+"""Production entry point: the multipage app plus long-lived caching of the built image assets.
+
+    streamlit run serve.py
+
+``streamlit run Home.py`` still serves ``static/`` (``.streamlit/config.toml``
+turns static serving on), but only with validators: a browser that has an
+image re-asks on every page load and gets a 304. The file names written by
+``python -m toolbox.assets`` carry a content hash, so here they are sent as
+``immutable`` for a year and returning visitors make no image requests at
+all. Each file is read from disk once per process and then served from
+memory.
+"""
+import functools
+import mimetypes
+
+import streamlit as st
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from toolbox import assets
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@functools.lru_cache(maxsize=1)
+def _built():
+    """Hashed file names from the manifest; only these are served."""
+    return frozenset(assets.load_manifest().values())
+
+
+@functools.lru_cache(maxsize=None)
+def _load(name):
+    return (assets.STATIC_DIR / name).read_bytes(), mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+async def static_asset(request):
+    name = request.path_params["path"]
+    if name not in _built():
+        return PlainTextResponse("File not found", status_code=404)
+    body, media_type = _load(name)
+    etag = f'"{name}"'  # the name already embeds the content hash
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag, "X-Content-Type-Options": "nosniff"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type=media_type, headers=headers)
+
+
+app = st.App("Home.py", routes=[Route("/app/static/{path:path}", static_asset, methods=["GET"])])
@@ -0,0 +1,5 @@
+"""Calculation kernels shared by the Engineering Toolbox pages.
+
+Nothing in this package imports Streamlit, so the maths can be reused from
+batch jobs and scripts as well as from the pages.
+"""
@@ -0,0 +1,213 @@
+"""Static image pipeline: vendor remote images, size-optimize, content-hash into ``static/``.
+
+    python -m toolbox.assets fetch     # download the remote images into images/vendor/ (needs network, once)
+    python -m toolbox.assets build     # optimize everything into static/ and rewrite static/manifest.json
+    python -m toolbox.assets           # both
+
+``static/`` is what Streamlit serves at ``/app/static/`` when
+``server.enableStaticServing`` is on (see ``.streamlit/config.toml``). Every
+output file name carries a hash of its bytes, so a URL never changes
+meaning. Browsers may cache it forever (``serve.py`` says so in the
+headers), and a rebuilt image gets a new URL.
+
+Optimization is lossless:
+
+* PNG: the smallest of a re-compressed PNG, a palette PNG (only when the
+  image already has 256 colours or fewer) and a lossless WebP;
+* SVG: comments, the XML prolog, ``<metadata>`` and inter-tag whitespace are
+  stripped;
+* anything else (AVIF, JPEG, ...) is copied as is.
+
+Pillow is only needed for ``build``; the pages just read the manifest.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+IMAGES_DIR = ROOT / "images"
+VENDOR_DIR = IMAGES_DIR / "vendor"
+STATIC_DIR = ROOT / "static"
+MANIFEST = STATIC_DIR / "manifest.json"
+
+# logical name → local file under images/, or the remote URL it is vendored from
+SOURCES = {
+    "Approx1.png": "Approx1.png",
+    "Approx2.png": "Approx2.png",
+    "Approx3.png": "Approx3.png",
+    "Approx3h.png": "Approx3h.png",
+    "Approxfinal.png": "Approxfinal.png",
+    "Approxfinal1.png": "Approxfinal1.png",
+    "Circle_arc.svg": "Circle_arc.svg",
+    "Dish.avif": "Dish.avif",
+    "Eccentricity.png": "Eccentricity.png",
+    "Highaccurate.png": "Highaccurate.png",
+    "logo.png": "https://i.postimg.cc/YCSYFC2M/S-Logo-removebg-preview.png",
+    "github.png": "https://i.postimg.cc/wB8xpwGZ/176-1766942-our-github-repos-are-here-github-icon-hd-removebg-preview.png",
+    "linkedin.png": "https://i.postimg.cc/zXs0ShM8/linkedin.png",
+    "slope.png": "https://i.postimg.cc/C1RCZxnv/Picture1.png",
+    "ellipse-axes.svg": "https://www.mathsisfun.com/geometry/images/ellipse-axes.svg",
+}
+
+
+def is_remote(name):
+    return SOURCES[name].startswith(("http://", "https://"))
+
+
+def source_path(name):
+    """Local file for ``name``: the checked-in image, or the vendored copy of a remote one."""
+    return VENDOR_DIR / name if is_remote(name) else IMAGES_DIR / SOURCES[name]
+
+
+def load_manifest(path=MANIFEST):
+    """``{logical name: hashed file name in static/}``; empty until ``build`` has run."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+# ---------------- Fetch ----------------
+def fetch(names=None, force=False, timeout=30):
+    """Download remote sources into ``images/vendor/``; returns the names written."""
+    VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name in names or SOURCES:
+        if not is_remote(name):
+            continue
+        target = source_path(name)
+        if target.exists() and not force:
+            continue
+        request = urllib.request.Request(SOURCES[name], headers={"User-Agent": "engineering-toolbox-assets"})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read()
+        target.write_bytes(data)
+        written.append(name)
+    return written
+
+
+# ---------------- Optimize ----------------
+def _png_candidates(data):
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as im:
+        im.load()
+    yield ".png", data
+
+    out = io.BytesIO()
+    im.save(out, "PNG", optimize=True)
+    yield ".png", out.getvalue()
+
+    if im.getcolors(256) is not None:  # lossless only if the palette holds every colour
+        out = io.BytesIO()
+        palette = im.quantize(colors=256, method=Image.Quantize.FASTOCTREE if im.mode == "RGBA" else None)
+        if palette.convert(im.mode).tobytes() == im.tobytes():
+            palette.save(out, "PNG", optimize=True)
+            yield ".png", out.getvalue()
+
+    out = io.BytesIO()
+    im.save(out, "WEBP", lossless=True, quality=100, method=6)
+    yield ".webp", out.getvalue()
+
+
+_SVG_STRIP = (
+    re.compile(rb"<\?xml.*?\?>", re.S),
+    re.compile(rb"<!DOCTYPE[^>]*>", re.S),
+    re.compile(rb"<!--.*?-->", re.S),
+    re.compile(rb"<metadata\b.*?</metadata>", re.S),
+)
+_SVG_GAP = re.compile(rb">\s+<")
+
+
+def minify_svg(data):
+    for pattern in _SVG_STRIP:
+        data = pattern.sub(b"", data)
+    return _SVG_GAP.sub(b"><", data).strip()
+
+
+def optimize(name, data):
+    """Smallest lossless encoding of ``data`` → ``(extension, bytes)``."""
+    ext = Path(name).suffix.lower()
+    if ext == ".png":
+        return min(_png_candidates(data), key=lambda c: len(c[1]))
+    if ext == ".svg":
+        return ext, minify_svg(data)
+    return ext, data
+
+
+# ---------------- Build ----------------
+def build(static_dir=STATIC_DIR):
+    """Optimize every available source into ``static_dir``; returns ``(manifest, report rows, missing names)``.
+
+    Remote images that have not been fetched are left out of the manifest,
+    so the pages keep using the remote URL for them.
+    """
+    static_dir = Path(static_dir)
+    static_dir.mkdir(parents=True, exist_ok=True)
+    manifest, report, missing = {}, [], []
+    for name in SOURCES:
+        path = source_path(name)
+        if not path.is_file():
+            missing.append(name)
+            continue
+        data = path.read_bytes()
+        ext, out = optimize(name, data)
+        digest = hashlib.sha256(out).hexdigest()[:8]
+        hashed = f"{Path(name).stem}.{digest}{ext}"
+        target = static_dir / hashed
+        if not target.exists():
+            target.write_bytes(out)
+        manifest[name] = hashed
+        report.append((name, hashed, len(data), len(out)))
+
+    # Drop outputs of earlier builds that nothing points at any more
+    keep = set(manifest.values()) | {MANIFEST.name}
+    for stale in static_dir.iterdir():
+        if stale.is_file() and stale.name not in keep:
+            stale.unlink()
+    tmp = static_dir / (MANIFEST.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, static_dir / MANIFEST.name)
+    return manifest, report, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m toolbox.assets", description=__doc__.splitlines()[0])
+    parser.add_argument("step", nargs="?", choices=("fetch", "build", "all"), default="all")
+    parser.add_argument("--force", action="store_true", help="re-download remote images that are already vendored")
+    args = parser.parse_args(argv)
+
+    if args.step in ("fetch", "all"):
+        failed = False
+        for name in (n for n in SOURCES if is_remote(n)):
+            try:
+                if fetch([name], force=args.force):
+                    print(f"fetched  {name}", file=sys.stderr)
+            except OSError as exc:
+                failed = True
+                print(f"FAILED   {name}: {exc}", file=sys.stderr)
+        if failed and args.step == "fetch":
+            return 1
+
+    if args.step in ("build", "all"):
+        _, report, missing = build()
+        before = sum(r[2] for r in report)
+        after = sum(r[3] for r in report)
+        width = max((len(r[1]) for r in report), default=4)
+        for name, hashed, size_in, size_out in report:
+            print(f"{hashed:<{width}}  {size_in:>7} → {size_out:>7} B  ({name})")
+        print(f"{len(report)} asset(s): {before} → {after} B")
+        for name in missing:
+            print(f"not vendored, still remote: {name} (run `python -m toolbox.assets fetch`)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Process-wide memoization for the pure calculator kernels.
+
+Every Streamlit session runs in the same server process, so a cache kept at
+module level is shared by all users: the second engineer to check a
+1016 mm × 12 mm shell gets a dictionary lookup instead of the maths.
+
+Keys are normalized before lookup. Floats are rounded to ``sig_digits``
+significant digits, so 1016 and 1016.0000000001 hit the same entry. Dicts
+and sequences are normalized recursively. Calls with non-scalar arrays
+bypass the cache, so the batch paths are unaffected.
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from numbers import Number
+
+import numpy as np
+
+DEFAULT_MAXSIZE = int(os.environ.get("TOOLBOX_CACHE_SIZE", 4096))
+DEFAULT_TTL = float(os.environ.get("TOOLBOX_CACHE_TTL", 6 * 3600))  # seconds
+DEFAULT_SIG_DIGITS = 10
+
+_registry = {}
+
+
+class _Unhashable(Exception):
+    pass
+
+
+def normalize_key(value, sig_digits=DEFAULT_SIG_DIGITS):
+    """Hashable, tolerance-normalized form of a kernel argument."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, np.ndarray):
+        if value.ndim:
+            raise _Unhashable
+        value = value.item()
+    if isinstance(value, Number):
+        value = float(value)
+        if value != value:  # NaN never equals itself; give it one stable key
+            return "nan"
+        return float(f"{value:.{sig_digits}g}")
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_key(v, sig_digits)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_key(v, sig_digits) for v in value)
+    raise _Unhashable
+
+
+def _detach(value):
+    # Hand each caller its own copy of mutable containers (dicts, lists, frames)
+    if isinstance(value, tuple):
+        return tuple(_detach(v) for v in value)
+    if isinstance(value, (dict, list)) or hasattr(value, "iloc"):
+        return value.copy()
+    return value
+
+
+class KernelCache:
+    """Thread-safe LRU + TTL store with hit / miss / eviction counters."""
+
+    def __init__(self, name, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.bypasses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return False, None
+            value, stamp = item
+            if self.ttl and time.monotonic() - stamp > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def bypass(self):
+        with self._lock:
+            self.bypasses += 1
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.bypasses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "Kernel": self.name,
+                "Entries": len(self._data),
+                "Max Entries": self.maxsize,
+                "TTL (s)": self.ttl,
+                "Hits": self.hits,
+                "Misses": self.misses,
+                "Bypassed": self.bypasses,
+                "Evictions": self.evictions,
+                "Expired": self.expirations,
+                "Hit Rate (%)": round(100 * self.hits / lookups, 1) if lookups else 0.0,
+            }
+
+
+def memoize(maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, sig_digits=DEFAULT_SIG_DIGITS, name=None):
+    """Decorator: share results of a pure kernel across all sessions of this process."""
+    def decorator(func):
+        cache = KernelCache(name or f"{func.__module__}.{func.__qualname__}", maxsize, ttl)
+        _registry[cache.name] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = (normalize_key(args, sig_digits), normalize_key(kwargs, sig_digits))
+            except _Unhashable:
+                cache.bypass()
+                return func(*args, **kwargs)
+
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return _detach(value)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """One stats dict per registered kernel cache."""
+    return [cache.stats() for cache in _registry.values()]
+
+
+def clear_caches():
+    for cache in _registry.values():
+        cache.clear()
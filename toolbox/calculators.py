@@ -0,0 +1,191 @@
+"""Registry of the calculators that can run on tables of cases.
+
+Each calculator maps a DataFrame of input rows to a DataFrame of results
+using the vectorized kernels, so one call handles a whole chunk. The CLI
+(``python -m toolbox``) and other batch tools look calculators up by name.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from toolbox import ug27
+from toolbox.dish import dish_table
+from toolbox.ellipse import perimeter_agm
+from toolbox.geometry import arc_length, slope
+from toolbox.hx import LANE_WIDTH, OTL_CLEARANCE, SIZING_STATUS, size_exchanger, tube_area, tube_count
+from toolbox.limpet import helical_coil, limpet_coil_batch
+from toolbox.pipes import load_catalogue
+from toolbox.tank import ld_dimensions, optimum_tanks
+
+
+@dataclass(frozen=True)
+class Calculator:
+    name: str
+    description: str
+    inputs: tuple
+    run: Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def _columns(cases, names):
+    # Numeric input columns; non-numeric cells become NaN
+    missing = [c for c in names if c not in cases.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return [pd.to_numeric(cases[c], errors="coerce").to_numpy(dtype=float) for c in names]
+
+
+def _with(cases, **results):
+    out = cases.copy()
+    for label, values in results.items():
+        out[label] = values
+    return out
+
+
+def _with_frame(cases, frame):
+    # Kernel frames with a whole number of rows per case; each case row is repeated to match
+    out = cases.iloc[np.repeat(np.arange(len(cases)), len(frame) // max(len(cases), 1))]
+    return _with(out, **{label: frame[label].to_numpy() for label in frame.columns})
+
+
+def _arc(cases):
+    diameter, angle = _columns(cases, ("diameter_mm", "angle_deg"))
+    return _with(cases, **{"Arc Length (mm)": arc_length(diameter, angle)})
+
+
+def _slope(cases):
+    percent, degrees = slope(*_columns(cases, ("rise", "run")))
+    return _with(cases, **{"Slope %": percent, "Angle (°)": degrees})
+
+
+def _hx_area(cases):
+    area = tube_area(*_columns(cases, ("tube_dia_mm", "tube_length_m", "no_of_tubes")))
+    return _with(cases, **{"Heat Transfer Area (m²)": area})
+
+
+TUBE_COUNT_BLOCK = 5_000  # rows per tube_count call; bounds the lattice memory of a CLI chunk
+
+
+def _tube_count(cases):
+    shell_id, tube_od, pitch, passes = _columns(cases, ("shell_id_mm", "tube_od_mm", "pitch_mm", "passes"))
+    layout = cases["layout"].astype(str).str.rstrip("°") if "layout" in cases.columns else pd.Series("30", cases.index)
+    counts = np.zeros(len(cases), dtype=np.int64)
+    # Vectorized counts per (layout, passes) group, in blocks: every row builds its own lattice
+    for (lay, n_pass), idx in pd.Series(range(len(cases))).groupby([layout.to_numpy(), passes]).groups.items():
+        idx = np.asarray(idx)
+        for block in np.array_split(idx, -(-idx.size // TUBE_COUNT_BLOCK)):
+            counts[block] = tube_count(shell_id[block], tube_od[block], pitch[block], lay, int(n_pass),
+                                       OTL_CLEARANCE, LANE_WIDTH)
+    return _with(cases, **{"Tubes": counts, "Heat Transfer Area per m (m²/m)": tube_area(tube_od, 1.0, counts)})
+
+
+HX_DUTY_INPUTS = ("duty_kw", "t_hot_in", "t_hot_out", "t_cold_in", "t_cold_out", "u_w_m2k", "shell_passes",
+                  "tube_passes")
+
+
+def _hx_duty(cases):
+    result = size_exchanger(*_columns(cases, HX_DUTY_INPUTS))
+    return _with(cases, **{
+        "LMTD (K)": result["lmtd"], "F": result["F"], "Required Area (m²)": result["required_area"],
+        "Tube OD (mm)": result["tube_od"], "Tube Length (m)": result["tube_length"], "Tubes": result["no_of_tubes"],
+        "Area (m²)": result["area"], "Status": [SIZING_STATUS[s] for s in result["status"]],
+    })
+
+
+def _ellipse(cases):
+    return _with(cases, **{"Perimeter": perimeter_agm(*_columns(cases, ("a", "b")))})
+
+
+def _tank_ld(cases):
+    diameter, height = ld_dimensions(*_columns(cases, ("volume_m3", "ratio")))
+    return _with(cases, **{"Diameter (m)": diameter, "Height (m)": height})
+
+
+def _tank_optimum(cases):
+    (volume,) = _columns(cases, ("volume_m3",))
+    return _with_frame(cases, optimum_tanks(volume))
+
+
+def _dish(cases):
+    # Two rows per case: torispherical, then ellipsoidal
+    return _with_frame(cases, dish_table(*_columns(cases, ("tank_id_mm", "sf_mm", "dish_thk_mm"))))
+
+
+LIMPET_INPUTS = (
+    "shell_id", "shell_height", "shell_thk", "limpet_od", "limpet_thk", "limpet_pitch", "coil_coverage", "density",
+)
+LIMPET_LABELS = {
+    "single_turn_length": "Single Turn Length (m)",
+    "no_of_turns": "Number of Turns",
+    "total_length": "Total Coil Length (m)",
+    "limpet_weight": "Single Turn Limpet Weight (kg)",
+    "total_limpet_weight": "Total Limpet Weight (kg)",
+    "heat_transfer_area": "Heat Transfer Area (m²)",
+}
+
+
+def _limpet(cases):
+    res = limpet_coil_batch(*_columns(cases, LIMPET_INPUTS))
+    return _with(cases, **{label: res[key] for key, label in LIMPET_LABELS.items()})
+
+
+def _limpet_helical(cases):
+    res = helical_coil(*_columns(cases, LIMPET_INPUTS))
+    labels = {**LIMPET_LABELS, "covered_area": "Covered Shell Area (m²)", "helix_angle": "Helix Angle (°)"}
+    return _with(cases, **{label: res[key] for key, label in labels.items()})
+
+
+def _nearest_size(kind):
+    def run(cases):
+        catalogue = load_catalogue(kind)
+        od, wall = _columns(cases, ("od_mm", "wall_mm"))
+        # A blank wall takes the thinnest one at the nearest OD
+        rows = np.where(np.isnan(wall), catalogue.nearest(od), catalogue.nearest(od, np.nan_to_num(wall)))
+        found = ~np.isnan(od)  # a blank OD has no nearest size
+        return _with(cases, **{
+            "Standard Size": np.where(found, catalogue.size[rows], None),
+            "Schedule": np.where(found, catalogue.schedule[rows], None),
+            "Standard OD (mm)": np.where(found, catalogue.od[rows], np.nan),
+            "Standard Wall (mm)": np.where(found, catalogue.wall[rows], np.nan),
+            "Standard ID (mm)": np.where(found, catalogue.id[rows], np.nan),
+        })
+    return run
+
+
+def _ug27(cases):
+    return ug27.calculate_frame(cases)
+
+
+CALCULATORS = {c.name: c for c in (
+    Calculator("ug27", "ASME UG-27 shell thickness check (S may come from Material + T)",
+               tuple(ug27.INPUT_COLUMNS), _ug27),
+    Calculator("dish", "Torispherical and ellipsoidal dish ends (two output rows per case)",
+               ("tank_id_mm", "sf_mm", "dish_thk_mm"), _dish),
+    Calculator("tank_ld", "Plain cylinder diameter and height for a volume at an L/D ratio",
+               ("volume_m3", "ratio"), _tank_ld),
+    Calculator("tank_optimum", "Head-aware best L/D by surface area (default settings)",
+               ("volume_m3",), _tank_optimum),
+    Calculator("limpet", "Limpet coil length, weight and heat transfer area", LIMPET_INPUTS, _limpet),
+    Calculator("limpet_helical", "Limpet coil as a true helix (pitch included, plus the covered shell area)",
+               LIMPET_INPUTS, _limpet_helical),
+    Calculator("pipe_size", "Nearest standard pipe (NPS × schedule) to an OD and wall", ("od_mm", "wall_mm"),
+               _nearest_size("pipe")),
+    Calculator("tube_size", "Nearest standard heat exchanger tube (OD × BWG) to an OD and wall", ("od_mm", "wall_mm"),
+               _nearest_size("tube")),
+    Calculator("arc_length", "Arc length on a shell", ("diameter_mm", "angle_deg"), _arc),
+    Calculator("hx_area", "Tube bundle heat transfer area", ("tube_dia_mm", "tube_length_m", "no_of_tubes"), _hx_area),
+    Calculator("tube_count", "Maximum tubes in a shell (layout 30/60/90/45 column, default 30°)",
+               ("shell_id_mm", "tube_od_mm", "pitch_mm", "passes"), _tube_count),
+    Calculator("hx_duty", "Required area from duty, temperatures and U, and the smallest standard bundle for it",
+               HX_DUTY_INPUTS, _hx_duty),
+    Calculator("slope", "Slope % and angle from rise and run", ("rise", "run"), _slope),
+    Calculator("ellipse", "Ellipse perimeter (AGM)", ("a", "b"), _ellipse),
+)}
+
+
+def get_calculator(name):
+    try:
+        return CALCULATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown calculator {name!r}; choose from {', '.join(CALCULATORS)}") from None
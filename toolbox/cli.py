@@ -0,0 +1,155 @@
+"""Command-line batch runner: stream a CSV or Parquet file of cases through a calculator.
+
+    python -m toolbox list
+    python -m toolbox run ug27 cases.csv -o results.parquet --chunksize 200000
+
+Input is read and written one chunk at a time, so memory stays bounded by
+``--chunksize`` no matter how many rows the file holds. ``-`` reads CSV
+from stdin or writes CSV to stdout. Parquet needs ``pyarrow``.
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+from toolbox.calculators import CALCULATORS, get_calculator
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def _is_parquet(path):
+    return str(path) != "-" and Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrames of at most ``chunksize`` rows from a CSV or Parquet file."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(sys.stdin if str(path) == "-" else path, chunksize=chunksize)
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self._file = sys.stdout if str(path) == "-" else open(path, "w", newline="", encoding="utf-8")
+        self._header = True
+
+    def write(self, frame):
+        frame.to_csv(self._file, index=False, header=self._header)
+        self._header = False
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa, self._pq = pa, pq
+        self._path = path
+        self._writer = None
+
+    def write(self, frame):
+        if self._writer is None:
+            table = self._pa.Table.from_pandas(frame, preserve_index=False)
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        else:
+            # Later chunks must match the first chunk's schema
+            table = self._pa.Table.from_pandas(frame, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_sink(path):
+    return _ParquetSink(path) if _is_parquet(path) else _CsvSink(path)
+
+
+def run(calculator, source, dest, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Stream ``source`` through ``calculator`` into ``dest``; returns a summary dict.
+
+    ``progress`` is called after every chunk with the running row count.
+    """
+    calc = get_calculator(calculator) if isinstance(calculator, str) else calculator
+    sink = open_sink(dest)
+    rows_in = rows_out = not_ok = 0
+    statuses = Counter()
+    start = time.perf_counter()
+    try:
+        for chunk in read_chunks(source, chunksize):
+            result = calc.run(chunk)
+            sink.write(result)
+            rows_in += len(chunk)
+            rows_out += len(result)
+            if "Status" in result.columns:
+                statuses.update(result["Status"].value_counts().to_dict())
+            if "Status code" in result.columns:
+                not_ok += int((result["Status code"] != 0).sum())
+            if progress is not None:
+                progress(rows_in)
+    finally:
+        sink.close()
+    seconds = time.perf_counter() - start
+    return {
+        "calculator": calc.name,
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "seconds": seconds,
+        "rows_per_s": rows_in / seconds if seconds else float("inf"),
+        "statuses": dict(statuses),
+        "not_ok": not_ok,
+    }
+
+
+def _list(args):
+    for calc in CALCULATORS.values():
+        print(f"{calc.name:<14}{calc.description}")
+        print(f"{'':<14}columns: {', '.join(calc.inputs)}")
+
+
+def _run(args):
+    def progress(rows):
+        print(f"\r{rows:,} rows", end="", file=sys.stderr, flush=True)
+
+    summary = run(args.calculator, args.input, args.output, args.chunksize, None if args.quiet else progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+        print(f"{summary['calculator']}: {summary['rows_in']:,} rows in → {summary['rows_out']:,} rows out "
+              f"in {summary['seconds']:.2f} s ({summary['rows_per_s']:,.0f} rows/s)", file=sys.stderr)
+        for status, count in sorted(summary["statuses"].items(), key=lambda kv: -kv[1]):
+            print(f"  {count:>12,}  {status}", file=sys.stderr)
+
+    return 1 if args.strict and summary["not_ok"] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m toolbox", description="Engineering Toolbox batch runner")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="list the calculators and their input columns").set_defaults(func=_list)
+
+    p = sub.add_parser("run", help="stream a file of cases through a calculator")
+    p.add_argument("calculator", choices=sorted(CALCULATORS))
+    p.add_argument("input", help="CSV or Parquet file of cases ('-' for CSV on stdin)")
+    p.add_argument("-o", "--output", default="-", help="CSV or Parquet output file (default: CSV on stdout)")
+    p.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk (default %(default)s)")
+    p.add_argument("-q", "--quiet", action="store_true", help="no progress or summary on stderr")
+    p.add_argument("--strict", action="store_true", help="exit with status 1 if any case is not OK")
+    p.set_defaults(func=_run)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args) or 0
+    except ValueError as exc:
+        parser.exit(2, f"error: {exc}\n")
@@ -0,0 +1,77 @@
+"""Torispherical (10% knuckle) and 2:1 ellipsoidal dish end geometry."""
+import numpy as np
+
+from toolbox.cache import memoize
+
+# Standard dish end IDs offered in the catalogue (mm)
+STANDARD_IDS = np.arange(300, 6001, 50)
+
+
+# ---------------- Kernels ----------------
+# All inputs are mm and may be scalars or NumPy arrays (they broadcast).
+def calculate_torispherical_dish(tank_id_mm, sf_mm, dish_thk_mm):
+    tank_id_mm = np.asarray(tank_id_mm, dtype=float)
+    crown_radius = tank_id_mm * 1.00
+    knuckle_radius = tank_id_mm * 0.10
+    dish_blank_dia = tank_id_mm + 0.10 * tank_id_mm + 2 * sf_mm
+    dish_end_height = (tank_id_mm * 0.194) + sf_mm + dish_thk_mm
+    d3 = tank_id_mm ** 3
+    d2 = tank_id_mm ** 2
+    volume_m3 = ((0.0847 * d3) + (np.pi * d2 * sf_mm) / 4) * 1e-9
+    return crown_radius, knuckle_radius, dish_blank_dia, dish_end_height, volume_m3
+
+
+def calculate_ellipsoidal_dish(tank_id_mm, sf_mm, dish_thk_mm):
+    tank_id_mm = np.asarray(tank_id_mm, dtype=float)
+    crown_radius = 0.9 * tank_id_mm
+    dish_blank_dia = 1.17 * tank_id_mm + 2 * sf_mm
+    dish_end_height = (0.25 * tank_id_mm) + sf_mm + dish_thk_mm
+    d3 = tank_id_mm ** 3
+    d2 = tank_id_mm ** 2
+    volume_m3 = ((np.pi * d3) / 24 + (np.pi * d2 * sf_mm) / 4) * 1e-9
+    return crown_radius, dish_blank_dia, dish_end_height, volume_m3
+
+
+# ---------------- Tables ----------------
+@memoize()
+def dish_table(tank_id_mm, sf_mm, dish_thk_mm):
+    """Both head types for every tank ID in one frame (torispherical rows first per ID).
+
+    The ellipsoidal knuckle radius is NaN (a 2:1 head has no separate knuckle).
+    """
+    import pandas as pd
+
+    tank_id_mm, sf_mm, dish_thk_mm = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (tank_id_mm, sf_mm, dish_thk_mm))
+    )
+    c_r_t, k_r, b_d_t, h_t, vol_t = calculate_torispherical_dish(tank_id_mm, sf_mm, dish_thk_mm)
+    c_r_e, b_d_e, h_e, vol_e = calculate_ellipsoidal_dish(tank_id_mm, sf_mm, dish_thk_mm)
+
+    n = tank_id_mm.size
+    volume = _interleave(vol_t, vol_e)
+    return pd.DataFrame({
+        "Tank ID (mm)": np.repeat(tank_id_mm, 2),
+        "SF (mm)": np.repeat(sf_mm, 2),
+        "Dish Thk (mm)": np.repeat(dish_thk_mm, 2),
+        "Type": np.tile(np.array(["Torispherical", "Ellipsoidal"], dtype=object), n),
+        "Crown Radius (mm)": _interleave(c_r_t, c_r_e),
+        "Knuckle Radius (mm)": _interleave(k_r, np.full(n, np.nan)),
+        "Blank Dia (mm)": _interleave(b_d_t, b_d_e),
+        "Dish End Height (mm)": _interleave(h_t, h_e),
+        "Volume (m³)": volume,
+        "Volume (liters)": volume * 1000,
+    })
+
+
+def _interleave(a, b):
+    # a0, b0, a1, b1, ... so each ID's two heads sit next to each other
+    return np.column_stack([a, b]).ravel()
+
+
+@memoize()
+def dish_catalogue(sf_mm, dish_thk_mm, tank_ids_mm=None):
+    """Blank diameter / height / volume of both head types for every standard ID.
+
+    Keyed on ``(sf_mm, dish_thk_mm)``; passing other IDs (an array) bypasses the cache.
+    """
+    return dish_table(STANDARD_IDS if tank_ids_mm is None else tank_ids_mm, sf_mm, dish_thk_mm)
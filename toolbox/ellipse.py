@@ -0,0 +1,64 @@
+"""Ellipse perimeter: AGM complete elliptic integral kernel plus a Simpson reference."""
+import math
+
+import numpy as np
+
+from toolbox.cache import memoize
+
+
+# ---------------- AGM kernel ----------------
+@memoize()
+def perimeter_agm(a, b, max_iter=40):
+    """Exact perimeter of ellipse(s) with semi-axes ``a`` and ``b`` (any order, arrays broadcast).
+
+    Uses the arithmetic-geometric mean form of the complete elliptic integral
+    of the second kind:
+
+        P = 2π / M(a, b) · (a² − Σ 2ⁿ⁻¹ cₙ²),   c₀² = a² − b²,  cₙ = (aₙ₋₁ − bₙ₋₁) / 2
+
+    It converges quadratically, so even a 1000:1 ellipse reaches machine
+    precision in about six iterations. A degenerate ellipse (a zero axis) is
+    a segment traversed twice, 4 × the other semi-axis.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    major, minor = np.maximum(a, b), np.minimum(a, b)
+    flat = minor == 0
+    # The AGM of (a, 0) collapses to 0; run those rows as circles and replace them below
+    an, bn = major, np.where(flat, major, minor)
+
+    total = 0.5 * (an ** 2 - bn ** 2)
+    weight = 1.0
+    for _ in range(max_iter):
+        c = (an - bn) / 2
+        an, bn = (an + bn) / 2, np.sqrt(an * bn)
+        total = total + weight * c ** 2
+        weight *= 2
+        if np.all(c <= 1e-16 * an):
+            break
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(flat, 4 * major, 2 * np.pi / an * (major ** 2 - total))
+
+
+# ---------------- Simpson reference ----------------
+def integrand(theta, e):
+    return np.sqrt(1 - (e**2) * (np.sin(theta))**2)
+
+
+def simpson_integration(func, a, b, n=10000):
+    if n % 2 == 1:  # Simpson’s rule needs even number of intervals
+        n += 1
+    h = (b - a) / n
+    x = np.linspace(a, b, n + 1)
+    y = func(x)
+    S = y[0] + y[-1] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-2:2])
+    return S * h / 3
+
+
+@memoize()
+def perimeter_simpson(a, b, n=10000):
+    """Perimeter of one ellipse by Simpson integration of 4a·E(e) (reference mode)."""
+    a, b = max(a, b), min(a, b)
+    e = math.sqrt(1 - (b**2) / (a**2))
+    return 4 * a * simpson_integration(lambda t: integrand(t, e), 0, math.pi / 2, n=n)
+
@@ -0,0 +1,21 @@
+"""Small geometry kernels: arc length on a shell and slope conversion.
+
+Inputs may be scalars or NumPy arrays (they broadcast).
+"""
+import numpy as np
+
+
+def arc_length(diameter_mm, angle_deg):
+    """Arc length (mm) subtended by ``angle_deg`` on a circle of ``diameter_mm``."""
+    radius = np.asarray(diameter_mm, dtype=float) / 2
+    return 2 * np.pi * radius * (np.asarray(angle_deg, dtype=float) / 360)
+
+
+def slope(rise, run):
+    """(slope %, angle °) for a rise over a run; a zero run gives NaN."""
+    rise = np.asarray(rise, dtype=float)
+    run = np.asarray(run, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope_percent = np.where(run != 0, (rise / run) * 100, np.nan)
+    angle_deg = np.degrees(np.arctan(slope_percent / 100))
+    return slope_percent, angle_deg
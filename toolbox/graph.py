@@ -0,0 +1,172 @@
+"""Incremental dependency graph: input nodes, derived nodes and lazy, memoized recomputation.
+
+Setting an input only marks the nodes downstream of it stale; nothing is
+computed until a value is asked for. Each node remembers the revision at
+which its value last *changed*, so a stale node whose inputs recomputed to
+the same values is revalidated without running its function (early
+cutoff), and a node whose function returns an equal value does not make
+its own dependents recompute.
+
+A derived node whose function raises, or that depends on a missing (None)
+value, holds None and records the error instead of raising.
+"""
+
+
+class Node:
+    __slots__ = ("name", "fn", "deps", "dependents", "label", "value", "error",
+                 "stale", "changed_at", "verified_at", "computations")
+
+    def __init__(self, name, fn=None, deps=(), label=None):
+        self.name = name
+        self.fn = fn  # None for an input
+        self.deps = tuple(deps)
+        self.dependents = []
+        self.label = label or name
+        self.value = None
+        self.error = None
+        self.stale = fn is not None
+        self.changed_at = 0  # revision when value last changed
+        self.verified_at = -1  # revision when value was last known to be current
+        self.computations = 0
+
+    @property
+    def is_input(self):
+        return self.fn is None
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except Exception:  # e.g. arrays, whose == is elementwise
+        return False
+
+
+class DependencyGraph:
+    """Named nodes; derived ones are ``fn(**{dep: value})`` of the nodes they depend on."""
+
+    def __init__(self):
+        self._nodes = {}
+        self.revision = 0
+
+    # ---------------- Building ----------------
+    def input(self, name, value=None, label=None):
+        node = self._add(Node(name, label=label))
+        node.value = value
+        return node
+
+    def derived(self, name, fn, deps, label=None):
+        """Add a node computed by ``fn`` from ``deps`` (which must already exist)."""
+        missing = [d for d in deps if d not in self._nodes]
+        if missing:
+            raise KeyError(f"{name!r} depends on unknown node(s): {', '.join(missing)}")
+        node = self._add(Node(name, fn, deps, label))
+        for d in deps:
+            self._nodes[d].dependents.append(name)
+        return node
+
+    def _add(self, node):
+        if node.name in self._nodes:
+            raise KeyError(f"Node {node.name!r} already exists")
+        self._nodes[node.name] = node
+        return node
+
+    # ---------------- Inputs ----------------
+    def set(self, name, value):
+        """Set an input; returns True when the value changed (and its dependents went stale)."""
+        node = self._nodes[name]
+        if not node.is_input:
+            raise ValueError(f"{name!r} is derived and cannot be set")
+        if _same(node.value, value):
+            return False
+        self.revision += 1
+        node.value = value
+        node.changed_at = self.revision
+        self._invalidate(node)
+        return True
+
+    def update(self, **values):
+        """Set several inputs; returns the names that changed."""
+        return [name for name, value in values.items() if self.set(name, value)]
+
+    def _invalidate(self, node):
+        todo = list(node.dependents)
+        while todo:
+            dep = self._nodes[todo.pop()]
+            if not dep.stale:  # a stale node's dependents are already stale
+                dep.stale = True
+                todo.extend(dep.dependents)
+
+    # ---------------- Reading ----------------
+    def get(self, name):
+        """Value of ``name``, recomputing it (and stale nodes upstream of it) first if needed."""
+        node = self._nodes[name]
+        if node.stale:
+            self._refresh(node)
+        return node.value
+
+    def _refresh(self, node):
+        for d in node.deps:
+            dep = self._nodes[d]
+            if dep.stale:
+                self._refresh(dep)
+        node.stale = False
+        if node.computations and all(self._nodes[d].changed_at <= node.verified_at for d in node.deps):
+            node.verified_at = self.revision  # inputs recomputed to the same values: nothing to do
+            return
+
+        args = {d: self._nodes[d].value for d in node.deps}
+        missing = [d for d, v in args.items() if v is None]
+        value, error = None, None
+        if missing:
+            error = f"needs {', '.join(self._nodes[d].label for d in missing)}"
+        else:
+            try:
+                value = node.fn(**args)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        node.computations += 1
+        node.error = error
+        if not _same(node.value, value):
+            node.value = value
+            node.changed_at = self.revision
+        node.verified_at = self.revision
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def __contains__(self, name):
+        return name in self._nodes
+
+    def node(self, name):
+        return self._nodes[name]
+
+    def nodes(self):
+        """All nodes in insertion order (inputs before the nodes built on them)."""
+        return list(self._nodes.values())
+
+    def inputs(self):
+        return {n.name: n.value for n in self._nodes.values() if n.is_input}
+
+    def stale(self):
+        """Names of the derived nodes that will recompute (or revalidate) on their next read."""
+        return [n.name for n in self._nodes.values() if n.stale]
+
+    def downstream(self, name):
+        """Every node that (transitively) depends on ``name``, in insertion order."""
+        seen, todo = set(), list(self._nodes[name].dependents)
+        while todo:
+            d = todo.pop()
+            if d not in seen:
+                seen.add(d)
+                todo.extend(self._nodes[d].dependents)
+        return [n for n in self._nodes if n in seen]
+
+    def refresh(self):
+        """Bring every node up to date; returns the names whose function actually ran."""
+        before = {n.name: n.computations for n in self._nodes.values()}
+        for node in self._nodes.values():
+            if node.stale:
+                self._refresh(node)
+        return [n.name for n in self._nodes.values() if n.computations != before[n.name]]
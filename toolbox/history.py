@@ -0,0 +1,122 @@
+"""Bounded, columnar calculation history.
+
+Rows are written into preallocated NumPy column arrays used as a ring
+buffer, so appending is O(1) and memory is capped at ``capacity`` rows.
+Reading a window of rows only touches that window. This replaces the
+per-rerun ``pd.concat`` / ``pd.DataFrame(list_of_dicts)`` the pages used to
+do over an ever-growing list.
+"""
+import os
+from numbers import Integral, Real
+
+import numpy as np
+
+DEFAULT_CAPACITY = int(os.environ.get("TOOLBOX_HISTORY_CAP", 1000))
+
+
+def _dtype_for(value):
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(object)
+    if isinstance(value, Integral):
+        return np.dtype(np.int64)
+    if isinstance(value, Real):
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+def _blank(dtype):
+    return np.nan if dtype.kind == "f" else None
+
+
+class ColumnarHistory:
+    """Ring buffer of typed columns; the oldest rows are dropped past ``capacity``.
+
+    ``on_append`` is called with every appended row, e.g. to persist it.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, on_append=None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        self.on_append = on_append
+        self._columns = {}
+        self._appended = 0
+
+    def __len__(self):
+        return min(self._appended, self.capacity)
+
+    @property
+    def appended(self):
+        """Rows appended since creation (keeps counting after the buffer wraps)."""
+        return self._appended
+
+    @property
+    def dropped(self):
+        return self._appended - len(self)
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def _add_column(self, name, value):
+        dtype = _dtype_for(value)
+        if dtype.kind == "i" and self._appended:
+            # Rows already written have no value here; ints cannot hold the blank
+            dtype = np.dtype(np.float64)
+        col = np.empty(self.capacity, dtype=dtype)
+        if dtype.kind != "i":
+            col.fill(_blank(dtype))
+        self._columns[name] = col
+
+    def append(self, row):
+        slot = self._appended % self.capacity
+        for name, value in row.items():
+            if name not in self._columns:
+                self._add_column(name, value)
+            col = self._columns[name]
+            # bool is an Integral too, but stored in a numeric column it would read back as 1.0 / 0
+            numeric = isinstance(value, (Real, np.number)) and not isinstance(value, (bool, np.bool_))
+            if col.dtype.kind in "if" and not numeric and value is not None:
+                col = self._columns[name] = col.astype(object)
+            elif col.dtype.kind == "i" and not isinstance(value, Integral):
+                col = self._columns[name] = col.astype(np.float64)
+            col[slot] = np.nan if value is None and col.dtype.kind == "f" else value
+
+        for name, col in self._columns.items():
+            if name not in row:
+                if col.dtype.kind == "i":
+                    col = self._columns[name] = col.astype(np.float64)
+                col[slot] = _blank(col.dtype)
+        self._appended += 1
+        if self.on_append is not None:
+            self.on_append(row)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def _slots(self, start, stop):
+        # Logical positions (0 = oldest retained row) → physical ring indices
+        n = len(self)
+        start = max(0, min(start, n))
+        stop = n if stop is None else max(start, min(stop, n))
+        first = self._appended - n
+        return (first + np.arange(start, stop)) % self.capacity, first + start
+
+    def column(self, name, start=0, stop=None):
+        idx, _ = self._slots(start, stop)
+        return self._columns[name][idx]
+
+    def frame(self, start=0, stop=None, newest_first=False):
+        """DataFrame of logical rows ``start:stop``; the index is the row's running number."""
+        import pandas as pd
+
+        idx, first = self._slots(start, stop)
+        index = pd.RangeIndex(first, first + idx.size)
+        if newest_first:
+            idx, index = idx[::-1], index[::-1]
+        return pd.DataFrame({name: col[idx] for name, col in self._columns.items()}, index=index)
+
+    def clear(self):
+        self._columns = {}
+        self._appended = 0
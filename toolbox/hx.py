@@ -0,0 +1,294 @@
+"""Heat exchanger tube bundle kernels: tube area, thermal sizing, tube-sheet layout and tube counts.
+
+Tube centres sit on a lattice of rows; the layout angle sets the row
+spacing and stagger. A centre is kept when the tube fits inside the outer
+tube limit (OTL) circle and clear of the pass partition lanes. Because
+every lattice row is a line, clipping a row to the OTL circle and to the
+lanes is interval arithmetic, so :func:`tube_count` counts thousands of
+shell/tube/pitch combinations at once without building any coordinates;
+:func:`tube_layout` generates the actual centres of one geometry for
+drawing. Both try the lattice centred on a tube and on a gap (in each
+direction) and keep the fuller one.
+
+:func:`size_exchanger` goes from duty to bundle: LMTD, the multipass F
+correction and U give the required area, which is matched against every
+tube OD × length × count bundle by binary search over the sorted bundle
+areas, for any number of exchangers in one call.
+"""
+import numpy as np
+
+from toolbox.cache import memoize
+
+LAYOUTS = ("30", "60", "90", "45")  # TEMA tube layout angles (°)
+PASSES = (1, 2, 4, 6, 8)
+OTL_CLEARANCE = 15.0  # mm, shell ID − OTL diameter
+LANE_WIDTH = 16.0  # mm, clear width of a pass partition lane (tube wall to tube wall)
+PITCH_RATIO = 1.25  # default pitch / tube OD
+SHELL_IDS = np.arange(150.0, 2500.0 + 1e-9, 5.0)  # mm, shell sizes swept by size_shell
+TUBE_LENGTHS = (2.44, 3.05, 3.66, 4.88, 6.10, 7.32)  # m, standard 8–24 ft tubes
+TUBE_ODS = (15.88, 19.05, 25.4)  # mm, 5/8", 3/4" and 1" tubes
+MAX_TUBES = 5000
+MIN_F = 0.75  # below this a multipass exchanger is badly placed on the F curve
+
+_ORIGINS = ((0.0, 0.0), (0.5, 0.0), (0.0, 0.5), (0.5, 0.5))  # lattice shift as fractions of (column, row) step
+_EPS = 1e-9
+
+
+def tube_area(tube_dia_mm, tube_length_m, no_of_tubes):
+    """Outside heat transfer area (m²) of ``no_of_tubes`` tubes: π·d·L·N (inputs broadcast)."""
+    # π * d * L * N / 1000 (to convert mm·m → m²)
+    return (np.pi * np.asarray(tube_dia_mm, dtype=float) * np.asarray(tube_length_m, dtype=float)
+            * np.asarray(no_of_tubes, dtype=float)) / 1000
+
+
+# ---------------- Thermal sizing ----------------
+def lmtd(t_hot_in, t_hot_out, t_cold_in, t_cold_out, counterflow=True):
+    """Log mean temperature difference (K); inputs broadcast.
+
+    NaN where a terminal difference is zero or negative (a temperature cross).
+    Equal terminal differences give that difference.
+    """
+    t_hot_in, t_hot_out, t_cold_in, t_cold_out = (np.asarray(x, dtype=float) for x in (t_hot_in, t_hot_out, t_cold_in, t_cold_out))
+    if counterflow:
+        dt1, dt2 = t_hot_in - t_cold_out, t_hot_out - t_cold_in
+    else:
+        dt1, dt2 = t_hot_in - t_cold_in, t_hot_out - t_cold_out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = dt1 / dt2
+        mean = np.where(np.abs(ratio - 1) < 1e-9, dt1, (dt1 - dt2) / np.log(ratio))
+    return np.where((dt1 > 0) & (dt2 > 0), mean, np.nan)
+
+
+def f_factor(t_hot_in, t_hot_out, t_cold_in, t_cold_out, shell_passes=1):
+    """LMTD correction F for ``shell_passes`` shell passes and 2, 4, ... tube passes each (inputs broadcast).
+
+    Bowman's 1-2 exchanger formula applied to the per-shell effectiveness,
+    which covers N shells in series. NaN where the duty cannot be reached
+    with that many shells (the log argument goes non-positive).
+    """
+    t_hot_in, t_hot_out, t_cold_in, t_cold_out, shell_passes = (
+        np.asarray(x, dtype=float) for x in (t_hot_in, t_hot_out, t_cold_in, t_cold_out, shell_passes)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = (t_hot_in - t_hot_out) / (t_cold_out - t_cold_in)
+        P = (t_cold_out - t_cold_in) / (t_hot_in - t_cold_in)
+        # Effectiveness of one shell when N shells in series reach P overall
+        X = ((1 - P * R) / (1 - P)) ** (1 / shell_passes)
+        unity = np.abs(R - 1) < 1e-6
+        P1 = np.where(unity, P / (shell_passes - (shell_passes - 1) * P), (1 - X) / (R - X))
+
+        s = np.sqrt(R * R + 1)
+        log_num = np.where(unity, P1 / (1 - P1), np.log((1 - P1) / (1 - R * P1)) / (R - 1))
+        den = np.log((2 - P1 * (R + 1 - s)) / (2 - P1 * (R + 1 + s)))
+        F = s * log_num / den
+    valid = (P > 0) & (P < 1) & (R > 0) & np.isfinite(F) & (F > 0)
+    return np.where(valid, np.minimum(F, 1.0), np.nan)
+
+
+def required_area(duty_kw, u_w_m2k, lmtd_k, f=1.0):
+    """Area (m²) for ``duty_kw`` at overall coefficient ``u_w_m2k`` (W/m²·K): Q / (U·F·LMTD)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(duty_kw, dtype=float) * 1000 / (np.asarray(u_w_m2k, dtype=float) * f * lmtd_k)
+
+
+@memoize(maxsize=16)
+def bundle_grid(tube_ods=TUBE_ODS, tube_lengths=TUBE_LENGTHS, max_tubes=MAX_TUBES):
+    """Every tube OD × length × count bundle sorted by area (ties: fewest tubes, then shortest).
+
+    Returns ``(area, od, length, count)`` arrays; built once per grid spec.
+    """
+    od, length, count = np.meshgrid(np.asarray(tube_ods, dtype=float), np.asarray(tube_lengths, dtype=float),
+                                    np.arange(1, int(max_tubes) + 1), indexing="ij")
+    area = tube_area(od, length, count).ravel()
+    od, length, count = od.ravel(), length.ravel(), count.ravel()
+    order = np.lexsort((length, count, area))
+    return area[order], od[order], length[order], count[order]
+
+
+def size_exchanger(duty_kw, t_hot_in, t_hot_out, t_cold_in, t_cold_out, u_w_m2k, shell_passes=1, tube_passes=2,
+                   tube_ods=TUBE_ODS, tube_lengths=TUBE_LENGTHS, max_tubes=MAX_TUBES, margin=0.0,
+                   min_f=MIN_F):
+    """Required area and smallest passing bundle for each exchanger (all thermal inputs broadcast).
+
+    Temperatures °C, duty kW, U W/m²·K, ``margin`` % extra area. With one
+    tube pass the exchanger is taken as pure counterflow (F = 1); otherwise
+    F comes from :func:`f_factor`. The bundle is the smallest tube OD ×
+    length × count (up to ``max_tubes``) whose π·d·L·N area covers the
+    requirement; found by one ``searchsorted`` over the sorted bundle areas.
+
+    Returns a dict of arrays; ``status`` is 0 OK, 1 no bundle on the grid,
+    2 F below ``min_f`` or undefined (add shell passes), 3 invalid
+    temperatures (a cross or non-positive LMTD).
+    """
+    duty_kw, t_hot_in, t_hot_out, t_cold_in, t_cold_out, u_w_m2k, shell_passes, tube_passes = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (duty_kw, t_hot_in, t_hot_out, t_cold_in, t_cold_out, u_w_m2k,
+                                               shell_passes, tube_passes))
+    )
+    dt = lmtd(t_hot_in, t_hot_out, t_cold_in, t_cold_out)
+    F = np.where(tube_passes > 1, f_factor(t_hot_in, t_hot_out, t_cold_in, t_cold_out, shell_passes), 1.0)
+    area = required_area(duty_kw, u_w_m2k, dt, F) * (1 + margin / 100)
+
+    grid_area, grid_od, grid_length, grid_count = bundle_grid(tuple(tube_ods), tuple(tube_lengths), max_tubes)
+    i = np.searchsorted(grid_area, np.nan_to_num(area, nan=np.inf), side="left")
+    found = i < grid_area.size
+    i = np.minimum(i, grid_area.size - 1)
+
+    status = np.where(found, 0, 1)
+    status = np.where(~(F >= min_f), 2, status)
+    status = np.where(~(dt > 0) | ~(duty_kw > 0) | ~(u_w_m2k > 0), 3, status)
+    ok = status == 0
+    return {
+        "lmtd": dt,
+        "F": F,
+        "required_area": area,
+        "tube_od": np.where(ok, grid_od[i], np.nan),
+        "tube_length": np.where(ok, grid_length[i], np.nan),
+        "no_of_tubes": np.where(ok, grid_count[i], 0).astype(np.int64),
+        "area": np.where(ok, grid_area[i], np.nan),
+        "status": status,
+    }
+
+
+SIZING_STATUS = {0: "✅ OK", 1: "❌ No bundle on the grid", 2: "⚠️ F too low: add shell passes", 3: "❌ Check temperatures"}
+
+
+# ---------------- Lattice ----------------
+def _lattice(layout, pitch):
+    """(column step, row step, stagger of odd rows) of a layout at ``pitch``."""
+    if layout == "30":  # triangular, rows across the flow
+        return pitch, pitch * np.sqrt(3) / 2, pitch / 2
+    if layout == "60":  # rotated triangular
+        return pitch * np.sqrt(3), pitch / 2, pitch * np.sqrt(3) / 2
+    if layout == "90":  # square in line
+        return pitch, pitch, 0.0 * pitch
+    if layout == "45":  # rotated square
+        return pitch * np.sqrt(2), pitch / np.sqrt(2), pitch / np.sqrt(2)
+    raise ValueError(f"Unknown layout {layout!r}; choose from {', '.join(LAYOUTS)}")
+
+
+def _lanes(passes, otl):
+    """(horizontal lane centre heights as fractions of the OTL diameter, vertical lane at x = 0?)."""
+    if passes == 1:
+        return (), False
+    if passes == 2:
+        return (0.0,), False
+    if passes == 4:
+        return (0.0,), True
+    if passes == 6:
+        return (-1 / 6, 1 / 6), True
+    if passes == 8:
+        return (-0.25, 0.0, 0.25), True
+    raise ValueError(f"Unsupported number of passes {passes}; choose from {', '.join(map(str, PASSES))}")
+
+
+def _count_closed(a, b, offset, step):
+    # Lattice points offset + k·step in [a, b]
+    n = np.floor((b - offset) / step + _EPS) - np.ceil((a - offset) / step - _EPS) + 1
+    return np.maximum(n, 0)
+
+
+def _count_open(a, b, offset, step):
+    # Lattice points offset + k·step in (a, b)
+    n = np.ceil((b - offset) / step - _EPS) - np.floor((a - offset) / step + _EPS) - 1
+    return np.maximum(n, 0)
+
+
+@memoize()
+def tube_count(shell_id, tube_od, pitch, layout="30", passes=1, otl_clearance=OTL_CLEARANCE, lane_width=LANE_WIDTH):
+    """Maximum number of tubes in a shell (mm inputs; ``shell_id``, ``tube_od`` and ``pitch`` broadcast).
+
+    The OTL diameter is ``shell_id − otl_clearance``; every tube lies wholly
+    inside it. Pass partition lanes of ``lane_width`` clear width run
+    across the bundle: one for 2 passes, plus a vertical one for 4, two for
+    6 and three for 8. Returns an int array (a pitch below the tube OD gives 0).
+    """
+    shell_id, tube_od, pitch = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (shell_id, tube_od, pitch)))
+    col, row, stagger = (np.asarray(x, dtype=float)[..., None] for x in _lattice(layout, pitch))
+    otl = shell_id - otl_clearance
+    limit = ((otl - tube_od) / 2)[..., None]  # furthest a centre may be from the axis
+    half_lane = ((lane_width + tube_od) / 2)[..., None]  # closest a centre may be to a lane centre line
+    lanes, vertical = _lanes(passes, otl)
+
+    rows = int(np.ceil(np.nanmax(np.where(row > 0, limit / row, 0), initial=0))) + 1
+    j = np.arange(-rows, rows + 1)
+    best = np.zeros(shell_id.shape)
+    for fx, fy in _ORIGINS:
+        y = (j + fy) * row
+        with np.errstate(invalid="ignore"):
+            w = np.sqrt(limit ** 2 - y ** 2)  # half-width of the row inside the OTL (NaN: row misses it)
+        offset = fx * col + (j % 2) * stagger
+        n = np.where(np.isnan(w), 0, _count_closed(-w, w, offset, col))
+        if vertical:
+            blocked = _count_open(-half_lane, half_lane, offset, col)
+            n = np.where(half_lane > w, 0, np.maximum(n - blocked, 0))
+        for frac in lanes:
+            n = np.where(np.abs(y - frac * otl[..., None]) < half_lane - _EPS, 0, n)
+        best = np.maximum(best, n.sum(axis=-1))
+    return np.where((pitch >= tube_od) & (otl > tube_od), best, 0).astype(np.int64)
+
+
+@memoize()
+def tube_layout(shell_id, tube_od, pitch, layout="30", passes=1, otl_clearance=OTL_CLEARANCE, lane_width=LANE_WIDTH):
+    """``(x, y)`` tube centres (mm, origin on the shell axis) of the fullest layout of one geometry.
+
+    Same rules as :func:`tube_count`, so ``len(x)`` equals its count.
+    """
+    col, row, stagger = (float(v) for v in _lattice(layout, float(pitch)))
+    otl = shell_id - otl_clearance
+    limit = (otl - tube_od) / 2
+    if pitch < tube_od or limit < 0:
+        return np.empty(0), np.empty(0)
+    half_lane = (lane_width + tube_od) / 2
+    lanes, vertical = _lanes(passes, otl)
+
+    rows = int(np.ceil(limit / row)) + 1
+    cols = int(np.ceil(limit / col)) + 2
+    j, k = np.meshgrid(np.arange(-rows, rows + 1), np.arange(-cols, cols + 1), indexing="ij")
+    best = None
+    for fx, fy in _ORIGINS:
+        x = ((k + fx) * col + (j % 2) * stagger).ravel()
+        y = ((j + fy) * row).ravel()
+        keep = x * x + y * y <= limit * limit + _EPS
+        if vertical:
+            keep &= np.abs(x) >= half_lane - _EPS
+        for frac in lanes:
+            keep &= np.abs(y - frac * otl) >= half_lane - _EPS
+        if best is None or keep.sum() > best[0].size:
+            best = x[keep], y[keep]
+    return best
+
+
+# ---------------- Shell sizing ----------------
+def size_shell(target_area, tube_od, tube_length_m, pitch_ratios=(PITCH_RATIO,), layouts=LAYOUTS, passes=1,
+               shell_ids=SHELL_IDS, otl_clearance=OTL_CLEARANCE, lane_width=LANE_WIDTH):
+    """Smallest shell per layout × pitch that holds enough tubes for ``target_area`` m².
+
+    Every shell ID × pitch ratio is counted in one :func:`tube_count` call
+    per layout. Returns a DataFrame (smallest shell first, then fewest
+    tubes); layouts/pitches that never reach the area are left out.
+    """
+    import pandas as pd
+
+    shell_ids = np.asarray(shell_ids, dtype=float)[:, None]
+    ratios = np.asarray(pitch_ratios, dtype=float)[None, :]
+    per_tube = float(tube_area(tube_od, tube_length_m, 1))
+    needed = int(np.ceil(target_area / per_tube - 1e-12))
+
+    frames = []
+    for layout in layouts:
+        counts = tube_count(shell_ids, tube_od, ratios * tube_od, layout, passes, otl_clearance, lane_width)
+        enough = counts >= needed
+        first = np.argmax(enough, axis=0)  # smallest shell per pitch ratio
+        found = enough.any(axis=0)
+        n = counts[first, np.arange(ratios.size)][found]
+        frames.append(pd.DataFrame({
+            "Layout (°)": layout,
+            "Pitch (mm)": (ratios[0] * tube_od)[found],
+            "Pitch Ratio": ratios[0][found],
+            "Shell ID (mm)": shell_ids[first, 0][found],
+            "Tubes": n,
+            "Area (m²)": n * per_tube,
+            "Area Margin (%)": (n * per_tube / target_area - 1) * 100,
+        }))
+    return (pd.concat(frames, ignore_index=True)
+            .sort_values(["Shell ID (mm)", "Tubes"], kind="stable", ignore_index=True))
@@ -0,0 +1,177 @@
+"""Limpet (half-pipe) coil length, weight and heat transfer area.
+
+:func:`limpet_coil` is the page's original flat-turn estimate. :func:`helical_coil`
+is the exact helix, and :func:`size_limpet` inverts it: given a required
+heat transfer area it sweeps pitch × half-pipe size × coverage and ranks
+the designs that meet it by weight.
+"""
+import math
+
+import numpy as np
+
+from toolbox.cache import memoize
+from toolbox.pipes import half_pipe_sizes
+
+SIZING_PITCHES = np.arange(50.0, 400.0 + 1e-9, 5.0)  # mm
+SIZING_COVERAGES = np.arange(40.0, 100.0 + 1e-9, 5.0)  # % of shell height
+MIN_GAP = 20.0  # mm of shell between neighbouring turns, for welding
+
+
+@memoize()
+def limpet_coil(shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density):
+    """Coil numbers for one design; lengths in mm, coverage in %, density in kg/m³.
+
+    Raises ZeroDivisionError for a zero pitch.
+    """
+    # --- Limpet Coil Length & Weight ---
+    single_turn_length = (((shell_id + shell_thk*2) + (2*limpet_thk)) * math.pi) * 10**-3  # m
+
+    no_of_turns = (shell_height * (coil_coverage / 100)) / limpet_pitch
+
+    total_length = single_turn_length * no_of_turns
+
+    limpet_weight = (
+        ((shell_id + shell_thk*2) + (2*limpet_thk)) * math.pi *
+        (math.pi * limpet_od * 1.04 / 2)
+    ) * (limpet_thk * density) * 10**-9  # kg
+
+    total_limpet_weight = limpet_weight * no_of_turns
+
+    total_length_m = math.pi * shell_id * no_of_turns / 1000  # m
+    heat_transfer_area = math.pi * (limpet_od / 1000) * total_length_m  # m²
+
+    return {
+        "single_turn_length": single_turn_length,
+        "no_of_turns": no_of_turns,
+        "total_length": total_length,
+        "limpet_weight": limpet_weight,
+        "total_limpet_weight": total_limpet_weight,
+        "heat_transfer_area": heat_transfer_area,
+    }
+
+
+def limpet_coil_batch(shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density):
+    """:func:`limpet_coil` on whole columns at once (inputs broadcast).
+
+    Returns the same keys as arrays. Rows with a zero or negative pitch get
+    NaN for the turn-based results instead of raising.
+    """
+    shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density = (
+        np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+            shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density
+        )))
+    )
+    coil_dia = (shell_id + shell_thk*2) + (2*limpet_thk)
+    single_turn_length = coil_dia * np.pi * 10**-3  # m
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        no_of_turns = np.where(limpet_pitch > 0, (shell_height * (coil_coverage / 100)) / limpet_pitch, np.nan)
+
+    limpet_weight = (coil_dia * np.pi * (np.pi * limpet_od * 1.04 / 2)) * (limpet_thk * density) * 10**-9  # kg
+    total_length_m = np.pi * shell_id * no_of_turns / 1000  # m
+
+    return {
+        "single_turn_length": single_turn_length,
+        "no_of_turns": no_of_turns,
+        "total_length": single_turn_length * no_of_turns,
+        "limpet_weight": limpet_weight,
+        "total_limpet_weight": limpet_weight * no_of_turns,
+        "heat_transfer_area": np.pi * (limpet_od / 1000) * total_length_m,  # m²
+    }
+
+
+# ---------------- Helical kernel ----------------
+def helical_coil(shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density):
+    """Exact helical limpet coil on whole arrays (inputs broadcast; same units and keys as :func:`limpet_coil`).
+
+    Every turn is a helix of the given pitch, not a flat circle, on a
+    diameter that depends on the quantity:
+
+    * coil length runs along the half-pipe centre, which sits on the shell OD;
+    * weight is the half-annulus section swept along the helix through the
+      section's centroid (Pappus), which lies outside the shell OD;
+    * heat transfer area keeps :func:`limpet_coil`'s definition, π × limpet
+      OD × coil length, now over the helical length.
+
+    Rows with a zero or negative pitch get NaN for the turn-based results.
+    Also returns ``covered_area`` (m², the band of shell under the half-pipe
+    bore along the helix), ``coil_dia`` (mm) and ``helix_angle`` (degrees
+    from horizontal).
+    """
+    shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density = (
+        np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+            shell_id, shell_height, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, density
+        )))
+    )
+    shell_od = shell_id + 2 * shell_thk
+    r_o = limpet_od / 2
+    r_i = r_o - limpet_thk
+    section = np.pi / 2 * (r_o ** 2 - r_i ** 2)  # mm²
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centroid = 4 * (r_o ** 3 - r_i ** 3) / (3 * np.pi * (r_o ** 2 - r_i ** 2))  # mm out from the shell OD
+        pitch = np.where(limpet_pitch > 0, limpet_pitch, np.nan)
+        no_of_turns = (shell_height * (coil_coverage / 100)) / pitch
+
+    # mm of helix per turn along the shell OD and through the section centroid
+    turn = np.hypot(np.pi * shell_od, pitch)
+    turn_centroid = np.hypot(np.pi * (shell_od + 2 * centroid), pitch)
+
+    single_turn_length = turn * 10**-3  # m
+    limpet_weight = section * turn_centroid * density * 10**-9  # kg
+    return {
+        "single_turn_length": single_turn_length,
+        "no_of_turns": no_of_turns,
+        "total_length": single_turn_length * no_of_turns,
+        "limpet_weight": limpet_weight,
+        "total_limpet_weight": limpet_weight * no_of_turns,
+        "heat_transfer_area": np.pi * limpet_od * turn * no_of_turns * 10**-6,  # m²
+        "covered_area": 2 * r_i * turn * no_of_turns * 10**-6,  # m²
+        "coil_dia": shell_od,
+        "helix_angle": np.degrees(np.arctan2(pitch, np.pi * shell_od)),
+    }
+
+
+# ---------------- Inverse solver ----------------
+def size_limpet(required_area, shell_id, shell_height, shell_thk, density=7850.0, pitches=SIZING_PITCHES,
+                sizes=None, coverages=SIZING_COVERAGES, min_gap=MIN_GAP):
+    """Every pitch × half-pipe × coverage design with at least ``required_area`` m², lightest first.
+
+    The whole grid is one broadcast :func:`helical_coil` call. A design is
+    feasible when it reaches the area, neighbouring turns leave at least
+    ``min_gap`` mm of shell (pitch ≥ OD + gap) and it has at least one full
+    turn. ``sizes`` are ``(OD, wall)`` pairs in mm, by default the standard
+    2"–4" Sch 10S and 40 pipes from :func:`toolbox.pipes.half_pipe_sizes`.
+    Returns a DataFrame, empty when nothing on the grid is feasible.
+    """
+    import pandas as pd
+
+    if sizes is None:
+        sizes = half_pipe_sizes()
+
+    pitch = np.asarray(pitches, dtype=float)[:, None, None]
+    od, thk = (np.asarray(sizes, dtype=float).reshape(-1, 2).T[:, None, :, None])
+    coverage = np.asarray(coverages, dtype=float)[None, None, :]
+    res = helical_coil(shell_id, shell_height, shell_thk, od, thk, pitch, coverage, density)
+
+    pitch, od, thk, coverage = np.broadcast_arrays(pitch, od, thk, coverage)
+    area = res["heat_transfer_area"]
+    with np.errstate(invalid="ignore"):
+        feasible = (area >= required_area) & (pitch >= od + min_gap) & (res["no_of_turns"] >= 1)
+    idx = np.flatnonzero(feasible)
+    idx = idx[np.argsort(res["total_limpet_weight"].ravel()[idx], kind="stable")]
+
+    def pick(a):
+        return a.ravel()[idx]
+
+    return pd.DataFrame({
+        "Half-pipe OD (mm)": pick(od),
+        "Half-pipe Thk (mm)": pick(thk),
+        "Pitch (mm)": pick(pitch),
+        "Coverage (%)": pick(coverage),
+        "Number of Turns": pick(res["no_of_turns"]),
+        "Helical Coil Length (m)": pick(res["total_length"]),
+        "Total Limpet Weight (kg)": pick(res["total_limpet_weight"]),
+        "Heat Transfer Area (m²)": pick(area),
+        "Area Margin (%)": (pick(area) / required_area - 1) * 100,
+        "Covered Shell Area (m²)": pick(res["covered_area"]),
+    })
@@ -0,0 +1,116 @@
+"""Allowable stress S(material, T) from the bundled ASME II-D table."""
+import csv
+import functools
+import re
+from pathlib import Path
+
+import numpy as np
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "allowable_stress.csv"
+
+# Composite sort key = material code * _SPAN + (T - _T_OFFSET); keeps every material's
+# temperatures in one contiguous, sorted block so a single searchsorted serves all rows.
+_T_OFFSET = -300.0
+_SPAN = 10_000.0
+
+
+def normalize_spec(name):
+    """Canonical form of a material spec so "SA-516 Gr 70", "sa516-70" and "SA 516 GR.70" match."""
+    s = str(name).upper()
+    s = re.sub(r"\b(GRADE|GR|TYPE|TP)(?=[\s.\-]|\d|$)\.?", "", s)
+    return re.sub(r"[^A-Z0-9]", "", s)
+
+
+class AllowableStressTable:
+    """Sorted, preindexed S(T) table; lookups are O(log n) and fully vectorized."""
+
+    def __init__(self, materials, temps, stresses):
+        materials = np.asarray(materials, dtype=object)
+        temps = np.asarray(temps, dtype=float)
+        stresses = np.asarray(stresses, dtype=float)
+
+        self.specs = list(dict.fromkeys(materials))  # display names, file order
+        self._codes = {normalize_spec(m): i for i, m in enumerate(self.specs)}
+        code = np.array([self._codes[normalize_spec(m)] for m in materials], dtype=np.intp)
+
+        order = np.lexsort((temps, code))
+        self._code = code[order]
+        self._temp = temps[order]
+        self._stress = stresses[order]
+        self._key = self._code * _SPAN + (self._temp - _T_OFFSET)
+
+        n = len(self.specs)
+        self._start = np.searchsorted(self._code, np.arange(n), side="left")
+        self._end = np.searchsorted(self._code, np.arange(n), side="right")
+        self._tmin = self._temp[self._start]
+        self._tmax = self._temp[self._end - 1]
+
+    @classmethod
+    def from_csv(cls, path):
+        materials, temps, stresses = [], [], []
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = csv.DictReader(line for line in f if not line.startswith("#"))
+            for row in rows:
+                materials.append(row["material"].strip())
+                temps.append(float(row["temp_c"]))
+                stresses.append(float(row["stress_mpa"]))
+        return cls(materials, temps, stresses)
+
+    def __contains__(self, material):
+        return normalize_spec(material) in self._codes
+
+    def codes(self, material):
+        """Integer code per material name (-1 when the spec is not in the table)."""
+        import pandas as pd
+
+        names = np.asarray(material, dtype=object)
+        inverse, uniques = pd.factorize(names.ravel(), use_na_sentinel=False)
+        mapped = np.array([self._codes.get(normalize_spec(u), -1) for u in uniques], dtype=np.intp)
+        return mapped[inverse].reshape(names.shape)
+
+    def temperature_range(self, material):
+        i = self._codes.get(normalize_spec(material))
+        if i is None:
+            return None
+        return float(self._tmin[i]), float(self._tmax[i])
+
+    def lookup(self, material, T):
+        """Allowable stress (MPa) linearly interpolated over temperature (°C).
+
+        ``material`` and ``T`` broadcast against each other. Unknown specs and
+        temperatures above the last tabulated value give NaN; temperatures
+        below the first tabulated value use the first value.
+        """
+        return self.lookup_codes(self.codes(material), T)
+
+    def lookup_codes(self, code, T):
+        """Same as :meth:`lookup` for material codes already resolved with :meth:`codes`."""
+        code = np.asarray(code, dtype=np.intp)
+        T = np.asarray(T, dtype=float)
+        code, T = np.broadcast_arrays(code, T)
+
+        valid = (code >= 0) & np.isfinite(T)
+        c = np.where(valid, code, 0)
+        Tq = np.maximum(T, self._tmin[c])
+
+        i = np.searchsorted(self._key, c * _SPAN + (Tq - _T_OFFSET), side="right") - 1
+        i = np.clip(i, self._start[c], self._end[c] - 1)
+        j = np.minimum(i + 1, self._end[c] - 1)
+
+        t0, t1 = self._temp[i], self._temp[j]
+        s0, s1 = self._stress[i], self._stress[j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = np.where(t1 > t0, (Tq - t0) / (t1 - t0), 0.0)
+        S = s0 + w * (s1 - s0)
+        return np.where(valid & (Tq <= self._tmax[c]), S, np.nan)
+
+
+@functools.lru_cache(maxsize=None)
+def load_allowable_stress(path=DATA_FILE):
+    """Parse the table once per process; later calls return the same indexed object."""
+    return AllowableStressTable.from_csv(path)
+
+
+def allowable_stress(material, T):
+    """S (MPa) for material spec(s) at design temperature(s) T (°C); NaN where undefined."""
+    return load_allowable_stress().lookup(material, T)
@@ -0,0 +1,287 @@
+"""Lightweight per-page instrumentation: phase timers, counters and gauges.
+
+Enable with ``TOOLBOX_METRICS=1``. While disabled, :func:`start_rerun` hands
+back a shared no-op object, so an instrumented page pays one attribute
+lookup and a ``with`` on ``contextlib.nullcontext`` per phase.
+
+While enabled:
+
+* each page rerun records its total time and the time spent in named phases
+  (``parse``, ``kernel``, ``frame``, ``render``, ...) into histograms;
+* counters track reruns, calculations and errors per page, and a gauge
+  holds the latest session_state size;
+* fragment-only reruns (``st.fragment``) are timed on their own, labelled
+  with the fragment name;
+* a daemon thread rewrites a Prometheus text-format file
+  (``TOOLBOX_METRICS_FILE``) every ``TOOLBOX_METRICS_INTERVAL`` seconds, for
+  node_exporter's textfile collector or a quick ``cat``;
+* every rerun appends one JSON line to a size-rotated log
+  (``TOOLBOX_METRICS_LOG``).
+"""
+import contextlib
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+_STATE_DIR = Path(__file__).resolve().parent.parent / ".toolbox"
+
+ENABLED = os.environ.get("TOOLBOX_METRICS", "").lower() not in ("", "0", "false", "no")
+METRICS_FILE = Path(os.environ.get("TOOLBOX_METRICS_FILE", _STATE_DIR / "metrics.prom"))
+LOG_FILE = Path(os.environ.get("TOOLBOX_METRICS_LOG", _STATE_DIR / "metrics.log"))
+INTERVAL = float(os.environ.get("TOOLBOX_METRICS_INTERVAL", 15))
+
+# Histogram bucket upper bounds (seconds)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def approx_size(obj, seen=None):
+    """Approximate bytes held by ``obj`` (containers, NumPy arrays, frames, objects with ``__dict__``)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    np = sys.modules.get("numpy")  # no arrays to size if NumPy was never imported
+    if np is not None and isinstance(obj, np.ndarray):
+        size = obj.nbytes
+        if obj.dtype == object:
+            size += sum(approx_size(v, seen) for v in obj.ravel())
+        return size
+    if hasattr(obj, "memory_usage") and hasattr(obj, "iloc"):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(approx_size(k, seen) + approx_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(approx_size(v, seen) for v in obj)
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return sys.getsizeof(obj) + approx_size(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Thread-safe store of counters, gauges and histograms keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name, labels, n=1):
+        with self._lock:
+            self.counters[name, labels] = self.counters.get((name, labels), 0) + n
+
+    def set(self, name, labels, value):
+        with self._lock:
+            self.gauges[name, labels] = value
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            hist = self.histograms.get((name, labels))
+            if hist is None:
+                hist = self.histograms[name, labels] = _Histogram()
+            hist.observe(value)
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    def render(self):
+        """Prometheus text exposition format."""
+        def fmt(labels, extra=()):
+            pairs = [*labels, *extra]
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+        lines = []
+        with self._lock:
+            for kind, store in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({n for n, _ in store}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for (n, labels), value in sorted(store.items()):
+                        if n == name:
+                            lines.append(f"{name}{fmt(labels)} {value}")
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), hist in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip((*BUCKETS, "+Inf"), hist.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{fmt(labels, (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{fmt(labels)} {hist.sum:.6f}")
+                    lines.append(f"{name}_count{fmt(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+
+
+# ---------------- Page reruns ----------------
+class PageRun:
+    """Timings and counters for one script run of one page, or of one fragment with ``fragment`` set."""
+
+    def __init__(self, page, fragment=None):
+        self.page = page
+        self.fragment = fragment
+        self.labels = (("page", page),)
+        self.run_labels = self.labels if fragment is None else (*self.labels, ("fragment", fragment))
+        self._kind = "page" if fragment is None else "fragment"
+        self.phases = {}
+        self.counts = {}
+        self.finished = False
+        self._start = time.perf_counter()
+        REGISTRY.inc(f"toolbox_{self._kind}_reruns_total", self.run_labels)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            REGISTRY.observe("toolbox_page_phase_seconds", (*self.labels, ("phase", name)), elapsed)
+
+    def count(self, name, n=1):
+        """Bump ``toolbox_page_<name>_total`` (e.g. ``calculations``, ``errors``)."""
+        self.counts[name] = self.counts.get(name, 0) + n
+        REGISTRY.inc(f"toolbox_page_{name}_total", self.labels, n)
+
+    def finish(self, session_bytes=None):
+        self.finished = True
+        total = time.perf_counter() - self._start
+        REGISTRY.observe(f"toolbox_{self._kind}_rerun_seconds", self.run_labels, total)
+        if session_bytes is not None:
+            REGISTRY.set("toolbox_session_state_bytes", self.labels, session_bytes)
+        _log({
+            "ts": round(time.time(), 3),
+            "page": self.page,
+            "fragment": self.fragment,
+            "total_ms": round(total * 1e3, 3),
+            "phases_ms": {k: round(v * 1e3, 3) for k, v in self.phases.items()},
+            "counts": self.counts,
+            "session_bytes": session_bytes,
+        })
+
+
+class _NullRun:
+    """Stand-in for :class:`PageRun` while metrics are disabled."""
+
+    __slots__ = ()
+    _null = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._null
+
+    def count(self, name, n=1):
+        pass
+
+    def finish(self, session_bytes=None):
+        pass
+
+
+_NULL_RUN = _NullRun()
+
+
+def start_rerun(page):
+    """Begin instrumenting one script run of ``page``; call ``finish()`` at the end of the script."""
+    if not ENABLED:
+        return _NULL_RUN
+    _ensure_exporter()
+    return PageRun(page)
+
+
+@contextlib.contextmanager
+def fragment_run(run, name):
+    """Time a fragment body and yield the run its phases and counters belong to.
+
+    During a full run that is ``run`` itself (the body is its phase
+    ``name``); once ``run`` has finished, i.e. on a fragment-only rerun, it
+    is a fresh :class:`PageRun` for the fragment, finished when the body ends.
+    """
+    if not isinstance(run, PageRun):
+        yield run
+    elif not run.finished:
+        with run.phase(name):
+            yield run
+    else:
+        frag = PageRun(run.page, fragment=name)
+        try:
+            yield frag
+        finally:
+            frag.finish()
+
+
+# ---------------- Export ----------------
+_logger = None
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def _log(record):
+    if _logger is not None:
+        _logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def write_textfile(path=METRICS_FILE):
+    """Atomically rewrite the Prometheus text file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(REGISTRY.render(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _export_loop():
+    while True:
+        time.sleep(INTERVAL)
+        try:
+            write_textfile()
+        except OSError:
+            pass
+
+
+def _ensure_exporter():
+    global _logger, _exporter
+    if _exporter is not None:
+        return
+    with _exporter_lock:
+        if _exporter is not None:
+            return
+        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        logger = logging.getLogger("toolbox.metrics")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=5 * 2**20, backupCount=3, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        _logger = logger
+        _exporter = threading.Thread(target=_export_loop, name="metrics-exporter", daemon=True)
+        _exporter.start()
@@ -0,0 +1,211 @@
+"""Durable, non-blocking delivery of contact form messages.
+
+:meth:`Outbox.enqueue` writes the message into a local SQLite outbox and
+returns at once. A background worker posts due messages to the form
+endpoint. It uses one pooled ``requests.Session``, timeouts on every
+request, and exponential backoff with jitter between attempts. Each
+wake-up takes a batch of due messages and writes their results back in a
+single transaction. Messages survive restarts: whatever is still pending
+when the process starts is picked up again.
+
+The endpoint comes from ``TOOLBOX_CONTACT_URL``, so tests can point it at a
+local stub HTTP server.
+"""
+import functools
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+DEFAULT_URL = os.environ.get("TOOLBOX_CONTACT_URL", "https://formspree.io/f/movlzpvz")
+DEFAULT_DB = Path(os.environ.get(
+    "TOOLBOX_OUTBOX_DB", Path(__file__).resolve().parent.parent / ".toolbox" / "outbox.sqlite3"
+))
+
+PENDING, SENT, FAILED = "pending", "sent", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id         INTEGER PRIMARY KEY,
+    created    REAL NOT NULL,
+    payload    TEXT NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    next_try   REAL NOT NULL,
+    last_error TEXT,
+    sent_at    REAL
+);
+CREATE INDEX IF NOT EXISTS ix_outbox_status_next ON outbox (status, next_try);
+"""
+
+
+def backoff_delay(attempts, base=2.0, cap=600.0):
+    """Seconds to wait before retry number ``attempts`` (full jitter, capped)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempts - 1)))
+
+
+class Outbox:
+    """SQLite-backed outbox drained by one daemon worker thread."""
+
+    def __init__(self, path=DEFAULT_DB, url=DEFAULT_URL, batch_size=20, poll_interval=5.0,
+                 connect_timeout=3.05, read_timeout=10.0, max_attempts=8, backoff_base=2.0,
+                 backoff_cap=600.0, pool_size=4):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.url = url
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.pool_size = pool_size
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._busy = False
+        self._session = None
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._worker = threading.Thread(target=self._run, name="contact-outbox", daemon=True)
+        self._worker.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ---------------- Producer side ----------------
+    def enqueue(self, payload):
+        """Store one message for delivery and wake the worker; returns the message id."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cur = conn.execute(
+                "INSERT INTO outbox (created, payload, next_try) VALUES (?, ?, ?)",
+                (now, json.dumps(payload, ensure_ascii=False), now),
+            )
+        self._wake.set()
+        return cur.lastrowid
+
+    def status(self, message_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT status FROM outbox WHERE id = ?", (message_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def stats(self):
+        """Message counts by status."""
+        with closing(self._connect()) as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status"))
+        return {s: counts.get(s, 0) for s in (PENDING, SENT, FAILED)}
+
+    # ---------------- Worker side ----------------
+    def _http(self):
+        # Imported here so pages that never send a message don't pay for requests
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["Accept"] = "application/json"
+            self._session = session
+        return self._session
+
+    def _deliver(self, payload):
+        """(delivered, retryable, error) for one POST."""
+        import requests
+
+        try:
+            response = self._http().post(self.url, data=payload, timeout=self.timeout)
+        except requests.RequestException as exc:
+            return False, True, f"{type(exc).__name__}: {exc}"
+        if response.status_code < 300:
+            return True, False, None
+        # Throttling and server errors are worth retrying; other 4xx will never succeed
+        retryable = response.status_code == 429 or response.status_code >= 500
+        return False, retryable, f"HTTP {response.status_code}"
+
+    def _due(self, conn, now):
+        return conn.execute(
+            "SELECT id, payload, attempts FROM outbox WHERE status = ? AND next_try <= ? "
+            "ORDER BY next_try LIMIT ?",
+            (PENDING, now, self.batch_size),
+        ).fetchall()
+
+    def _flush_batch(self, conn):
+        batch = self._due(conn, time.time())
+        updates = []
+        for message_id, payload, attempts in batch:
+            attempts += 1
+            delivered, retryable, error = self._deliver(json.loads(payload))
+            now = time.time()
+            if delivered:
+                updates.append((SENT, attempts, now, None, now, message_id))
+            elif retryable and attempts < self.max_attempts:
+                delay = backoff_delay(attempts, self.backoff_base, self.backoff_cap)
+                updates.append((PENDING, attempts, now + delay, error, None, message_id))
+            else:
+                updates.append((FAILED, attempts, now, error, None, message_id))
+        if updates:
+            with conn:
+                conn.executemany(
+                    "UPDATE outbox SET status = ?, attempts = ?, next_try = ?, last_error = ?, sent_at = ? "
+                    "WHERE id = ?",
+                    updates,
+                )
+        return len(batch)
+
+    def _next_wait(self, conn):
+        row = conn.execute("SELECT MIN(next_try) FROM outbox WHERE status = ?", (PENDING,)).fetchone()
+        if row[0] is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(0.0, row[0] - time.time()))
+
+    def _run(self):
+        conn = self._connect()
+        while True:
+            with self._idle:
+                self._busy = True
+            try:
+                while self._flush_batch(conn) == self.batch_size:
+                    pass
+                wait = self._next_wait(conn)
+            except sqlite3.Error:
+                wait = self.poll_interval
+            with self._idle:
+                self._busy = False
+                self._idle.notify_all()
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def drain(self, timeout=30.0):
+        """Wait until no message is due right now (tests, scripts, shutdown).
+
+        Returns ``True`` if the outbox drained within ``timeout``. Messages
+        waiting out a backoff delay don't count as due.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self._wake.set()
+            with self._idle:
+                self._idle.wait(0.05)
+                if self._busy:
+                    continue
+            with closing(self._connect()) as conn:
+                if not self._due(conn, time.time()):
+                    return True
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def get_outbox(path=DEFAULT_DB, url=DEFAULT_URL):
+    """The process-wide outbox (one worker thread per database file)."""
+    return Outbox(path, url)
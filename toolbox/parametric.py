@@ -0,0 +1,316 @@
+"""Multi-core parametric studies: a full factorial grid through a vectorized kernel.
+
+    result = run_study("limpet", {"shell_id": np.linspace(800, 4000, 65), "limpet_pitch": [80, 100, 120], ...},
+                       workers=8, progress=lambda done, total: ...)
+
+The grid is never materialized. Cells are numbered in C order over the
+axes, and the parent only hands out ``[lo, hi)`` ranges of cell numbers.
+Each worker rebuilds its inputs from the axes with ``np.unravel_index``, runs
+the kernel a block at a time, and writes the outputs straight into one
+``multiprocessing.shared_memory`` segment laid out as ``(outputs, cells)``.
+Only cell counts travel back through the pool, so per-task overhead does
+not grow with the result size, and the work scales with the cores. The
+result array is that same segment, never copied.
+
+Cancellation is a flag word at the start of the same segment. The parent
+sets it when ``cancel`` is set or when it is interrupted (for example by a
+Streamlit rerun), and workers check it between blocks.
+
+Workers come from one ``spawn`` pool that is kept for the life of the
+process (spawn is safe next to the Streamlit server threads; keeping the
+pool means only the first study pays the interpreter start-up).
+"""
+import contextlib
+import math
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
+
+import numpy as np
+
+from toolbox import ug27
+from toolbox.dish import calculate_ellipsoidal_dish, calculate_torispherical_dish
+from toolbox.hx import tube_area
+from toolbox.limpet import limpet_coil_batch
+
+BLOCK = 65_536  # cells per kernel call inside a task: keeps the temporaries cache-sized
+_HEADER = 8  # bytes before the result array: the int64 cancel flag
+
+
+class StudyCancelled(Exception):
+    """Raised by :func:`run_study` when it was cancelled before every cell was computed."""
+
+
+# ---------------- Kernels ----------------
+@dataclass(frozen=True)
+class StudyKernel:
+    name: str
+    description: str
+    inputs: tuple
+    outputs: tuple
+    fn: Callable  # keyword arrays (broadcastable) → {output: array}
+
+
+def _ug27(**kw):
+    res = ug27.calculate_batch(**kw)
+    return {**res, "status": res["status"].astype(float)}
+
+
+def _dish(tank_id_mm, sf_mm, dish_thk_mm):
+    _, _, tori_blank, tori_height, tori_volume = calculate_torispherical_dish(tank_id_mm, sf_mm, dish_thk_mm)
+    _, ellip_blank, ellip_height, ellip_volume = calculate_ellipsoidal_dish(tank_id_mm, sf_mm, dish_thk_mm)
+    return {
+        "tori_blank_dia": tori_blank, "tori_height": tori_height, "tori_volume_m3": tori_volume,
+        "ellip_blank_dia": ellip_blank, "ellip_height": ellip_height, "ellip_volume_m3": ellip_volume,
+    }
+
+
+def _hx_area(tube_dia_mm, tube_length_m, no_of_tubes):
+    return {"area_m2": tube_area(tube_dia_mm, tube_length_m, no_of_tubes)}
+
+
+KERNELS = {k.name: k for k in (
+    StudyKernel("ug27", "ASME UG-27 shell check (status: 0 OK, 1 not enough, ≥2 invalid)",
+                tuple(ug27.INPUT_COLUMNS), ("tc", "R", "t_req", "t_total_req", "MAWP", "status"), _ug27),
+    StudyKernel("dish", "Torispherical and 2:1 ellipsoidal dish ends",
+                ("tank_id_mm", "sf_mm", "dish_thk_mm"),
+                ("tori_blank_dia", "tori_height", "tori_volume_m3", "ellip_blank_dia", "ellip_height",
+                 "ellip_volume_m3"), _dish),
+    StudyKernel("limpet", "Limpet coil length, weight and heat transfer area",
+                ("shell_id", "shell_height", "shell_thk", "limpet_od", "limpet_thk", "limpet_pitch",
+                 "coil_coverage", "density"),
+                ("single_turn_length", "no_of_turns", "total_length", "limpet_weight", "total_limpet_weight",
+                 "heat_transfer_area"), limpet_coil_batch),
+    StudyKernel("hx_area", "Tube bundle heat transfer area", ("tube_dia_mm", "tube_length_m", "no_of_tubes"),
+                ("area_m2",), _hx_area),
+)}
+
+
+def get_kernel(name):
+    try:
+        return KERNELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown study kernel {name!r}; choose from {', '.join(KERNELS)}") from None
+
+
+# ---------------- Worker side ----------------
+def _views(shm, n_outputs, cells):
+    flag = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+    out = np.ndarray((n_outputs, cells), dtype=np.float64, buffer=shm.buf, offset=_HEADER)
+    return flag, out
+
+
+def _run_range(kernel_name, axes, shm_name, lo, hi, block=BLOCK):
+    """Compute cells ``[lo, hi)`` into the shared segment; returns how many were written."""
+    kernel = KERNELS[kernel_name]
+    shape = tuple(axis.size for axis in axes.values())
+    cells = math.prod(shape)
+    shm = SharedMemory(name=shm_name)
+    flag, out = _views(shm, len(kernel.outputs), cells)
+    try:
+        for start in range(lo, hi, block):
+            if flag[0]:
+                return start - lo
+            stop = min(hi, start + block)
+            index = np.unravel_index(np.arange(start, stop), shape)
+            # Single-value axes go in as scalars and broadcast for free
+            inputs = {name: axis[0] if axis.size == 1 else axis[i] for (name, axis), i in zip(axes.items(), index)}
+            res = kernel.fn(**inputs)
+            for row, key in enumerate(kernel.outputs):
+                out[row, start:stop] = res[key]
+        return hi - lo
+    finally:
+        del flag, out
+        shm.close()
+
+
+# ---------------- Pool ----------------
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _bare_main():
+    # Streamlit runs a page as a stand-in ``__main__`` module whose ``__file__``
+    # is the page, and spawn re-imports ``__main__.__file__`` in every child:
+    # each worker would run the whole page. Workers only need this module, so
+    # they are started while ``__main__`` has no file.
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(workers, mp_context=get_context("spawn"))
+            _pool_workers = workers
+            # Start every worker now (one per submit while none is idle), not lazily inside a study
+            with _bare_main():
+                started = [_pool.submit(os.getpid) for _ in range(workers)]
+            wait(started)
+        return _pool
+
+
+def _drop_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool():
+    """Stop the worker processes (they are started again on the next multi-worker study)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def default_workers():
+    """Cores this process may run on."""
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+# ---------------- Driver ----------------
+@dataclass
+class StudyResult:
+    """Outputs of every grid cell: ``values[j]`` is output ``kernel.outputs[j]`` in cell order.
+
+    ``values`` is a view of the shared segment the workers wrote (no copy);
+    the segment is released with the result.
+    """
+
+    kernel: StudyKernel
+    axes: dict
+    values: np.ndarray
+    seconds: float
+    workers: int
+    _shm: SharedMemory = field(default=None, repr=False)
+
+    @property
+    def shape(self):
+        return tuple(axis.size for axis in self.axes.values())
+
+    @property
+    def cells(self):
+        return self.values.shape[1]
+
+    def output(self, name):
+        """Output ``name`` as an array shaped like the grid (one axis per input)."""
+        return self.values[self.kernel.outputs.index(name)].reshape(self.shape)
+
+    def frame(self, cells=None):
+        """DataFrame of inputs and outputs for flat cell numbers ``cells`` (default: all)."""
+        import pandas as pd
+
+        cells = np.arange(self.cells) if cells is None else np.asarray(cells, dtype=np.intp)
+        index = np.unravel_index(cells, self.shape)
+        data = {name: axis[i] for (name, axis), i in zip(self.axes.items(), index)}
+        data.update({name: self.values[j, cells] for j, name in enumerate(self.kernel.outputs)})
+        return pd.DataFrame(data)
+
+    def best(self, output, n=100, largest=False, where=None):
+        """The ``n`` cells with the smallest (or largest) finite ``output``, as a frame.
+
+        ``where`` is an optional boolean mask over cells (e.g. only passing
+        UG-27 designs).
+        """
+        values = self.values[self.kernel.outputs.index(output)]
+        keep = np.isfinite(values) if where is None else np.isfinite(values) & where
+        candidates = np.flatnonzero(keep)
+        key = -values[candidates] if largest else values[candidates]
+        if candidates.size > n:
+            part = np.argpartition(key, n)[:n]
+            candidates, key = candidates[part], key[part]
+        return self.frame(candidates[np.argsort(key, kind="stable")])
+
+
+def _partition(cells, workers, min_task=BLOCK, max_task=4 * 2**20):
+    # Several tasks per worker so a slow one doesn't leave the others idle, and progress moves smoothly
+    size = int(min(max_task, max(min_task, math.ceil(cells / (workers * 8)))))
+    return [(lo, min(cells, lo + size)) for lo in range(0, cells, size)]
+
+
+def run_study(kernel, axes, workers=None, progress=None, cancel=None):
+    """Evaluate ``kernel`` on every combination of ``axes``; returns a :class:`StudyResult`.
+
+    ``axes`` maps each kernel input to a value or a 1-D sequence of values.
+    With ``workers=1`` the grid runs in this process; otherwise it is split
+    across the shared pool (``workers=None`` uses every available core).
+    ``progress(done, cells)`` is called as ranges finish; ``cancel`` is
+    anything with ``is_set()`` (e.g. a ``threading.Event``). Raises
+    :class:`StudyCancelled` when cancelled.
+    """
+    kernel = get_kernel(kernel) if isinstance(kernel, str) else kernel
+    missing = [name for name in kernel.inputs if name not in axes]
+    if missing:
+        raise ValueError(f"Missing axis/axes: {', '.join(missing)}")
+    axes = {name: np.atleast_1d(np.asarray(axes[name], dtype=float)).ravel() for name in kernel.inputs}
+    if any(axis.size == 0 for axis in axes.values()):
+        raise ValueError("Every axis needs at least one value")
+    workers = max(1, int(workers or default_workers()))
+    cells = math.prod(axis.size for axis in axes.values())
+    n_outputs = len(kernel.outputs)
+
+    start = time.perf_counter()
+    shm = SharedMemory(create=True, size=_HEADER + 8 * n_outputs * cells)
+    flag, out = _views(shm, n_outputs, cells)
+    flag[0] = 0
+    futures = ()
+    finished = False
+    try:
+        done = 0
+        ranges = _partition(cells, workers)
+        if workers == 1:
+            for lo, hi in ranges:
+                if cancel is not None and cancel.is_set():
+                    raise StudyCancelled(f"cancelled after {done} of {cells} cells")
+                done += _run_range(kernel.name, axes, shm.name, lo, hi)
+                if progress is not None:
+                    progress(done, cells)
+        else:
+            pool = _get_pool(workers)
+            try:
+                futures = [pool.submit(_run_range, kernel.name, axes, shm.name, lo, hi) for lo, hi in ranges]
+                pending = set(futures)
+                while pending:
+                    ready, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    done += sum(f.result() for f in ready)
+                    if cancel is not None and cancel.is_set():
+                        raise StudyCancelled(f"cancelled after {done} of {cells} cells")
+                    if ready and progress is not None:
+                        progress(done, cells)
+            except BrokenProcessPool:
+                _drop_pool(pool)
+                raise
+        finished = True
+    finally:
+        if not finished:
+            flag[0] = 1  # ranges still running stop at their next block
+            for f in futures:
+                f.cancel()
+            wait(futures)  # nobody may attach after the unlink below
+        # The name goes now; the mapping lives on in the result until it is garbage collected
+        shm.unlink()
+        if not finished:
+            del flag, out
+            shm.close()
+    return StudyResult(kernel, axes, out, time.perf_counter() - start, workers, shm)
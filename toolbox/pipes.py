@@ -0,0 +1,118 @@
+"""Standard pipe (NPS × schedule) and heat exchanger tube (OD × BWG) sizes from the bundled table."""
+import csv
+import functools
+from pathlib import Path
+
+import numpy as np
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "pipe_schedule.csv"
+
+KINDS = ("pipe", "tube")
+
+# Composite sort key = OD rank * _SPAN + wall; keeps each kind's walls for one OD in a
+# contiguous, sorted block so a single searchsorted finds the nearest wall for every row.
+_SPAN = 1_000.0
+
+
+class PipeCatalogue:
+    """Sizes of one kind sorted by (OD, wall); lookups are O(log n) and vectorized.
+
+    Row indices returned by the lookups index :attr:`od`, :attr:`wall`,
+    :attr:`size` and :attr:`schedule`.
+    """
+
+    def __init__(self, kind, sizes, ods, schedules, walls):
+        ods = np.asarray(ods, dtype=float)
+        walls = np.asarray(walls, dtype=float)
+        order = np.lexsort((walls, ods))
+
+        self.kind = kind
+        self.od = ods[order]
+        self.wall = walls[order]
+        self.id = self.od - 2 * self.wall
+        self.size = np.asarray(sizes, dtype=object)[order]
+        self.schedule = np.asarray(schedules, dtype=object)[order]
+
+        self.ods, rank = np.unique(self.od, return_inverse=True)  # distinct ODs, ascending
+        self._key = rank * _SPAN + self.wall
+        self._start = np.searchsorted(rank, np.arange(self.ods.size), side="left")
+        self._end = np.searchsorted(rank, np.arange(self.ods.size), side="right")
+
+    def __len__(self):
+        return self.od.size
+
+    def schedules(self):
+        """Schedule / gauge names in the order they first appear."""
+        return list(dict.fromkeys(self.schedule))
+
+    def nearest_od(self, od):
+        """The standard OD(s) closest to ``od`` (ties go to the larger size)."""
+        return self.ods[self._nearest_rank(od)]
+
+    def _nearest_rank(self, od):
+        od = np.asarray(od, dtype=float)
+        i = np.clip(np.searchsorted(self.ods, od), 1, self.ods.size - 1)
+        lo, hi = self.ods[i - 1], self.ods[i]
+        return np.where(od - lo < hi - od, i - 1, i)
+
+    def nearest(self, od, wall=None):
+        """Row index of the closest size: nearest OD, then the nearest wall at that OD.
+
+        Without ``wall`` the thinnest wall at that OD is taken; wall ties go
+        to the thinner one. ``od`` and ``wall`` broadcast.
+        """
+        rank = self._nearest_rank(od)
+        if wall is None:
+            return self._start[rank]
+        rank, wall = np.broadcast_arrays(rank, np.asarray(wall, dtype=float))
+        start, end = self._start[rank], self._end[rank]
+        i = np.clip(np.searchsorted(self._key, rank * _SPAN + wall), start, end - 1)  # first wall ≥ the query
+        below = np.maximum(i - 1, start)
+        return np.where(np.abs(self.wall[below] - wall) <= np.abs(self.wall[i] - wall), below, i)
+
+    def between(self, od_min=-np.inf, od_max=np.inf, schedules=None):
+        """Row indices with ``od_min ≤ OD ≤ od_max`` (sorted by OD, then wall), optionally only some schedules."""
+        rows = np.arange(np.searchsorted(self.od, od_min, side="left"), np.searchsorted(self.od, od_max, side="right"))
+        if schedules is not None:
+            rows = rows[np.isin(self.schedule[rows], list(schedules))]
+        return rows
+
+    def sizes(self, rows):
+        """``(OD, wall)`` pairs of ``rows``, e.g. the ``sizes`` of :func:`toolbox.limpet.size_limpet`."""
+        return np.column_stack([self.od[rows], self.wall[rows]])
+
+    def label(self, row):
+        if self.kind == "pipe":
+            return f'{self.size[row]} Sch {self.schedule[row]} ({self.od[row]:g} × {self.wall[row]:g})'
+        return f'{self.od[row]:g} mm ({self.size[row]}) {self.schedule[row]} ({self.wall[row]:g} wall)'
+
+    def frame(self, rows=None):
+        import pandas as pd
+
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        return pd.DataFrame({
+            "Size": self.size[rows], "Schedule": self.schedule[rows], "OD (mm)": self.od[rows],
+            "Wall (mm)": self.wall[rows], "ID (mm)": self.id[rows],
+        })
+
+
+@functools.lru_cache(maxsize=None)
+def load_catalogue(kind="pipe", path=DATA_FILE):
+    """Parse the table once per process per kind; later calls return the same indexed object."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind {kind!r}; choose from {', '.join(KINDS)}")
+    sizes, ods, schedules, walls = [], [], [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(line for line in f if not line.startswith("#")):
+            if row["kind"].strip() == kind:
+                sizes.append(row["size"].strip())
+                ods.append(float(row["od_mm"]))
+                schedules.append(row["schedule"].strip())
+                walls.append(float(row["wall_mm"]))
+    return PipeCatalogue(kind, sizes, ods, schedules, walls)
+
+
+def half_pipe_sizes(od_min=60.0, od_max=115.0, schedules=("10S", "40")):
+    """``(OD, wall)`` of the standard pipes a limpet half-pipe can be cut from (default 2"–4", Sch 10S and 40)."""
+    pipes = load_catalogue("pipe")
+    return pipes.sizes(pipes.between(od_min, od_max, schedules))
@@ -0,0 +1,135 @@
+"""Streaming (online) statistics: fixed memory however many values are pushed through.
+
+Both accumulators take whole NumPy chunks, so the per-value work stays
+vectorized; merging is exact for the moments and counts, and percentiles
+read off the histogram are accurate to one bin width.
+"""
+import numpy as np
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream of chunks (Chan et al. pairwise update)."""
+
+    __slots__ = ("n", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Add a chunk; NaN and ±inf are ignored."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        n_b = values.size
+        if n_b == 0:
+            return
+        mean_b = float(values.mean())
+        m2_b = float(np.square(values - mean_b).sum())
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self._m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def var(self):
+        """Sample variance (NaN below two values)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.var))
+
+
+class StreamingHistogram:
+    """Fixed-bin histogram over ``[lo, hi)`` with under/overflow counts and exact min/max.
+
+    :meth:`percentile` interpolates within a bin. Values outside the range
+    land in one extra bin on each side, spanning to the exact min or max, so
+    tails stay bounded even when the range was guessed too narrow.
+    """
+
+    def __init__(self, lo, hi, bins=512):
+        if not hi > lo:
+            raise ValueError("hi must be greater than lo")
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def lo(self):
+        return float(self.edges[0])
+
+    @property
+    def hi(self):
+        return float(self.edges[-1])
+
+    @property
+    def n(self):
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    @property
+    def bin_width(self):
+        return float(self.edges[1] - self.edges[0])
+
+    def update(self, values):
+        """Add a chunk; NaN and ±inf are ignored."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        bins = self.counts.size
+        idx = np.floor((values - self.lo) / self.bin_width).astype(np.int64)
+        self.underflow += int((idx < 0).sum())
+        self.overflow += int((idx >= bins).sum())
+        inside = idx[(idx >= 0) & (idx < bins)]
+        self.counts += np.bincount(inside, minlength=bins)
+
+    @classmethod
+    def around(cls, values, bins=512, pad=0.25):
+        """Histogram whose range is the span of a pilot chunk ``values``, widened by ``pad`` of it each side."""
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            lo, hi = 0.0, 1.0
+        else:
+            lo, hi = float(values.min()), float(values.max())
+        span = hi - lo or max(abs(lo) * 0.01, 1e-9)
+        return cls(lo - pad * span, hi + pad * span, bins)
+
+    def percentile(self, q):
+        """Approximate percentile(s) ``q`` (0–100) of everything pushed so far."""
+        q = np.asarray(q, dtype=float)
+        n = self.n
+        if n == 0:
+            return np.full(q.shape, np.nan)
+        # Outer bins reach to the exact extremes seen
+        edges = np.concatenate(([min(self.min, self.lo)], self.edges, [max(self.max, self.hi)]))
+        counts = np.concatenate(([self.underflow], self.counts, [self.overflow]))
+        cum = np.concatenate(([0], np.cumsum(counts)))
+        target = np.clip(q / 100.0, 0.0, 1.0) * n
+        i = np.clip(np.searchsorted(cum, target, side="left") - 1, 0, counts.size - 1)
+        inside = np.divide(target - cum[i], counts[i], out=np.zeros_like(target), where=counts[i] > 0)
+        return np.clip(edges[i] + inside * (edges[i + 1] - edges[i]), self.min, self.max)
+
+    def coarse(self, bins=50):
+        """``(edges, counts)`` merged down to about ``bins`` bins for plotting (under/overflow left out)."""
+        step = max(1, self.counts.size // bins)
+        usable = self.counts.size - self.counts.size % step
+        counts = self.counts[:usable].reshape(-1, step).sum(axis=1)
+        if usable < self.counts.size:
+            counts = np.append(counts, self.counts[usable:].sum())
+        edges = self.edges[::step]
+        if usable < self.counts.size:
+            edges = np.append(edges, self.edges[-1])
+        return edges, counts
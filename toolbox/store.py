@@ -0,0 +1,184 @@
+"""Persistent calculation history in a local SQLite database.
+
+Pages hand rows to :meth:`HistoryStore.record`, which only puts them on an
+in-memory queue. A single background writer thread drains the queue and
+inserts rows in batched transactions. The Streamlit script thread never
+waits on disk I/O, and many sessions share one writer instead of fighting
+over the database lock. The database runs in WAL mode, so readers (search
+and pagination) are not blocked by the writer.
+"""
+import functools
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+
+from toolbox import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = Path(os.environ.get(
+    "TOOLBOX_DB", Path(__file__).resolve().parent.parent / ".toolbox" / "history.sqlite3"
+))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calculations (
+    id      INTEGER PRIMARY KEY,
+    page    TEXT NOT NULL,
+    ts      REAL NOT NULL,
+    session TEXT,
+    key     TEXT,
+    row     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_calculations_page_ts ON calculations (page, ts);
+CREATE INDEX IF NOT EXISTS ix_calculations_ts ON calculations (ts);
+CREATE INDEX IF NOT EXISTS ix_calculations_page_key ON calculations (page, key);
+"""
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _escape_like(text):
+    # Match % and _ literally in a LIKE pattern
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def make_key(row, fields):
+    """Searchable summary of a row's key inputs, e.g. ``"Do=1016|t=12"``."""
+    parts = []
+    for f in fields:
+        value = row.get(f)
+        parts.append(f"{f}={value:g}" if isinstance(value, (int, float)) else f"{f}={value}")
+    return "|".join(parts)
+
+
+class HistoryStore:
+    """Queue-fed, batched SQLite writer plus indexed, paginated search."""
+
+    def __init__(self, path=DEFAULT_DB, batch_size=200, flush_interval=0.5, max_queue=10_000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0  # rows discarded because the queue was full
+        self.failed = 0  # rows lost because their batch failed to insert
+        self._queue = queue.Queue(maxsize=max_queue)
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="history-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _query(self, sql, params=()):
+        # A connection per query: Streamlit reruns on fresh threads, so per-thread connections would pile up
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(sql, params).fetchall()
+
+    # ---------------- Writing ----------------
+    def record(self, page, row, key_fields=(), session=None):
+        """Queue one row for persistence; returns immediately."""
+        item = (
+            page, time.time(), session, make_key(row, key_fields) if key_fields else None,
+            json.dumps(row, default=_json_default, ensure_ascii=False),
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            metrics.REGISTRY.inc("toolbox_history_rows_lost_total", (("reason", "queue_full"),))
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO calculations (page, ts, session, key, row) VALUES (?, ?, ?, ?, ?)", batch
+                    )
+            except sqlite3.Error:
+                # Keep the writer alive; a failed batch is lost but later ones still land
+                self.failed += len(batch)
+                metrics.REGISTRY.inc("toolbox_history_rows_lost_total", (("reason", "write_error"),), len(batch))
+                logger.exception("History store %s: lost a batch of %d rows", self.path, len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued row is written (tests, scripts, shutdown)."""
+        self._queue.join()
+
+    def stats(self):
+        """Rows waiting in the queue and rows lost to a full queue or a failed insert."""
+        return {"queued": self._queue.qsize(), "dropped": self.dropped, "failed": self.failed}
+
+    # ---------------- Reading ----------------
+    @staticmethod
+    def _where(page=None, key_contains=None, since=None, until=None):
+        clauses, params = [], []
+        if page:
+            clauses.append("page = ?")
+            params.append(page)
+        if key_contains:
+            clauses.append("key LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(key_contains)}%")
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, **filters):
+        where, params = self._where(**filters)
+        return self._query(f"SELECT COUNT(*) FROM calculations{where}", params)[0][0]
+
+    def search(self, limit=50, offset=0, **filters):
+        """Newest-first page of records as dicts (``row`` is decoded back from JSON)."""
+        where, params = self._where(**filters)
+        rows = self._query(
+            f"SELECT id, page, ts, session, key, row FROM calculations{where} "
+            "ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        return [{**dict(r), "row": json.loads(r["row"])} for r in rows]
+
+    def get(self, record_id):
+        rows = self._query("SELECT id, page, ts, session, key, row FROM calculations WHERE id = ?", (record_id,))
+        return {**dict(rows[0]), "row": json.loads(rows[0]["row"])} if rows else None
+
+    def pages(self):
+        return [r[0] for r in self._query("SELECT DISTINCT page FROM calculations ORDER BY page")]
+
+
+@functools.lru_cache(maxsize=None)
+def get_store(path=DEFAULT_DB):
+    """The process-wide store (one writer thread per database file)."""
+    return HistoryStore(path)
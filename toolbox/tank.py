@@ -0,0 +1,134 @@
+"""Head-aware tank sizing: sweep L/D and rank candidates by surface area or steel weight."""
+import numpy as np
+
+from toolbox.dish import calculate_ellipsoidal_dish, calculate_torispherical_dish
+
+HEAD_TYPES = ("torispherical", "ellipsoidal")
+RANK_BY = ("area", "weight")
+
+# Default dense L/D grid
+RATIO_GRID = np.round(np.arange(1.0, 3.0 + 1e-9, 0.01), 2)
+
+
+def _dish(head, id_mm, sf_mm, thk_mm=0.0):
+    # (blank dia mm, dish end height mm, head volume m³) from the dish end formulas
+    if head == "torispherical":
+        _, _, blank, height, vol = calculate_torispherical_dish(id_mm, sf_mm, thk_mm)
+    elif head == "ellipsoidal":
+        _, blank, height, vol = calculate_ellipsoidal_dish(id_mm, sf_mm, thk_mm)
+    else:
+        raise ValueError(f"Unknown head type: {head}")
+    return blank, height, vol
+
+
+def ld_dimensions(volume_m3, ratio):
+    """(diameter, height) in m of a plain cylinder holding ``volume_m3`` at L/D = ``ratio`` (no heads)."""
+    volume_m3 = np.asarray(volume_m3, dtype=float)
+    ratio = np.asarray(ratio, dtype=float)
+    diameter = ((4 * volume_m3) / (np.pi * ratio)) ** (1 / 3)
+    return diameter, ratio * diameter
+
+
+def calculate_dimensions(volume, min_ratio, max_ratio):
+    """Plain-cylinder diameter and height at the minimum and maximum L/D, one dict per ratio."""
+    results = []
+    for ratio in (min_ratio, max_ratio):
+        diameter, height = ld_dimensions(volume, ratio)
+        results.append({
+            "L/D Ratio": ratio,
+            "Diameter (m)": round(float(diameter), 3),
+            "Height (m)": round(float(height), 3)
+        })
+    return results
+
+
+def solve_diameter(volume_m3, ratio, head="torispherical", sf_mm=0.0, max_iter=50, tol=1e-12):
+    """Inside diameter (m) so that shell + two heads hold ``volume_m3``.
+
+    The shell length is ``ratio · D`` and excludes the heads' straight
+    flanges, whose volume is part of the dish end volume. ``volume_m3`` and
+    ``ratio`` broadcast against each other. Every case is solved together
+    with Newton's method on V(D) = π/4·ratio·D³ + 2·V_head(D).
+    """
+    V, ratio = np.broadcast_arrays(np.asarray(volume_m3, dtype=float), np.asarray(ratio, dtype=float))
+    sf = sf_mm / 1000
+
+    # V_head = k·D³ + π/4·D²·sf (D in m); k from the dish formula at a 1 m ID, no flange
+    k = float(_dish(head, 1000.0, 0.0)[2])
+    cubic = np.pi / 4 * ratio + 2 * k
+
+    # Start from the flange-free closed form: it over-estimates D, so Newton on
+    # this convex, increasing cubic converges monotonically from above.
+    D = np.cbrt(V / cubic)
+    for _ in range(max_iter):
+        f = cubic * D ** 3 + 2 * (np.pi / 4) * D ** 2 * sf - V
+        df = 3 * cubic * D ** 2 + np.pi * D * sf
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(df > 0, f / df, 0.0)
+        D = D - step
+        if np.all(np.abs(step) <= tol * np.maximum(D, 1.0)):
+            break
+    return D
+
+
+def sweep_tanks(volume_m3, ratios=RATIO_GRID, head="torispherical", sf_mm=0.0,
+                shell_thk_mm=6.0, head_thk_mm=None, density=7850.0):
+    """Evaluate every (volume, L/D) pair at once; returns a dict of 2D arrays (volume × ratio).
+
+    Keys: ``ratio``, ``D`` and ``L`` (m), ``overall_height`` (m, shell plus
+    both head heights), ``area`` (m², shell plus both head blanks) and
+    ``weight`` (kg from the shell and head thicknesses).
+    """
+    V = np.atleast_1d(np.asarray(volume_m3, dtype=float))[:, None]
+    ratio = np.atleast_1d(np.asarray(ratios, dtype=float))[None, :]
+    head_thk_mm = shell_thk_mm if head_thk_mm is None else head_thk_mm
+
+    D = solve_diameter(V, ratio, head, sf_mm)
+    L = ratio * D
+    blank_mm, head_height_mm, _ = _dish(head, D * 1000, sf_mm, head_thk_mm)
+
+    shell_area = np.pi * D * L
+    head_area = 2 * np.pi / 4 * (blank_mm / 1000) ** 2
+    weight = density * (shell_area * shell_thk_mm + head_area * head_thk_mm) / 1000
+
+    return {
+        "ratio": np.broadcast_to(ratio, D.shape),
+        "D": D,
+        "L": L,
+        "overall_height": L + 2 * head_height_mm / 1000,
+        "area": shell_area + head_area,
+        "weight": weight,
+    }
+
+
+def _frame(res, volume, idx):
+    import pandas as pd
+
+    return pd.DataFrame({
+        "Volume (m³)": volume,
+        "L/D Ratio": res["ratio"][idx],
+        "Diameter (m)": res["D"][idx],
+        "Shell Length (m)": res["L"][idx],
+        "Overall Height (m)": res["overall_height"][idx],
+        "Surface Area (m²)": res["area"][idx],
+        "Steel Weight (kg)": res["weight"][idx],
+    })
+
+
+def rank_tanks(volume_m3, rank_by="area", **kwargs):
+    """All L/D candidates for one volume, best first."""
+    if rank_by not in RANK_BY:
+        raise ValueError(f"rank_by must be one of {RANK_BY}")
+    res = sweep_tanks(volume_m3, **kwargs)
+    order = np.argsort(res[rank_by][0], kind="stable")
+    return _frame(res, float(volume_m3), (0, order)).reset_index(drop=True)
+
+
+def optimum_tanks(volumes_m3, rank_by="area", **kwargs):
+    """The best L/D candidate for each of many volumes, one row per volume."""
+    if rank_by not in RANK_BY:
+        raise ValueError(f"rank_by must be one of {RANK_BY}")
+    volumes = np.atleast_1d(np.asarray(volumes_m3, dtype=float))
+    res = sweep_tanks(volumes, **kwargs)
+    best = np.argmin(res[rank_by], axis=1)
+    return _frame(res, volumes, (np.arange(volumes.size), best))
@@ -0,0 +1,198 @@
+"""Monte Carlo tolerance analysis of the UG-27 shell check.
+
+Delivered plate thickness, mill under-tolerance, actual corrosion, the
+material's strength and the operating pressure all scatter around their
+nominal values. :func:`simulate_ug27` draws any of the UG-27 inputs from a
+distribution, pushes the samples through :func:`toolbox.ug27.calculate_batch`
+``chunk_size`` rows at a time, and folds each chunk into streaming
+statistics. Memory is bounded by one chunk plus the histogram, whether
+``n`` is a thousand or a billion.
+
+A sample fails when the corroded shell cannot hold the sampled pressure
+(MAWP < P, which is the same test as t < total required thickness) or the
+geometry is invalid (tc ≤ 0, R ≤ 0, S·E ≤ 0.6·P).
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+
+from toolbox import ug27
+from toolbox.stats import RunningStats, StreamingHistogram
+
+DEFAULT_CHUNK_SIZE = 200_000
+PERCENTILES = (0.1, 1, 5, 50, 95, 99, 99.9)
+
+
+# ---------------- Distributions ----------------
+@dataclass(frozen=True)
+class Fixed:
+    value: float
+
+    def sample(self, rng, n):
+        return np.full(n, float(self.value))
+
+
+@dataclass(frozen=True)
+class Normal:
+    """Normal distribution, optionally truncated to ``[low, high]`` (out-of-range draws are redrawn)."""
+
+    mean: float
+    sd: float
+    low: float = -np.inf
+    high: float = np.inf
+
+    def sample(self, rng, n):
+        x = rng.normal(self.mean, self.sd, n)
+        for _ in range(100):
+            bad = np.flatnonzero((x < self.low) | (x > self.high))
+            if bad.size == 0:
+                return x
+            x[bad] = rng.normal(self.mean, self.sd, bad.size)
+        return np.clip(x, self.low, self.high)  # bounds far out in a tail; stop redrawing
+
+
+@dataclass(frozen=True)
+class Uniform:
+    low: float
+    high: float
+
+    def sample(self, rng, n):
+        return rng.uniform(self.low, self.high, n)
+
+
+@dataclass(frozen=True)
+class Triangular:
+    low: float
+    mode: float
+    high: float
+
+    def sample(self, rng, n):
+        if self.low == self.high:
+            return np.full(n, float(self.low))
+        return rng.triangular(self.low, self.mode, self.high, n)
+
+
+DISTRIBUTIONS = ("Fixed", "Normal", "Uniform", "Triangular")
+
+
+def make_distribution(kind, mean=None, sd=None, low=None, high=None):
+    """Build a distribution from one row of a spec table; blank (None/NaN) bounds are open.
+
+    ``Fixed`` uses ``mean``; ``Normal`` uses ``mean`` and ``sd``, truncated to
+    ``low``/``high`` if given; ``Uniform`` uses ``low``/``high``;
+    ``Triangular`` uses ``low``, ``mean`` (as the mode) and ``high``.
+    Raises ``ValueError`` when a needed parameter is missing or out of order.
+    """
+    def given(x):
+        return x is not None and not np.isnan(x)
+
+    def need(**params):
+        missing = [k for k, v in params.items() if not given(v)]
+        if missing:
+            raise ValueError(f"{kind} needs {', '.join(missing)}")
+
+    if kind == "Fixed":
+        need(mean=mean)
+        return Fixed(mean)
+    if kind == "Normal":
+        need(mean=mean, sd=sd)
+        if sd < 0:
+            raise ValueError("Normal needs sd ≥ 0")
+        low = low if given(low) else -np.inf
+        high = high if given(high) else np.inf
+        if not low <= mean <= high:
+            raise ValueError("Normal needs low ≤ mean ≤ high")
+        return Normal(mean, sd, low, high)
+    if kind == "Uniform":
+        need(low=low, high=high)
+        if not low <= high:
+            raise ValueError("Uniform needs low ≤ high")
+        return Uniform(low, high)
+    if kind == "Triangular":
+        need(low=low, mean=mean, high=high)
+        if not low <= mean <= high:
+            raise ValueError("Triangular needs low ≤ mode ≤ high")
+        return Triangular(low, mean, high)
+    raise ValueError(f"Unknown distribution {kind!r}")
+
+
+def as_distribution(value):
+    """A number becomes :class:`Fixed`; anything with ``sample(rng, n)`` is used as is."""
+    return value if hasattr(value, "sample") else Fixed(float(value))
+
+
+# ---------------- Simulation ----------------
+@dataclass
+class ToleranceResult:
+    """Streaming summary of a run; everything here is O(bins), not O(n)."""
+
+    n: int = 0
+    failures: int = 0  # MAWP < P or invalid geometry
+    errors: int = 0  # invalid geometry only (tc, R or S·E − 0.6·P ≤ 0)
+    mawp: RunningStats = field(default_factory=RunningStats)
+    t_total_req: RunningStats = field(default_factory=RunningStats)
+    margin: RunningStats = field(default_factory=RunningStats)  # MAWP / P
+    histogram: Optional[StreamingHistogram] = None  # of MAWP
+
+    @property
+    def pf(self):
+        """Probability of failure."""
+        return self.failures / self.n if self.n else np.nan
+
+    def pf_interval(self, z=1.96):
+        """Wilson score interval for :attr:`pf` (sensible at zero failures too)."""
+        if not self.n:
+            return np.nan, np.nan
+        p, n = self.pf, self.n
+        centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(0.0, float(centre - half)), min(1.0, float(centre + half))
+
+    def mawp_percentiles(self, q=PERCENTILES):
+        """``{q: MAWP}``, accurate to one histogram bin width."""
+        if self.histogram is None:
+            return {p: np.nan for p in q}
+        return dict(zip(q, self.histogram.percentile(q).tolist()))
+
+
+def simulate_ug27(P, S, Do, t, Ca, mill_tol, E, n=1_000_000, chunk_size=DEFAULT_CHUNK_SIZE, bins=1024,
+                  seed=None, progress: Optional[Callable[[int, int], object]] = None):
+    """Monte Carlo UG-27 check over ``n`` samples; returns a :class:`ToleranceResult`.
+
+    Each input is a number (held fixed) or a distribution from this module.
+    Every input draws from its own child of ``seed``, so for untruncated
+    distributions the samples do not depend on ``chunk_size``. The MAWP
+    histogram range is set from the first chunk (widened by a quarter of its
+    span each side); later values outside it still count in the outer bins.
+
+    ``progress(done, n)`` is called after every chunk.
+    """
+    names = ("P", "S", "Do", "t", "Ca", "mill_tol", "E")
+    dists = [as_distribution(v) for v in (P, S, Do, t, Ca, mill_tol, E)]
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(names))]
+
+    result = ToleranceResult()
+    done = 0
+    while done < n:
+        size = min(chunk_size, n - done)
+        sample = {name: d.sample(rng, size) for name, d, rng in zip(names, dists, rngs)}
+        res = ug27.calculate_batch(**sample)
+
+        status = res["status"]
+        result.n += size
+        result.failures += int(np.count_nonzero(status != ug27.OK))
+        result.errors += int(np.count_nonzero(status >= ug27.ERR_INPUT))
+        mawp = res["MAWP"]
+        if result.histogram is None:
+            result.histogram = StreamingHistogram.around(mawp, bins)
+        result.histogram.update(mawp)
+        result.mawp.update(mawp)
+        result.t_total_req.update(res["t_total_req"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result.margin.update(mawp / sample["P"])
+
+        done += size
+        if progress is not None:
+            progress(done, n)
+    return result
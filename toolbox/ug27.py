@@ -0,0 +1,248 @@
+"""ASME VIII-1 UG-27 cylindrical shell under internal pressure (circumferential stress)."""
+import numpy as np
+
+from toolbox.cache import memoize
+from toolbox.materials import allowable_stress
+
+# ---------------- Status codes ----------------
+# One code per row in batch mode; errors mirror the checks in the single-vessel calculator.
+OK = 0
+NOT_ENOUGH = 1
+ERR_INPUT = 2
+ERR_TC = 3
+ERR_R = 4
+ERR_DENOM = 5
+
+STATUS_TEXT = {
+    OK: "✅ OK",
+    NOT_ENOUGH: "❌ IS NOT ENOUGH!",
+    ERR_INPUT: "❌ ERROR: Missing or non-numeric input.",
+    ERR_TC: "❌ ERROR: Corroded thickness tc ≤ 0. Check inputs.",
+    ERR_R: "❌ ERROR: Inside radius R ≤ 0. Check Do and t/Ca/mill_tol.",
+    ERR_DENOM: "❌ ERROR: S·E − 0.6·P ≤ 0. Increase S/E or reduce P.",
+}
+
+INPUT_COLUMNS = ["P", "S", "Do", "t", "Ca", "mill_tol", "E"]
+
+RESULT_COLUMNS = {
+    "tc": "Corroded Thickness tc (mm)",
+    "R": "Inside Radius R (mm)",
+    "t_req": "Required Thk (uncorroded) (mm)",
+    "t_total_req": "Total Required Thk (mm)",
+    "MAWP": "MAWP corroded (MPa)",
+}
+
+
+# ---------------- Single vessel ----------------
+@memoize()
+def calculate(inputs):
+    try:
+        t = inputs["t"]
+        Ca = inputs["Ca"]
+        mill_tol = inputs["mill_tol"]
+        Do = inputs["Do"]
+        P = inputs["P"]
+        E = inputs["E"]
+        S = inputs["S"]
+
+        tc = t - Ca - mill_tol
+        if tc <= 0:
+            return "❌ ERROR: Corroded thickness tc ≤ 0. Check inputs.", None
+
+        R = Do / 2 - tc
+        if R <= 0:
+            return "❌ ERROR: Inside radius R ≤ 0. Check Do and t/Ca/mill_tol.", None
+
+        denom = S * E - 0.6 * P
+        if denom <= 0:
+            return "❌ ERROR: S·E − 0.6·P ≤ 0. Increase S/E or reduce P.", None
+
+        t_req = (P * R) / denom
+        t_total_req = t_req + Ca + mill_tol
+        MAWP = (S * E * tc) / (R + 0.6 * tc)
+
+        result = {
+            "Corroded Thickness tc (mm)": round(tc, 3),
+            "Inside Radius R (mm)": round(R, 3),
+            "Required Thk (uncorroded) (mm)": round(t_req, 3),
+            "Total Required Thk (mm)": round(t_total_req, 3),
+            "MAWP corroded (MPa)": round(MAWP, 3),
+            "status": f"{t:.3f} → {'✅ OK' if t >= t_total_req else '❌ IS NOT ENOUGH!'}"
+        }
+        return None, result
+    except Exception as e:
+        return f"❌ Error: {e}", None
+
+
+# ---------------- Vectorized kernel ----------------
+def calculate_batch(P, S, Do, t, Ca, mill_tol, E):
+    """Run the UG-27 check on whole columns at once.
+
+    Inputs broadcast against each other like NumPy arrays. Returns a dict of
+    float arrays (tc, R, t_req, t_total_req, MAWP) plus an int8 ``status``
+    array holding one of the status codes above. Outputs that are undefined
+    for a row (because of an error) are NaN.
+    """
+    P, S, Do, t, Ca, mill_tol, E = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (P, S, Do, t, Ca, mill_tol, E))
+    )
+    finite = (
+        np.isfinite(P) & np.isfinite(S) & np.isfinite(Do) & np.isfinite(t)
+        & np.isfinite(Ca) & np.isfinite(mill_tol) & np.isfinite(E)
+    )
+
+    tc = t - Ca - mill_tol
+    R = Do / 2 - tc
+    denom = S * E - 0.6 * P
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_req = (P * R) / denom
+        MAWP = (S * E * tc) / (R + 0.6 * tc)
+    t_total_req = t_req + Ca + mill_tol
+
+    # Same precedence as the single-vessel checks: the first failing check wins.
+    status = np.select(
+        [~finite, tc <= 0, R <= 0, denom <= 0, t >= t_total_req],
+        [ERR_INPUT, ERR_TC, ERR_R, ERR_DENOM, OK],
+        default=NOT_ENOUGH,
+    ).astype(np.int8)
+
+    failed = status >= ERR_INPUT
+    t_req = np.where(failed, np.nan, t_req)
+    t_total_req = np.where(failed, np.nan, t_total_req)
+    MAWP = np.where(failed, np.nan, MAWP)
+    tc = np.where(status == ERR_INPUT, np.nan, tc)
+    R = np.where(status == ERR_INPUT, np.nan, R)
+
+    return {
+        "tc": tc,
+        "R": R,
+        "t_req": t_req,
+        "t_total_req": t_total_req,
+        "MAWP": MAWP,
+        "status": status,
+    }
+
+
+def calculate_frame(cases):
+    """Run :func:`calculate_batch` on a DataFrame with the ``INPUT_COLUMNS``.
+
+    ``S`` may be omitted (or left blank on some rows) when the frame has
+    ``Material`` and ``T`` columns; it is then taken from the allowable
+    stress table. Non-numeric cells are treated as missing and flagged with
+    ``ERR_INPUT``. Returns a copy of ``cases`` with the result columns, a
+    status code and a status text column appended.
+    """
+    import pandas as pd
+
+    lookup_S = {"Material", "T"} <= set(cases.columns)
+    missing = [c for c in INPUT_COLUMNS if c not in cases.columns and not (c == "S" and lookup_S)]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    columns = {
+        c: pd.to_numeric(cases[c], errors="coerce").to_numpy(dtype=float)
+        for c in INPUT_COLUMNS if c in cases.columns
+    }
+    out = cases.copy()
+    if lookup_S:
+        S = columns.get("S", np.full(len(cases), np.nan))
+        blank = np.isnan(S)
+        T = pd.to_numeric(cases["T"], errors="coerce").to_numpy(dtype=float)
+        S = np.where(blank, allowable_stress(cases["Material"].to_numpy(dtype=object), T), S)
+        columns["S"] = S
+        out["S"] = S
+    res = calculate_batch(**columns)
+
+    for key, label in RESULT_COLUMNS.items():
+        out[label] = res[key]
+    out["Status code"] = res["status"]
+    out["Status"] = status_text(res["status"])
+    return out
+
+
+def status_text(status):
+    """Map an array of status codes to their display strings."""
+    labels = np.array([STATUS_TEXT[code] for code in sorted(STATUS_TEXT)], dtype=object)
+    return labels[np.asarray(status, dtype=np.intp)]
+
+
+# ---------------- Plate selection ----------------
+# Common mill plate thicknesses (mm) and weld joint efficiencies (UW-12).
+STANDARD_PLATE_THK = (5, 6, 8, 10, 12, 14, 16, 18, 20, 22, 25, 28, 30, 32, 35, 38, 40, 45, 50, 55, 60)
+JOINT_EFFICIENCIES = (0.7, 0.85, 1.0)
+
+
+def shell_weight(Do, t, L, density):
+    """Weight (kg) of a cylindrical shell from Do, t, L in mm and density in kg/m³."""
+    Do = np.asarray(Do, dtype=float)
+    return density * np.pi / 4 * (Do ** 2 - (Do - 2 * np.asarray(t, dtype=float)) ** 2) * L * 1e-9
+
+
+def lightest_plate(P, Do, L, Ca, mill_tol, thicknesses, S, density, E, max_cells=2_000_000):
+    """Find the lightest passing plate thickness × material × joint efficiency per vessel.
+
+    ``P``, ``Do``, ``L``, ``Ca`` and ``mill_tol`` are per-vessel columns;
+    ``thicknesses`` is the plate catalog, ``S``/``density`` describe the
+    candidate materials (same length) and ``E`` the joint efficiencies to try.
+    The whole catalog grid is evaluated with one broadcast per chunk of
+    vessels (at most ``max_cells`` grid cells at a time). Weight does not
+    depend on E, so ties are resolved in favour of the lowest efficiency,
+    i.e. the least radiography.
+
+    Returns a dict of per-vessel arrays: ``t``, ``material`` (index into
+    ``S``/``density``), ``E``, ``weight``, ``t_total_req`` and ``MAWP``.
+    Vessels with no passing combination get ``material = -1`` and NaN
+    elsewhere.
+    """
+    P, Do, L, Ca, mill_tol = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (P, Do, L, Ca, mill_tol))
+    )
+    thicknesses = np.asarray(thicknesses, dtype=float)
+    S = np.asarray(S, dtype=float)
+    density = np.asarray(density, dtype=float)
+    E = np.sort(np.asarray(E, dtype=float))
+
+    n = P.shape[0]
+    grid_shape = (thicknesses.size, S.size, E.size)
+    cells = int(np.prod(grid_shape))
+
+    out = {
+        "t": np.full(n, np.nan),
+        "material": np.full(n, -1, dtype=np.intp),
+        "E": np.full(n, np.nan),
+        "weight": np.full(n, np.nan),
+        "t_total_req": np.full(n, np.nan),
+        "MAWP": np.full(n, np.nan),
+    }
+    if n == 0 or cells == 0:
+        return out
+
+    # Grid axes: (vessel, thickness, material, E)
+    t_g = thicknesses[None, :, None, None]
+    S_g = S[None, None, :, None]
+    rho_g = density[None, None, :, None]
+    E_g = E[None, None, None, :]
+
+    step = max(1, max_cells // cells)
+    for lo in range(0, n, step):
+        hi = min(n, lo + step)
+        v = slice(lo, hi)
+        P_v, Do_v, L_v, Ca_v, mt_v = (x[v, None, None, None] for x in (P, Do, L, Ca, mill_tol))
+
+        res = calculate_batch(P_v, S_g, Do_v, t_g, Ca_v, mt_v, E_g)
+        weight = np.broadcast_to(shell_weight(Do_v, t_g, L_v, rho_g), res["status"].shape)
+        weight = np.where(res["status"] == OK, weight, np.inf).reshape(hi - lo, cells)
+
+        best = np.argmin(weight, axis=1)
+        rows = np.arange(hi - lo)
+        found = np.isfinite(weight[rows, best])
+        i_t, i_m, i_e = np.unravel_index(best, grid_shape)
+
+        out["t"][v] = np.where(found, thicknesses[i_t], np.nan)
+        out["material"][v] = np.where(found, i_m, -1)
+        out["E"][v] = np.where(found, E[i_e], np.nan)
+        out["weight"][v] = np.where(found, weight[rows, best], np.nan)
+        out["t_total_req"][v] = np.where(found, res["t_total_req"].reshape(hi - lo, cells)[rows, best], np.nan)
+        out["MAWP"][v] = np.where(found, res["MAWP"].reshape(hi - lo, cells)[rows, best], np.nan)
+
+    return out
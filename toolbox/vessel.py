@@ -0,0 +1,156 @@
+"""Vessel project: one shell, its heads and its limpet coil as a dependency graph.
+
+The pages that describe the same vessel (UG-27 shell, dish end, tank L/D,
+limpet coil) push their inputs here and can load them back, so a design
+is typed once. Derived quantities are :class:`toolbox.graph.DependencyGraph`
+nodes; changing one input recomputes only what is downstream of it. The
+shell is described by its inside diameter, so changing the shell
+thickness updates the shell OD, UG-27 check, shell weight and limpet coil,
+but not the heads or the capacity.
+
+All lengths are mm, pressures MPa, densities kg/m³ and volumes m³.
+"""
+import math
+
+from toolbox import ug27
+from toolbox.dish import calculate_ellipsoidal_dish, calculate_torispherical_dish
+from toolbox.graph import DependencyGraph
+from toolbox.limpet import limpet_coil
+
+HEAD_TYPES = ("torispherical", "ellipsoidal")
+
+# name → label; every input starts blank (None) except the head type
+INPUTS = {
+    # Shell
+    "shell_id": "Shell ID (mm)",
+    "shell_thk": "Shell thickness t (mm)",
+    "shell_length": "Shell length / height (mm)",
+    "density": "Shell density (kg/m³)",
+    # UG-27
+    "P": "Design pressure P (MPa)",
+    "S": "Allowable stress S (MPa)",
+    "Ca": "Corrosion allowance Ca (mm)",
+    "mill_tol": "Mill tolerance (mm)",
+    "E": "Joint efficiency E",
+    # Heads
+    "head_type": "Head type",
+    "sf": "Straight flange SF (mm)",
+    "head_thk": "Head thickness (mm)",
+    # Capacity
+    "design_volume": "Required volume (m³)",
+    # Limpet coil
+    "limpet_od": "Limpet OD (mm)",
+    "limpet_thk": "Limpet thickness (mm)",
+    "limpet_pitch": "Limpet pitch (mm)",
+    "coil_coverage": "Coil coverage (%)",
+    "limpet_density": "Limpet density (kg/m³)",
+}
+
+
+# ---------------- Node functions ----------------
+def _shell_od(shell_id, shell_thk):
+    return shell_id + 2 * shell_thk
+
+
+def _ug27(P, S, shell_od, shell_thk, Ca, mill_tol, E):
+    error, result = ug27.calculate({"P": P, "S": S, "Do": shell_od, "t": shell_thk, "Ca": Ca,
+                                    "mill_tol": mill_tol, "E": E})
+    if error:
+        raise ValueError(error)
+    return result
+
+
+def _shell_weight(shell_od, shell_thk, shell_length, density):
+    return float(ug27.shell_weight(shell_od, shell_thk, shell_length, density))
+
+
+def _head(head_type, shell_id, sf, head_thk):
+    if head_type == "torispherical":
+        _, _, blank, height, volume = calculate_torispherical_dish(shell_id, sf, head_thk)
+    elif head_type == "ellipsoidal":
+        _, blank, height, volume = calculate_ellipsoidal_dish(shell_id, sf, head_thk)
+    else:
+        raise ValueError(f"Unknown head type: {head_type}")
+    return {"blank_dia": float(blank), "height": float(height), "volume_m3": float(volume)}
+
+
+def _shell_volume(shell_id, shell_length):
+    return math.pi / 4 * shell_id ** 2 * shell_length * 1e-9
+
+
+def _capacity(shell_volume, head):
+    return shell_volume + 2 * head["volume_m3"]
+
+
+def _volume_margin(capacity, design_volume):
+    return (capacity / design_volume - 1) * 100
+
+
+def _ld_ratio(shell_length, shell_id):
+    return shell_length / shell_id
+
+
+def _overall_height(shell_length, head):
+    return shell_length + 2 * head["height"]
+
+
+def _limpet(shell_id, shell_length, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage, limpet_density):
+    return limpet_coil(shell_id, shell_length, shell_thk, limpet_od, limpet_thk, limpet_pitch, coil_coverage,
+                       limpet_density)
+
+
+# name → (fn, deps, label), in dependency order
+DERIVED = {
+    "shell_od": (_shell_od, ("shell_id", "shell_thk"), "Shell OD (mm)"),
+    "ug27": (_ug27, ("P", "S", "shell_od", "shell_thk", "Ca", "mill_tol", "E"), "UG-27 check"),
+    "shell_weight": (_shell_weight, ("shell_od", "shell_thk", "shell_length", "density"), "Shell weight (kg)"),
+    "head": (_head, ("head_type", "shell_id", "sf", "head_thk"), "Head geometry"),
+    "shell_volume": (_shell_volume, ("shell_id", "shell_length"), "Shell volume (m³)"),
+    "capacity": (_capacity, ("shell_volume", "head"), "Capacity with two heads (m³)"),
+    "volume_margin": (_volume_margin, ("capacity", "design_volume"), "Capacity margin (%)"),
+    "ld_ratio": (_ld_ratio, ("shell_length", "shell_id"), "L/D"),
+    "overall_height": (_overall_height, ("shell_length", "head"), "Overall height (mm)"),
+    "limpet": (_limpet, ("shell_id", "shell_length", "shell_thk", "limpet_od", "limpet_thk", "limpet_pitch",
+                         "coil_coverage", "limpet_density"), "Limpet coil"),
+}
+
+
+class VesselProject:
+    """The shared vessel model; a thin wrapper over its :class:`DependencyGraph`."""
+
+    def __init__(self, **values):
+        self.graph = DependencyGraph()
+        for name, label in INPUTS.items():
+            self.graph.input(name, label=label)
+        self.graph.set("head_type", HEAD_TYPES[0])
+        for name, (fn, deps, label) in DERIVED.items():
+            self.graph.derived(name, fn, deps, label=label)
+        self.update(**values)
+
+    def update(self, **values):
+        """Set inputs (None clears one); returns the names that changed. Unknown names raise KeyError."""
+        unknown = [k for k in values if k not in INPUTS]
+        if unknown:
+            raise KeyError(f"Unknown vessel input(s): {', '.join(unknown)}")
+        return self.graph.update(**values)
+
+    def get(self, name):
+        return self.graph.get(name)
+
+    def __getitem__(self, name):
+        return self.graph.get(name)
+
+    def inputs(self, *names):
+        """``{name: value}`` of the given inputs (all of them by default) that are set."""
+        values = self.graph.inputs()
+        return {k: values[k] for k in (names or INPUTS) if values[k] is not None}
+
+    def error(self, name):
+        self.graph.get(name)
+        return self.graph.node(name).error
+
+    def stale(self):
+        return self.graph.stale()
+
+    def refresh(self):
+        return self.graph.refresh()
@@ -0,0 +1,41 @@
+"""Image URLs for the pages, served from ``static/`` (built by ``python -m toolbox.assets``).
+
+``st.image`` reads a local path into the media file manager on every
+rerun and re-sends it under a new URL. A ``/app/static/...`` URL is passed
+straight to the browser instead: the server never reads the file during a
+script run, and the browser fetches it once and keeps it in its cache.
+"""
+import functools
+
+import streamlit as st
+
+from toolbox import assets
+
+STATIC_URL = "/app/static/"
+
+
+@functools.lru_cache(maxsize=1)
+def _manifest():
+    return assets.load_manifest()
+
+
+@functools.lru_cache(maxsize=None)
+def url(name):
+    """Browser URL for asset ``name``; read from the manifest once per process.
+
+    Falls back to the source image (the local file, or the remote URL of an
+    image that has not been vendored yet) when the asset has not been built
+    or static serving is turned off.
+    """
+    built = _manifest().get(name)
+    if built and st.get_option("server.enableStaticServing"):
+        return STATIC_URL + built
+    path = assets.source_path(name)
+    if path.is_file():
+        return str(path)
+    return assets.SOURCES[name]
+
+
+def image(name, **kwargs):
+    """``st.image`` of asset ``name``."""
+    return st.image(url(name), **kwargs)
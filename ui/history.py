@@ -0,0 +1,76 @@
+"""Session history widget backed by :class:`toolbox.history.ColumnarHistory`."""
+import functools
+import math
+import uuid
+
+import streamlit as st
+
+from toolbox.history import DEFAULT_CAPACITY, ColumnarHistory
+from toolbox.store import get_store
+
+PAGE_SIZE = 20
+
+
+def session_id():
+    """Random id tying persisted rows to the browser session that made them."""
+    if "toolbox_session_id" not in st.session_state:
+        st.session_state.toolbox_session_id = uuid.uuid4().hex
+    return st.session_state.toolbox_session_id
+
+
+def get_history(key, capacity=DEFAULT_CAPACITY, page=None, key_fields=()):
+    """The page's history buffer in ``st.session_state``, created on first use.
+
+    With ``page`` set, every appended row is also queued for the shared
+    SQLite store (see the Saved Designs page), indexed by ``key_fields``.
+    """
+    history = st.session_state.get(key)
+    if not isinstance(history, ColumnarHistory):
+        history = st.session_state[key] = ColumnarHistory(capacity)
+    if page is not None and history.on_append is None:
+        history.on_append = functools.partial(
+            get_store().record, page, key_fields=tuple(key_fields), session=session_id()
+        )
+    return history
+
+
+@st.fragment
+def render_history(history, title, key, page_size=PAGE_SIZE, download_name=None):
+    """Show one page of history (newest first); cost is O(page_size), not O(history).
+
+    A fragment: paging reruns only the history table. Call it from the
+    fragment that appends rows so new rows show up on the same rerun.
+    """
+    if not len(history):
+        return
+
+    st.subheader(title)
+    pages = math.ceil(len(history) / page_size)
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (1–{pages}, newest first)", 1, pages, 1, key=f"{key}_page")
+
+    stop = len(history) - (page - 1) * page_size
+    st.dataframe(history.frame(max(0, stop - page_size), stop, newest_first=True), use_container_width=True)
+
+    caption = f"{len(history)} of the last {history.capacity} calculations kept"
+    if history.dropped:
+        caption += f" ({history.dropped} older dropped)"
+    st.caption(caption)
+
+    if download_name:
+        st.download_button(
+            label="📥 Download History",
+            data=lambda: history.frame().to_csv(index=False).encode("utf-8"),
+            file_name=download_name,
+            mime="text/csv",
+            key=f"{key}_download"
+        )
+
+
+def render_quick_history(history, column, title, last=PAGE_SIZE):
+    """The latest ``last`` values of one history column as a compact list."""
+    if not len(history):
+        return
+    st.subheader(title)
+    st.write(history.column(column, len(history) - last).tolist())
@@ -0,0 +1,36 @@
+"""Page-side helpers for toolbox.metrics (adds the session_state size gauge and timed fragments)."""
+import functools
+
+import streamlit as st
+
+from toolbox import metrics
+
+
+def start_rerun(page):
+    return metrics.start_rerun(page)
+
+
+def finish_rerun(run):
+    """Close ``run``; the session_state walk only happens while metrics are enabled."""
+    if metrics.ENABLED:
+        run.finish(session_bytes=sum(metrics.approx_size(v) for v in st.session_state.values()))
+
+
+def fragment(run, name):
+    """``st.fragment`` whose body is timed as phase ``name`` of ``run``, or on its own when it reruns alone.
+
+    Widgets inside a fragment rerun only the fragment, so the rest of the
+    page (static text, images, other fragments) is neither re-executed nor
+    re-sent to the browser. The body gets the run to record into as its
+    first argument (``def calculator(run): ...``, called as ``calculator()``):
+    ``run`` during a full rerun, a fresh fragment run when it reruns alone,
+    after ``run`` has already finished.
+    """
+    def decorate(fn):
+        @st.fragment
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with metrics.fragment_run(run, name) as current:
+                return fn(current, *args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,56 @@
+"""The session's :class:`toolbox.vessel.VesselProject`, plus load/push helpers for the pages."""
+import streamlit as st
+
+from toolbox.vessel import VesselProject
+
+
+def get_project():
+    """The vessel project in ``st.session_state``, created on first use (it survives page switches)."""
+    project = st.session_state.get("vessel_project")
+    if not isinstance(project, VesselProject):
+        project = st.session_state["vessel_project"] = VesselProject()
+    return project
+
+
+def _as_text(value):
+    return f"{value:.10g}" if isinstance(value, float) else str(value)
+
+
+def load_button(fields, key, text=False, state=None, widgets=None, label="⬇️ Load from vessel project"):
+    """Button that copies project values into this page's widgets before they are drawn.
+
+    ``fields`` maps a widget key to a project node (an input or a derived
+    value, e.g. ``{"Do": "shell_od"}``); blank project values are left out.
+    With ``text`` the values are written as strings for ``st.text_input``.
+    Pages that keep their inputs in a dict in session_state pass its name
+    as ``state``; ``fields`` then maps that dict's keys, and ``widgets``
+    maps them to the widget keys whose state is dropped so the widgets
+    pick up the new values.
+    """
+    def load():
+        project = get_project()
+        values = {k: project.get(node) for k, node in fields.items()}
+        values = {k: _as_text(v) if text else v for k, v in values.items() if v is not None}
+        if state is None:
+            for k, v in values.items():
+                st.session_state[k] = v
+        else:
+            st.session_state[state] = {**st.session_state[state], **values}
+            for k in values:
+                st.session_state.pop((widgets or {}).get(k, k), None)
+
+    project = get_project()
+    available = any(project.get(node) is not None for node in fields.values())
+    st.button(label, on_click=load, key=key, disabled=not available,
+              help="Fill the inputs from the shared vessel project (see the Vessel Project page)")
+
+
+def push(**values):
+    """Send this page's inputs to the project and note which derived values that affects."""
+    project = get_project()
+    changed = project.update(**values)
+    if changed:
+        affected = set().union(*(project.graph.downstream(name) for name in changed))
+        affected = [n.name for n in project.graph.nodes() if n.name in affected]
+        st.caption(f"🔗 Vessel project updated ({', '.join(changed)}); "
+                   f"{len(affected)} derived value(s) depend on it: {', '.join(affected) or 'none'}.")